@@ -1,7 +1,24 @@
-from qamomile.core import circuit as circuit_module
+import importlib
+
 from qamomile.core.bitssample import *  # noqa
-from qamomile.core.converters import qaoa as qaoa
 
-circuit = circuit_module
+# Submodules are imported on first attribute access, so that ``import qamomile.core``
+# does not pull in jijmodeling through the converters.
+_LAZY_SUBMODULES = {
+    "qaoa": "qamomile.core.converters.qaoa",
+    "circuit": "qamomile.core.circuit",
+}
 
 __all__ = ["qaoa", "circuit", "BitsSample", "BitsSampleSet"]
+
+
+def __getattr__(name: str):
+    if name in _LAZY_SUBMODULES:
+        module = importlib.import_module(_LAZY_SUBMODULES[name])
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
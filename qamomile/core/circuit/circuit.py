@@ -466,6 +466,34 @@ class QuantumCircuit:
             )
         )
 
+    def multi_rz(self, angle: ParameterExpression, qubits: typ.Sequence[int]):
+        r"""Add a multi-qubit Z rotation to the quantum circuit.
+
+        .. math::
+            R_{Z\cdots Z}(\theta) = \exp\left(-i\theta Z\otimes\cdots\otimes Z/2\right)
+
+        One and two qubits give RZ and RZZ gates. More qubits are decomposed into a CNOT ladder
+        that collects their parity on the last qubit, an RZ gate, and the reversed ladder, so
+        every transpiler supports it.
+        """
+        qubits = list(qubits)
+        if not qubits:
+            raise ValueError("multi_rz needs at least one qubit.")
+        if len(set(qubits)) != len(qubits):
+            raise ValueError(f"multi_rz needs distinct qubits, but got {qubits}.")
+        if len(qubits) == 1:
+            self.rz(angle, qubits[0])
+            return
+        if len(qubits) == 2:
+            self.rzz(angle, qubits[0], qubits[1])
+            return
+
+        for control, target in zip(qubits[:-1], qubits[1:]):
+            self.cx(control, target)
+        self.rz(angle, qubits[-1])
+        for control, target in reversed(list(zip(qubits[:-1], qubits[1:]))):
+            self.cx(control, target)
+
     # Method for adding three-qubit gate
     def ccx(self, control1: int, control2: int, target: int):
         """Add a Toffoli gate to the quantum circuit."""
@@ -485,11 +513,7 @@ class QuantumCircuit:
         """
         if isinstance(time, float):
             time = Value(time)
-        indices = set()
-        for ops, _ in hamiltonian._terms.items():
-            for op in ops:
-                indices.add(op.index)
-        indices = sorted(list(indices))
+        indices = sorted(hamiltonian.support)
         self.add_gate(ParametricExpGate(hamiltonian, parameter=time, indices=indices))
               
     def measure(self, qubit: int, cbit: int):
@@ -1,3 +1,16 @@
-import qamomile.core.converters.qaoa as qaoa
+import importlib
 
 __all__ = ["qaoa"]
+
+
+def __getattr__(name: str):
+    # Converters depend on jijmodeling, which is only imported when one is used.
+    if name in __all__:
+        module = importlib.import_module(f"{__name__}.{name}")
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
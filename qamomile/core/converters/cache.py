@@ -0,0 +1,176 @@
+"""
+qamomile/core/converters/cache.py
+
+This module provides a content-addressed on-disk cache for the expensive part of building a
+QuantumConverter: the PUBO builder of ``jmt.pubo.transpile_to_pubo``, the objective and penalty
+parts of the Ising model, and the labels of the binary variables.
+
+An entry is a directory named by `converter_cache_key`, a SHA-256 hash of the pickled compiled
+instance, the relaxation method, the model normalization and the versions of Qamomile and
+jijmodeling-transpiler, so upgrading either package never reuses a stale PUBO builder. It holds the pickled PUBO builder and
+a Qamomile binary file (see :mod:`qamomile.core.serialization`) with the Ising parts as sparse
+arrays. Entries are written to a temporary directory and renamed into place, so processes that
+build the same entry concurrently never see a partial one.
+
+Key Components:
+- converter_cache_key: Hash a compiled instance and the PUBO options.
+- load_converter_cache / save_converter_cache: Read and write an entry.
+
+Usage:
+    converter = QAOAConverter(compiled_instance, cache_dir="~/.cache/qamomile")
+"""
+
+from __future__ import annotations
+
+import hashlib
+import importlib.metadata
+import os
+import pickle
+import shutil
+import tempfile
+import typing as typ
+
+import jijmodeling_transpiler.core as jmt
+import numpy as np
+import scipy.sparse
+
+from qamomile.core.converters.converter import IsingParts
+from qamomile.core.serialization import PathType, read_arrays, write_arrays
+
+_CACHE_VERSION = 1
+_PUBO_FILE = "pubo_builder.pkl"
+_PARTS_FILE = "ising_parts.qmb"
+
+
+def _package_version(name: str) -> str:
+    try:
+        return importlib.metadata.version(name)
+    except importlib.metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def converter_cache_key(
+    compiled_instance,
+    relax_method: jmt.pubo.RelaxationMethod,
+    normalize_model: bool,
+) -> str:
+    """
+    Returns the cache key of a compiled instance and the options of its PUBO transpilation.
+
+    The key also covers the installed versions of Qamomile and jijmodeling-transpiler,
+    since either may change the PUBO builder or the Ising parts built from an instance.
+
+    Args:
+        compiled_instance: The compiled instance of the optimization problem.
+        relax_method (jmt.pubo.RelaxationMethod): The relaxation method for PUBO conversion.
+        normalize_model (bool): Whether the model is normalized.
+
+    Returns:
+        str: A hexadecimal SHA-256 digest.
+    """
+    digest = hashlib.sha256()
+    versions = ":".join(
+        _package_version(name) for name in ("qamomile", "jijmodeling-transpiler")
+    )
+    digest.update(
+        f"{_CACHE_VERSION}:{versions}:{relax_method}:{bool(normalize_model)}:".encode()
+    )
+    digest.update(pickle.dumps(compiled_instance))
+    return digest.hexdigest()
+
+
+def save_converter_cache(
+    directory: PathType,
+    key: str,
+    pubo_builder,
+    ising_parts: IsingParts,
+    int2varlabel: dict[int, str],
+) -> None:
+    """
+    Saves a cache entry under ``directory``.
+
+    Args:
+        directory (PathType): The cache directory. It is created if needed.
+        key (str): The key from `converter_cache_key`.
+        pubo_builder: The PUBO builder of the compiled instance.
+        ising_parts (IsingParts): The objective and penalty parts of the Ising model.
+        int2varlabel (dict[int, str]): The labels of the binary variables.
+    """
+    directory = os.path.expanduser(directory)
+    os.makedirs(directory, exist_ok=True)
+    target = os.path.join(directory, key)
+    if os.path.isdir(target):
+        return
+
+    staging = tempfile.mkdtemp(prefix=f".{key}.", dir=directory)
+    try:
+        with open(os.path.join(staging, _PUBO_FILE), "wb") as f:
+            pickle.dump(pubo_builder, f, protocol=pickle.HIGHEST_PROTOCOL)
+        meta = {
+            "labels": ising_parts.labels,
+            "int2varlabel": list(int2varlabel.items()),
+            "quad_shape": list(ising_parts.quad.shape),
+            "linear_shape": list(ising_parts.linear.shape),
+        }
+        arrays = {
+            "quad_indices": ising_parts.quad_indices,
+            "linear_indices": ising_parts.linear_indices,
+            "constants": ising_parts.constants,
+        }
+        for name in ("quad", "linear"):
+            matrix = getattr(ising_parts, name)
+            arrays[f"{name}_data"] = matrix.data
+            arrays[f"{name}_columns"] = matrix.indices.astype(np.int64)
+            arrays[f"{name}_indptr"] = matrix.indptr.astype(np.int64)
+        write_arrays(os.path.join(staging, _PARTS_FILE), "IsingParts", meta, arrays)
+        os.rename(staging, target)
+    except OSError:
+        # Another process published the same entry first.
+        if not os.path.isdir(target):
+            raise
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+
+def load_converter_cache(
+    directory: PathType, key: str
+) -> typ.Optional[tuple[typ.Any, IsingParts, dict[int, str]]]:
+    """
+    Loads a cache entry saved by `save_converter_cache`.
+
+    Args:
+        directory (PathType): The cache directory.
+        key (str): The key from `converter_cache_key`.
+
+    Returns:
+        Optional[tuple]: The PUBO builder, the Ising parts and the variable labels,
+            or None if there is no entry for ``key``.
+    """
+    target = os.path.join(os.path.expanduser(directory), key)
+    if not os.path.isdir(target):
+        return None
+
+    with open(os.path.join(target, _PUBO_FILE), "rb") as f:
+        pubo_builder = pickle.load(f)
+    meta, arrays = read_arrays(os.path.join(target, _PARTS_FILE), "IsingParts", None)
+    matrices = {
+        name: scipy.sparse.csr_matrix(
+            (
+                arrays[f"{name}_data"],
+                arrays[f"{name}_columns"],
+                arrays[f"{name}_indptr"],
+            ),
+            shape=tuple(meta[f"{name}_shape"]),
+        )
+        for name in ("quad", "linear")
+    }
+    ising_parts = IsingParts.from_matrices(
+        meta["labels"],
+        arrays["quad_indices"].reshape(-1, 2),
+        matrices["quad"],
+        arrays["linear_indices"],
+        matrices["linear"],
+        arrays["constants"],
+    )
+    int2varlabel = {int(index): label for index, label in meta["int2varlabel"]}
+    return pubo_builder, ising_parts, int2varlabel
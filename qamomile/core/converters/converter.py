@@ -34,18 +34,37 @@ Example:
 """
 
 import abc
+import collections
+import concurrent.futures
+import dataclasses
+import functools
+import itertools
+import os
 import typing as typ
+import weakref
 
 import jijmodeling as jm
 import jijmodeling_transpiler.core as jmt
 import numpy as np
+import scipy.sparse
 import qamomile.core.bitssample as qm_bs
 import qamomile.core.operator as qm_o
 # Import necessary functions from jijmodeling_transpiler
 from jijmodeling_transpiler.core.decode import dict_to_record
 from jijmodeling_transpiler.core.decode.evaluate import calc_expr, subs_expr
 from jijmodeling_transpiler.core.pubo.binary_decode import binary_decode
-from qamomile.core.ising_qubo import IsingModel, qubo_to_ising
+from qamomile.core.converters.streaming import (
+    BitsBatch,
+    DecodeSummary,
+    iter_bits_chunks,
+)
+from qamomile.core.ising_qubo import (
+    HUBOIsingModel,
+    IsingModel,
+    hubo_to_ising,
+    qubo_to_ising,
+)
+from qamomile.core.presolve import PresolveResult, presolve_ising
 from qamomile.core.transpiler import QuantumSDKTranspiler
 
 ResultType = typ.TypeVar("ResultType")
@@ -61,15 +80,24 @@ class QuantumConverter(abc.ABC):
 
     Attributes:
         compiled_instance: The compiled instance of the optimization problem.
-        pubo_builder: The PUBO (Polynomial Unconstrained Binary Optimization) builder.
+        pubo_builder: The PUBO (Polynomial Unconstrained Binary Optimization) builder,
+            built on first use.
         _ising (Optional[IsingModel]): Cached Ising model representation.
 
     Methods:
         get_ising: Retrieve or compute the Ising model representation.
         ising_encode: Encode the problem into an Ising model.
+        ising_encode_grid: Encode the problem for many multiplier settings at once.
+        get_hubo_ising / hubo_encode: The same for the higher-order Ising model.
+        get_presolve_result / presolve_encode: The presolve of the Ising model with ``presolve=True``.
         get_cost_hamiltonian: Abstract method to get the cost Hamiltonian.
         decode: Decode quantum computation results into a SampleSet.
         decode_bits_to_sampleset: Abstract method to convert BitsSampleSet to SampleSet.
+        decode_bits_array: Convert a matrix of bitstrings to SampleSet in batched array form.
+        select_by_energy: Rank bitstrings by their Ising energy to only decode the best ones.
+        decode_stream / summarize_stream: Decode results chunk by chunk, or only keep aggregates.
+        evaluation_cache_info / clear_evaluation_cache: Inspect or reset the cache of evaluated
+            bitstrings.
     """
 
     def __init__(
@@ -78,6 +106,9 @@ class QuantumConverter(abc.ABC):
         relax_method: jmt.pubo.RelaxationMethod = jmt.pubo.RelaxationMethod.AugmentedLagrangian,
         normalize_model: bool = False,
         normalize_ising: typ.Optional[typ.Literal["abs_max", "rms"]] = None,
+        cache_dir: typ.Optional[typ.Union[str, os.PathLike]] = None,
+        presolve: bool = False,
+        evaluation_cache_size: int = 65536,
     ):
         """
         Initialize the QuantumConverter.
@@ -95,19 +126,99 @@ class QuantumConverter(abc.ABC):
                 - "abs_max": Normalize by absolute maximum value
                 - "rms": Normalize by root mean square
                 Defaults to None.
+            cache_dir (str | os.PathLike | None): A directory for the on-disk cache of the PUBO
+                builder, the Ising parts and the variable labels, keyed by a hash of the compiled
+                instance, ``relax_method`` and ``normalize_model``. Converters created later (in any
+                process, of any converter class) over the same instance load the cached entry
+                instead of transpiling again. Only use a directory you trust, since entries are
+                unpickled. Defaults to None (no cache).
+            presolve (bool): If True, `ising_encode` fixes or eliminates the spins whose optimal value
+                is known classically (see :mod:`qamomile.core.presolve`) and returns the reduced model,
+                so circuits need fewer qubits. The decode methods take bits of `get_ising` and
+                reconstruct its removed spins with `get_presolve_result`. Defaults to False.
+            evaluation_cache_size (int): The maximum number of bitstrings whose objective,
+                constraint violations and penalties are kept in an LRU cache, so that decoding
+                the recurring bitstrings of a variational loop only evaluates the new ones.
+                See `evaluation_cache_info`. 0 disables the cache. Defaults to 65536.
 
         """
-        pubo_builder = jmt.pubo.transpile_to_pubo(
-            compiled_instance, relax_method=relax_method, normalize=normalize_model
-        )
-
         self.compiled_instance = compiled_instance
-        self.pubo_builder = pubo_builder
         self.int2varlabel: dict[int, str] = {}
         self.normalize_ising = normalize_ising
+        self.relax_method = relax_method
+        self.normalize_model = normalize_model
+        self.cache_dir = cache_dir
+        self.presolve = presolve
 
+        self._pubo_builder = None
         self._ising: typ.Optional[IsingModel] = None
+        self._ising_parts: typ.Optional[IsingParts] = None
+        self._presolve_result: typ.Optional[PresolveResult] = None
+        self._hubo_ising: typ.Optional[HUBOIsingModel] = None
+        self._array_decoder: typ.Optional[_ArrayDecoder] = None
+        # The pools of `evaluation_executor` and their numbers of workers.
+        self._evaluation_executors: weakref.WeakKeyDictionary = (
+            weakref.WeakKeyDictionary()
+        )
+        self._evaluation_cache = (
+            _EvaluationCache(evaluation_cache_size)
+            if evaluation_cache_size > 0
+            else None
+        )
 
+    @property
+    def pubo_builder(self):
+        """
+        The PUBO builder of the compiled instance.
+
+        It is built (or loaded from ``cache_dir``) on first use, so a converter that is
+        created but never encodes or decodes does not pay for the PUBO transpilation.
+        """
+        if self._pubo_builder is None:
+            self._build_pubo()
+        return self._pubo_builder
+
+    @pubo_builder.setter
+    def pubo_builder(self, pubo_builder):
+        self._pubo_builder = pubo_builder
+        self._ising_parts = None
+        self._array_decoder = None
+        self._evaluation_executors = weakref.WeakKeyDictionary()
+        self.clear_evaluation_cache()
+
+    def _build_pubo(self) -> None:
+        """Transpiles the compiled instance to PUBO, going through the cache if one is set."""
+        if self.cache_dir is None:
+            self._pubo_builder = jmt.pubo.transpile_to_pubo(
+                self.compiled_instance,
+                relax_method=self.relax_method,
+                normalize=self.normalize_model,
+            )
+            return
+
+        from qamomile.core.converters import cache as qm_cache
+
+        key = qm_cache.converter_cache_key(
+            self.compiled_instance, self.relax_method, self.normalize_model
+        )
+        entry = qm_cache.load_converter_cache(self.cache_dir, key)
+        if entry is not None:
+            self._pubo_builder, self._ising_parts, self.int2varlabel = entry
+            return
+
+        self._pubo_builder = jmt.pubo.transpile_to_pubo(
+            self.compiled_instance,
+            relax_method=self.relax_method,
+            normalize=self.normalize_model,
+        )
+        self.int2varlabel = self._variable_labels()
+        qm_cache.save_converter_cache(
+            self.cache_dir,
+            key,
+            self._pubo_builder,
+            self._get_ising_parts(),
+            self.int2varlabel,
+        )
 
     def get_ising(self) -> IsingModel:
         """
@@ -121,6 +232,66 @@ class QuantumConverter(abc.ABC):
             self._ising = self.ising_encode()
         return self._ising
 
+    def get_presolve_result(self) -> typ.Optional[PresolveResult]:
+        """
+        Get the presolve of the model of `get_ising`.
+
+        The decode methods extend the bits of `get_ising` to the original model with it. Models
+        from other calls of `ising_encode` (e.g. with other multipliers) have their own
+        reduction, see `presolve_encode`.
+
+        Returns:
+            Optional[PresolveResult]: The presolve result, or None without ``presolve=True``.
+
+        """
+        if not self.presolve:
+            return None
+        if self._presolve_result is None:
+            # Presolve is deterministic, so this reduces get_ising() to the same model.
+            self._presolve_result = self.presolve_encode()
+        return self._presolve_result
+
+    def get_hubo_ising(self) -> HUBOIsingModel:
+        """
+        Get the higher-order Ising model representation of the problem.
+
+        Returns:
+            HUBOIsingModel: The higher-order Ising model representation.
+
+        """
+        if self._hubo_ising is None:
+            self._hubo_ising = self.hubo_encode()
+        return self._hubo_ising
+
+    def hubo_encode(
+        self,
+        multipliers: typ.Optional[dict[str, float]] = None,
+        detail_parameters: typ.Optional[
+            dict[str, dict[tuple[int, ...], tuple[float, float]]]
+        ] = None,
+    ) -> HUBOIsingModel:
+        """
+        Encode the problem to a higher-order Ising model.
+
+        Terms of the PUBO with three or more variables are kept as k-local spin terms instead of
+        being reduced to quadratic ones, so no auxiliary variables are introduced. Build a circuit
+        from the result with e.g. ``QAOAConverter.get_qaoa_ansatz(p, ising=...)`` and decode its
+        bits by passing the same model as ``ising`` to the decode methods.
+
+        Args:
+            multipliers (Optional[dict[str, float]]): Multipliers for constraint terms.
+            detail_parameters (Optional[dict[str, dict[tuple[int, ...], tuple[float, float]]]]):
+                Detailed parameters for the encoding process.
+
+        Returns:
+            HUBOIsingModel: The encoded higher-order Ising model.
+
+        """
+        hubo, constant = self.pubo_builder.get_hubo_dict(
+            multipliers=multipliers, detail_parameters=detail_parameters
+        )
+        return self._finalize_ising(hubo_to_ising(hubo, constant))
+
     def ising_encode(
         self,
         multipliers: typ.Optional[dict[str, float]] = None,
@@ -134,21 +305,165 @@ class QuantumConverter(abc.ABC):
         This method converts the problem from QUBO (Quadratic Unconstrained Binary Optimization)
         to Ising model representation.
 
+        When ``multipliers`` are given without ``detail_parameters``, the model is the weighted
+        sum of the cached objective and penalty parts (see `ising_encode_grid`), so changing the
+        multipliers does not rebuild the QUBO.
+
         Args:
             multipliers (Optional[dict[str, float]]): Multipliers for constraint terms.
             detail_parameters (Optional[dict[str, dict[tuple[int, ...], tuple[float, float]]]]):
                 Detailed parameters for the encoding process.
 
+        With ``presolve=True``, the reduced model of `presolve_encode` is returned. Encoding
+        does not change the state of the converter, so the decode methods keep taking bits of
+        `get_ising`.
+
         Returns:
             IsingModel: The encoded Ising model.
 
         """
-        qubo, constant = self.pubo_builder.get_qubo_dict(
+        if self.presolve:
+            return self.presolve_encode(multipliers, detail_parameters).ising
+        return self._encode_ising(multipliers, detail_parameters)
+
+    def presolve_encode(
+        self,
+        multipliers: typ.Optional[dict[str, float]] = None,
+        detail_parameters: typ.Optional[
+            dict[str, dict[tuple[int, ...], tuple[float, float]]]
+        ] = None,
+    ) -> PresolveResult:
+        """
+        Encode the problem to an Ising model and presolve it (see :mod:`qamomile.core.presolve`).
+
+        Use its ``reconstruct_bits`` to extend bits of the reduced model of one encoding to the
+        original model, whatever ``presolve`` is set to.
+
+        Args:
+            multipliers (Optional[dict[str, float]]): Multipliers for constraint terms.
+            detail_parameters (Optional[dict[str, dict[tuple[int, ...], tuple[float, float]]]]):
+                Detailed parameters for the encoding process.
+
+        Returns:
+            PresolveResult: The reduced model and the reconstruction of the removed spins.
+
+        """
+        return presolve_ising(self._encode_ising(multipliers, detail_parameters))
+
+    def _encode_ising(
+        self,
+        multipliers: typ.Optional[dict[str, float]],
+        detail_parameters: typ.Optional[
+            dict[str, dict[tuple[int, ...], tuple[float, float]]]
+        ],
+    ) -> IsingModel:
+        """Encodes the problem to an Ising model, without presolve."""
+        pubo_builder = self.pubo_builder
+        # The default multipliers always go through the QUBO, so the model does not depend
+        # on whether the Ising parts were built by an earlier call.
+        if detail_parameters is None and multipliers:
+            return self._encode_ising_grid([multipliers])[0]
+        qubo, constant = pubo_builder.get_qubo_dict(
             multipliers=multipliers, detail_parameters=detail_parameters
         )
-        ising = qubo_to_ising(qubo, simplify=False)
-        ising.constant += constant
+        return self._finalize_ising(qubo_to_ising(qubo, constant, simplify=False))
+
+    def ising_encode_grid(
+        self, multipliers_grid: typ.Sequence[dict[str, float]]
+    ) -> list[IsingModel]:
+        """
+        Encode the problem to Ising models for many multiplier settings at once.
+
+        The QUBO is linear in the multipliers, so the Ising model of the objective and the
+        Ising model of each constraint or penalty (with multiplier 1) are built once and cached
+        as sparse coefficient matrices. Every setting of the grid is then a weighted sum of these
+        parts, computed for the whole grid with one sparse matrix product.
+        Multipliers that are not given default to 1, as in ``pubo_builder.get_qubo_dict``.
+        With ``presolve=True``, every model is reduced as in `ising_encode`.
+
+        Args:
+            multipliers_grid (Sequence[dict[str, float]]): The multipliers of each setting.
+
+        Returns:
+            list[IsingModel]: The encoded Ising model of each setting.
+        """
+        isings = self._encode_ising_grid(multipliers_grid)
+        if self.presolve:
+            return [presolve_ising(ising).ising for ising in isings]
+        return isings
+
+    def _encode_ising_grid(
+        self, multipliers_grid: typ.Sequence[dict[str, float]]
+    ) -> list[IsingModel]:
+        """Encodes the problem for many multiplier settings, without presolve."""
+        parts = self._get_ising_parts()
+        weights = np.ones((len(multipliers_grid), len(parts.labels) + 1))
+        for row, multipliers in zip(weights, multipliers_grid):
+            for col, label in enumerate(parts.labels, start=1):
+                row[col] = multipliers.get(label, 1.0)
+        used = (weights != 0.0).astype(np.float64)
+
+        quad_values = np.asarray((parts.quad.T @ weights.T).T)
+        quad_used = np.asarray((parts.quad_pattern.T @ used.T).T) > 0
+        linear_values = np.asarray((parts.linear.T @ weights.T).T)
+        linear_used = np.asarray((parts.linear_pattern.T @ used.T).T) > 0
+        constants = weights @ parts.constants
+
+        isings = []
+        for g in range(len(weights)):
+            ising = IsingModel.from_arrays(
+                parts.quad_indices[quad_used[g]],
+                quad_values[g, quad_used[g]],
+                parts.linear_indices[linear_used[g]],
+                linear_values[g, linear_used[g]],
+                float(constants[g]),
+            )
+            isings.append(self._finalize_ising(ising))
+        return isings
+
+    def _get_ising_parts(self) -> "IsingParts":
+        """Builds (once) the Ising models of the objective and of each penalty as sparse matrices."""
+        if self._ising_parts is not None:
+            return self._ising_parts
+
+        labels = list(self.compiled_instance.constraint.keys()) + list(
+            self.compiled_instance.penalty.keys()
+        )
+        zeros = {label: 0.0 for label in labels}
+        # Row 0 holds the objective and row k the penalty of labels[k - 1] with multiplier 1.
+        isings = []
+        for multipliers in [zeros] + [{**zeros, label: 1.0} for label in labels]:
+            qubo, constant = self.pubo_builder.get_qubo_dict(multipliers=multipliers)
+            isings.append(qubo_to_ising(qubo, constant))
+
+        quad_indices, quad = _stack_coefficients(
+            [ising.quad_indices for ising in isings],
+            [ising.quad_values for ising in isings],
+        )
+        linear_indices, linear = _stack_coefficients(
+            [ising.linear_indices[:, None] for ising in isings],
+            [ising.linear_values for ising in isings],
+        )
+        constants = np.array([ising.constant for ising in isings])
+        # Subtract the objective from the other rows to leave only the penalty parts.
+        subtract = scipy.sparse.identity(len(isings), format="lil")
+        subtract[1:, 0] = -1.0
+        subtract = subtract.tocsr()
+        quad = subtract @ quad
+        linear = subtract @ linear
+        constants = subtract @ constants
+        quad.eliminate_zeros()
+        linear.eliminate_zeros()
+
+        self._ising_parts = IsingParts.from_matrices(
+            labels, quad_indices, quad, linear_indices[:, 0], linear, constants
+        )
+        return self._ising_parts
 
+    def _finalize_ising(
+        self, ising: typ.Union[IsingModel, HUBOIsingModel]
+    ) -> typ.Union[IsingModel, HUBOIsingModel]:
+        """Normalizes an encoded Ising model and records the labels of the variables."""
         if isinstance(self.normalize_ising, str):
             if self.normalize_ising == "abs_max":
                 ising.normalize_by_abs_max()
@@ -159,14 +474,19 @@ class QuantumConverter(abc.ABC):
                     f"Invalid value for normalize_ising: {self.normalize_ising}"
                 )
 
+        if not self.int2varlabel:
+            self.int2varlabel = self._variable_labels()
+
+        return ising
+
+    def _variable_labels(self) -> dict[int, str]:
+        """Returns the label (e.g. ``x_{0,1}``) of each binary variable index."""
         var_map = self.compiled_instance.var_map.var_map
         inv_varmap = {}
         for var_label, var_indices in var_map.items():
             for subs, index in var_indices.items():
                 inv_varmap[index] = var_label + "_{" + ",".join(map(str, subs)) + "}"
-        self.int2varlabel = inv_varmap
-
-        return ising
+        return inv_varmap
 
     @abc.abstractmethod
     def get_cost_hamiltonian(self) -> qm_o.Hamiltonian:
@@ -185,7 +505,14 @@ class QuantumConverter(abc.ABC):
         raise NotImplementedError()
 
     def decode(
-        self, transpiler: QuantumSDKTranspiler[ResultType], result: ResultType
+        self,
+        transpiler: QuantumSDKTranspiler[ResultType],
+        result: ResultType,
+        executor: typ.Optional[concurrent.futures.Executor] = None,
+        n_jobs: typ.Optional[int] = None,
+        top_k: typ.Optional[int] = None,
+        max_energy: typ.Optional[float] = None,
+        ising: typ.Optional[typ.Union[IsingModel, HUBOIsingModel]] = None,
     ) -> jm.experimental.SampleSet:
         """
         Decode quantum computation results into a SampleSet.
@@ -197,15 +524,42 @@ class QuantumConverter(abc.ABC):
         Args:
             transpiler (QuantumSDKTranspiler[ResultType]): The transpiler for the specific quantum SDK.
             result (ResultType): The raw result from the quantum computation.
+            executor (concurrent.futures.Executor, optional): An executor that evaluates shards of
+                the samples in parallel. An executor from `evaluation_executor` already holds the
+                decoder in its workers; other executors receive it with every shard.
+                Defaults to None.
+            n_jobs (int, optional): If given and ``executor`` is None, the samples are evaluated in
+                a process pool with this many workers for this call only (-1 for all CPUs).
+                Defaults to None (evaluated in this process).
+            top_k (int, optional): If given, only the ``top_k`` bitstrings with the lowest energy of
+                the encoded Ising model (see `select_by_energy`) are decoded. Defaults to None.
+            max_energy (float, optional): If given, only the bitstrings with at most this energy
+                are decoded. Defaults to None.
+            ising (IsingModel | HUBOIsingModel, optional): The encoded model the bits belong to,
+                e.g. ``get_hubo_ising()`` for a circuit of the higher-order encoding.
+                Defaults to None (`get_ising`).
 
         Returns:
             jm.experimental.SampleSet: The decoded results as a SampleSet.
         """
         bitssampleset = transpiler.convert_result(result)
-        return self.decode_bits_to_sampleset(bitssampleset)
+        return self.decode_bits_to_sampleset(
+            bitssampleset,
+            executor=executor,
+            n_jobs=n_jobs,
+            top_k=top_k,
+            max_energy=max_energy,
+            ising=ising,
+        )
 
     def decode_bits_to_sampleset(
-        self, bitssampleset: qm_bs.BitsSampleSet
+        self,
+        bitssampleset: qm_bs.BitsSampleSet,
+        executor: typ.Optional[concurrent.futures.Executor] = None,
+        n_jobs: typ.Optional[int] = None,
+        top_k: typ.Optional[int] = None,
+        max_energy: typ.Optional[float] = None,
+        ising: typ.Optional[typ.Union[IsingModel, HUBOIsingModel]] = None,
     ) -> jm.experimental.SampleSet:
         """
         Decode a BitArraySet to a SampleSet.
@@ -215,34 +569,834 @@ class QuantumConverter(abc.ABC):
 
         Args:
             bitarray_set (qm_c.BitArraySet): The set of bitstring results from quantum computation.
+            executor (concurrent.futures.Executor, optional): An executor that evaluates shards of
+                the samples in parallel. An executor from `evaluation_executor` already holds the
+                decoder in its workers; other executors receive it with every shard.
+                Defaults to None.
+            n_jobs (int, optional): If given and ``executor`` is None, the samples are evaluated in
+                a process pool with this many workers for this call only (-1 for all CPUs).
+                Defaults to None (evaluated in this process).
+            top_k (int, optional): If given, only the ``top_k`` bitstrings with the lowest energy of
+                the encoded Ising model (see `select_by_energy`) are decoded. Defaults to None.
+            max_energy (float, optional): If given, only the bitstrings with at most this energy
+                are decoded. Defaults to None.
+            ising (IsingModel | HUBOIsingModel, optional): The encoded model the bits belong to,
+                e.g. ``get_hubo_ising()`` for a circuit of the higher-order encoding.
+                Defaults to None (`get_ising`).
 
         Returns:
             jm.experimental.SampleSet: The decoded results as a SampleSet.
         """
-        ising = self.get_ising()
-        num_occurrences = []
-        samples = []
-
-        # Convert bitstrings to samples
-        for bitssample in bitssampleset.bitarrays:
-            sample = {}
-            for i, bit in enumerate(bitssample.bits):
-                index = ising.ising2qubo_index(i)
-                sample[index] = bit
-            samples.append(sample)
-            num_occurrences.append(bitssample.num_occurrences)
-
-        # Decode samples using jijmodeling_transpiler
-        sampleset = decode_from_dict_binary_result(
-            samples, self.pubo_builder.binary_encoder, self.compiled_instance
+        num_occurrences = [
+            bitssample.num_occurrences for bitssample in bitssampleset.bitarrays
+        ]
+        bits = np.array(
+            [bitssample.bits for bitssample in bitssampleset.bitarrays], dtype=np.uint8
+        ).reshape(len(num_occurrences), -1 if num_occurrences else 0)
+        return self.decode_bits_array(
+            bits,
+            num_occurrences,
+            executor=executor,
+            n_jobs=n_jobs,
+            top_k=top_k,
+            max_energy=max_energy,
+            ising=ising,
         )
 
-        # Update the number of occurrences
-        record = jm.Record(sampleset.record.solution, num_occurrences=num_occurrences)
-        sampleset.record = record
+    def decode_bits_array(
+        self,
+        bits: np.ndarray,
+        num_occurrences: typ.Optional[typ.Sequence[int]] = None,
+        executor: typ.Optional[concurrent.futures.Executor] = None,
+        n_jobs: typ.Optional[int] = None,
+        top_k: typ.Optional[int] = None,
+        max_energy: typ.Optional[float] = None,
+        ising: typ.Optional[typ.Union[IsingModel, HUBOIsingModel]] = None,
+    ) -> jm.experimental.SampleSet:
+        """
+        Decode a matrix of bitstrings to a SampleSet.
+
+        Every row is one bitstring of the encoded model, where bit i belongs to spin i.
+        The rows are mapped to the binary variables of the PUBO with one indexing operation, and
+        the decision variables, the objective, the constraint violations and the penalties of all
+        rows are computed with array operations, which is much faster than decoding them one by
+        one for large shot histograms.
+
+        Args:
+            bits (np.ndarray): Bits with shape (S, N), where N is the number of spins of the
+                encoded model ``ising`` (`get_ising` is the reduced model with ``presolve=True``).
+            num_occurrences (Optional[Sequence[int]]): The number of occurrences of each row.
+                Defaults to None (one each).
+            executor (concurrent.futures.Executor, optional): An executor that evaluates shards of
+                the samples in parallel. An executor from `evaluation_executor` already holds the
+                decoder in its workers; other executors receive it with every shard.
+                Defaults to None.
+            n_jobs (int, optional): If given and ``executor`` is None, the samples are evaluated in
+                a process pool with this many workers for this call only (-1 for all CPUs).
+                Defaults to None (evaluated in this process).
+            top_k (int, optional): If given, only the ``top_k`` bitstrings with the lowest energy of
+                the encoded Ising model (see `select_by_energy`) are decoded. Defaults to None.
+            max_energy (float, optional): If given, only the bitstrings with at most this energy
+                are decoded. Defaults to None.
+            ising (IsingModel | HUBOIsingModel, optional): The encoded model the bits belong to,
+                e.g. ``get_hubo_ising()`` for a circuit of the higher-order encoding.
+                Defaults to None (`get_ising`).
+
+        Returns:
+            jm.experimental.SampleSet: The decoded results as a SampleSet.
+
+        Raises:
+            ValueError: If ``bits`` is not a two-dimensional array.
+
+        Note:
+            With ``top_k`` or ``max_energy``, the decoded rows are sorted by energy.
+        """
+        bits = np.asarray(bits, dtype=np.uint8)
+        if bits.ndim != 2:
+            raise ValueError(f"bits must have shape (S, N), but got {bits.shape}.")
+        if num_occurrences is None:
+            num_occurrences = [1] * len(bits)
+        if top_k is not None or max_energy is not None:
+            rows = self.select_by_energy(
+                bits, top_k=top_k, max_energy=max_energy, ising=ising
+            )
+            bits = bits[rows]
+            num_occurrences = [num_occurrences[row] for row in rows.tolist()]
+        if executor is None and n_jobs is not None:
+            with self.evaluation_executor(None if n_jobs == -1 else n_jobs) as pool:
+                return self.decode_bits_array(
+                    bits, num_occurrences, executor=pool, ising=ising
+                )
 
+        sampleset = self._get_array_decoder().decode(
+            self._qubo_bits(bits, ising),
+            num_occurrences,
+            cache=self._evaluation_cache,
+            evaluate=self._parallel_evaluate(executor),
+        )
         return jm.experimental.from_old_sampleset(sampleset)
 
+    def decode_stream(
+        self,
+        batches: typ.Iterable[BitsBatch],
+        chunk_size: typ.Optional[int] = None,
+        executor: typ.Optional[concurrent.futures.Executor] = None,
+        n_jobs: typ.Optional[int] = None,
+        ising: typ.Optional[typ.Union[IsingModel, HUBOIsingModel]] = None,
+    ) -> typ.Iterator[jm.experimental.SampleSet]:
+        """
+        Decode a stream of results chunk by chunk.
+
+        Only one chunk is decoded at a time, so memory does not grow with the number of
+        bitstrings as long as the caller does not keep the yielded SampleSets.
+
+        Args:
+            batches (Iterable[BitsBatch]): The results, e.g. shot batches fetched from a backend,
+                as BitsSampleSets, bit matrices with shape (S, N), or pairs of a bit matrix and
+                the numbers of occurrences of its rows.
+            chunk_size (Optional[int]): The maximum number of rows decoded at once.
+                Defaults to None (one chunk per batch).
+            executor (concurrent.futures.Executor, optional): See `decode_bits_array`.
+            n_jobs (int, optional): See `decode_bits_array`. The process pool is shared by all
+                chunks.
+            ising (IsingModel | HUBOIsingModel, optional): See `decode_bits_array`.
+
+        Yields:
+            jm.experimental.SampleSet: The SampleSet of each chunk.
+        """
+        if executor is None and n_jobs is not None:
+            with self.evaluation_executor(None if n_jobs == -1 else n_jobs) as pool:
+                yield from self.decode_stream(
+                    batches, chunk_size, executor=pool, ising=ising
+                )
+            return
+        for bits, counts in iter_bits_chunks(batches, chunk_size):
+            yield self.decode_bits_array(
+                bits, counts.tolist(), executor=executor, ising=ising
+            )
+
+    def summarize_stream(
+        self,
+        batches: typ.Iterable[BitsBatch],
+        k: int = 10,
+        bins: typ.Optional[typ.Sequence[float]] = None,
+        chunk_size: typ.Optional[int] = None,
+        feasibility_tol: float = 1e-9,
+        executor: typ.Optional[concurrent.futures.Executor] = None,
+        n_jobs: typ.Optional[int] = None,
+        ising: typ.Optional[typ.Union[IsingModel, HUBOIsingModel]] = None,
+    ) -> DecodeSummary:
+        """
+        Aggregate a stream of results without building a SampleSet for all of them.
+
+        The chunks are evaluated in array form and only running aggregates are kept: the numbers
+        of shots and feasible shots, the objective range, objective histograms and the ``k``
+        best distinct feasible bitstrings, which are decoded to a SampleSet at the end.
+
+        Args:
+            batches (Iterable[BitsBatch]): The results, see `decode_stream`.
+            k (int): The number of best feasible bitstrings to keep. Defaults to 10.
+            bins (Optional[Sequence[float]]): The bin edges of the objective histograms.
+                Defaults to None (no histograms).
+            chunk_size (Optional[int]): The maximum number of rows evaluated at once.
+                Defaults to None (one chunk per batch).
+            feasibility_tol (float): The tolerance of the total constraint violation of a
+                feasible sample. Defaults to 1e-9.
+            executor (concurrent.futures.Executor, optional): See `decode_bits_array`.
+            n_jobs (int, optional): See `decode_bits_array`.
+            ising (IsingModel | HUBOIsingModel, optional): See `decode_bits_array`.
+
+        Returns:
+            DecodeSummary: The aggregates, with the best bitstrings in ``best``.
+        """
+        if executor is None and n_jobs is not None:
+            with self.evaluation_executor(None if n_jobs == -1 else n_jobs) as pool:
+                return self.summarize_stream(
+                    batches,
+                    k,
+                    bins,
+                    chunk_size,
+                    feasibility_tol,
+                    executor=pool,
+                    ising=ising,
+                )
+
+        decoder = self._get_array_decoder()
+        summary = DecodeSummary(
+            k=k,
+            bin_edges=bins,
+            maximize=self.compiled_instance.problem.sense == jm.ProblemSense.MAXIMIZE,
+            feasibility_tol=feasibility_tol,
+        )
+        num_constraints = len(decoder.constraints.constants)
+        evaluate = self._parallel_evaluate(executor)
+        for bits, counts in iter_bits_chunks(batches, chunk_size):
+            qubo_bits = self._qubo_bits(bits, ising)
+            values = decoder.evaluate_bits(
+                qubo_bits, cache=self._evaluation_cache, evaluate=evaluate
+            )
+            summary.update(
+                qubo_bits,
+                counts,
+                values[:, 0],
+                values[:, 1 : 1 + num_constraints].sum(axis=1),
+            )
+
+        best_bits = summary.best_bits.reshape(
+            len(summary.best_bits), decoder.decode_matrix.shape[0]
+        )
+        summary.best = jm.experimental.from_old_sampleset(
+            decoder.decode(best_bits, summary.best_counts.tolist())
+        )
+        return summary
+
+    def select_by_energy(
+        self,
+        bits: np.ndarray,
+        top_k: typ.Optional[int] = None,
+        max_energy: typ.Optional[float] = None,
+        ising: typ.Optional[typ.Union[IsingModel, HUBOIsingModel]] = None,
+    ) -> np.ndarray:
+        """
+        Rank bitstrings by the energy of the encoded Ising model.
+
+        The energies of all rows are computed in one batch from the model the bits belong to
+        (``ising``, e.g. `get_hubo_ising` for the higher-order encoding), which is much cheaper
+        than decoding them, so the decode methods use it to only decode promising rows. With
+        ``normalize_ising``, the energies and ``max_energy`` are in normalized units.
+
+        Args:
+            bits (np.ndarray): Bits with shape (S, N) of the encoded model.
+            top_k (Optional[int]): Keep at most this many rows. Defaults to None (no limit).
+            max_energy (Optional[float]): Keep rows with at most this energy. Defaults to None.
+            ising (IsingModel | HUBOIsingModel, optional): The encoded model the bits belong to.
+                Defaults to None (`get_ising`).
+
+        Returns:
+            np.ndarray: The indices of the kept rows, from the lowest energy to the highest
+                (ties in row order).
+
+        Raises:
+            ValueError: If ``top_k`` is negative.
+        """
+        if top_k is not None and top_k < 0:
+            raise ValueError(f"top_k must be non-negative, but got {top_k}.")
+        bits = np.asarray(bits, dtype=np.uint8)
+        ising = self.get_ising() if ising is None else ising
+        energies = ising.calc_energy_batch(1 - 2 * bits.astype(np.int8))
+        rows = np.argsort(energies, kind="stable")
+        if max_energy is not None:
+            rows = rows[energies[rows] <= max_energy]
+        return rows[:top_k]
+
+    def _qubo_bits(
+        self,
+        bits: np.ndarray,
+        ising: typ.Optional[typ.Union[IsingModel, HUBOIsingModel]] = None,
+    ) -> np.ndarray:
+        """Maps bits (S, N) of ``ising`` (`get_ising` if None) to the binary variables (S, B) of the PUBO."""
+        ising = self.get_ising() if ising is None else ising
+        if self.presolve and ising is self.get_ising():
+            # Extend the bits of the reduced model with the spins removed by presolve.
+            presolve_result = self.get_presolve_result()
+            bits = presolve_result.reconstruct_bits(bits)
+            ising = presolve_result.original
+
+        qubo_indices = np.fromiter(
+            (ising.ising2qubo_index(i) for i in range(bits.shape[1])),
+            dtype=np.int64,
+            count=bits.shape[1],
+        )
+        return self._get_array_decoder().qubo_bits(bits, qubo_indices)
+
+    def _parallel_evaluate(
+        self, executor: typ.Optional[concurrent.futures.Executor]
+    ) -> typ.Optional[typ.Callable[[np.ndarray], np.ndarray]]:
+        """Returns the evaluation of binary variables on ``executor``, or None without one."""
+        if executor is None:
+            return None
+        num_workers = self._evaluation_executors.get(executor)
+        if num_workers is not None:
+            return functools.partial(_evaluate_in_parallel, executor, None, num_workers)
+        return functools.partial(
+            _evaluate_in_parallel,
+            executor,
+            self._get_array_decoder(),
+            os.cpu_count() or 1,
+        )
+
+    def _get_array_decoder(self) -> "_ArrayDecoder":
+        """Returns the decoder of bit matrices, building it on first use."""
+        if self._array_decoder is None:
+            self._array_decoder = _ArrayDecoder.from_compiled_instance(
+                self.compiled_instance, self.pubo_builder.binary_encoder
+            )
+        return self._array_decoder
+
+    def evaluation_executor(
+        self, max_workers: typ.Optional[int] = None
+    ) -> concurrent.futures.ProcessPoolExecutor:
+        """
+        Creates a process pool for the ``executor`` argument of the decode methods.
+
+        The compiled instance and the decoder are sent to every worker once by the initializer
+        of the pool, so a variational loop can reuse the pool for all of its decodes and only
+        ships the samples. The caller owns the pool and shuts it down.
+
+        Args:
+            max_workers (Optional[int]): The number of worker processes. Defaults to None
+                (``os.cpu_count()``).
+
+        Returns:
+            concurrent.futures.ProcessPoolExecutor: The initialized pool.
+
+        Example:
+            >>> with converter.evaluation_executor(8) as pool:  # doctest: +SKIP
+            ...     for params in schedule:
+            ...         sampleset = converter.decode(transpiler, run(params), executor=pool)
+        """
+        pool = concurrent.futures.ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_evaluation_worker,
+            initargs=(self._get_array_decoder(),),
+        )
+        self._evaluation_executors[pool] = max_workers or os.cpu_count() or 1
+        return pool
+
+    def evaluation_cache_info(self) -> "EvaluationCacheInfo":
+        """
+        Returns the statistics of the cache of evaluated bitstrings.
+
+        A hit is a decoded bitstring that was found in the cache, and a miss is one that was
+        not, so ``hits / (hits + misses)`` is the hit rate over all decodes. A bitstring that
+        repeats within one decode is evaluated once but counts as a miss every time.
+
+        Returns:
+            EvaluationCacheInfo: The hits, misses, maximum size and current size of the cache.
+        """
+        if self._evaluation_cache is None:
+            return EvaluationCacheInfo(0, 0, 0, 0)
+        return self._evaluation_cache.info()
+
+    def clear_evaluation_cache(self) -> None:
+        """Empties the cache of evaluated bitstrings and resets its statistics."""
+        if self._evaluation_cache is not None:
+            self._evaluation_cache.clear()
+
+
+@dataclasses.dataclass
+class IsingParts:
+    """
+    The Ising models of the objective and of each penalty as rows of sparse matrices.
+
+    Row 0 is the objective and row k is the penalty of ``labels[k - 1]`` with multiplier 1.
+    The columns of ``quad`` and ``linear`` follow ``quad_indices`` and ``linear_indices``,
+    and the ``*_pattern`` matrices mark the stored entries with ones.
+    """
+
+    labels: list[str]
+    quad_indices: np.ndarray
+    quad: "scipy.sparse.csr_matrix"
+    quad_pattern: "scipy.sparse.csr_matrix"
+    linear_indices: np.ndarray
+    linear: "scipy.sparse.csr_matrix"
+    linear_pattern: "scipy.sparse.csr_matrix"
+    constants: np.ndarray
+
+    @classmethod
+    def from_matrices(
+        cls,
+        labels: list[str],
+        quad_indices: np.ndarray,
+        quad: "scipy.sparse.csr_matrix",
+        linear_indices: np.ndarray,
+        linear: "scipy.sparse.csr_matrix",
+        constants: np.ndarray,
+    ) -> "IsingParts":
+        """Builds the Ising parts from the coefficient matrices, deriving their patterns."""
+        return cls(
+            labels=labels,
+            quad_indices=quad_indices,
+            quad=quad,
+            quad_pattern=_pattern(quad),
+            linear_indices=linear_indices,
+            linear=linear,
+            linear_pattern=_pattern(linear),
+            constants=constants,
+        )
+
+
+def _stack_coefficients(
+    keys: list[np.ndarray], values: list[np.ndarray]
+) -> tuple[np.ndarray, "scipy.sparse.csr_matrix"]:
+    """Stacks the coefficients of several models as rows over the union of their keys."""
+    width = keys[0].shape[1] if keys else 1
+    all_keys = np.concatenate(keys).reshape(-1, width)
+    # Columns follow the first appearance of each key, so the objective terms come first.
+    union, first, inverse = np.unique(
+        all_keys, axis=0, return_index=True, return_inverse=True
+    )
+    order = np.argsort(first, kind="stable")
+    rank = np.empty(len(union), dtype=np.int64)
+    rank[order] = np.arange(len(union))
+    rows = np.repeat(np.arange(len(keys)), [len(k) for k in keys])
+    matrix = scipy.sparse.csr_matrix(
+        (np.concatenate(values), (rows, rank[inverse.ravel()])),
+        shape=(len(keys), len(union)),
+    )
+    return union[order].astype(np.int64), matrix
+
+
+def _pattern(matrix: "scipy.sparse.csr_matrix") -> "scipy.sparse.csr_matrix":
+    """Returns a matrix with a one at every stored entry of ``matrix``."""
+    pattern = matrix.copy()
+    pattern.data = np.ones_like(pattern.data)
+    return pattern
+
+
+# Number of array elements gathered at once when evaluating polynomials on many samples.
+_CHUNK_ELEMENTS = 1 << 22
+
+
+@dataclasses.dataclass
+class _Polynomials:
+    """
+    Polynomials of the decision variables, evaluated together on many samples.
+
+    Term t is ``coefficients[t]`` times the product of the variables
+    ``variables[term_ptr[t]:term_ptr[t + 1]]`` and belongs to polynomial ``rows[t]``,
+    and polynomial k has the constant ``constants[k]``.
+    """
+
+    term_ptr: np.ndarray
+    variables: np.ndarray
+    coefficients: "scipy.sparse.csr_matrix"
+    constants: np.ndarray
+
+    @classmethod
+    def from_expressions(cls, expressions: typ.Sequence) -> "_Polynomials":
+        """Stacks the ``SubstitutedExpression`` objects of jijmodeling_transpiler."""
+        keys = [key for expression in expressions for key in expression.coeff.keys()]
+        values = [
+            value for expression in expressions for value in expression.coeff.values()
+        ]
+        rows = np.repeat(
+            np.arange(len(expressions)),
+            [len(expression.coeff) for expression in expressions],
+        )
+        lengths = np.fromiter(map(len, keys), dtype=np.int64, count=len(keys))
+        return cls(
+            term_ptr=np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64),
+            variables=np.fromiter(
+                (i for key in keys for i in key),
+                dtype=np.int64,
+                count=int(lengths.sum()),
+            ),
+            coefficients=scipy.sparse.csr_matrix(
+                (np.array(values, dtype=np.float64), (np.arange(len(keys)), rows)),
+                shape=(len(keys), len(expressions)),
+            ),
+            constants=np.array(
+                [float(expression.constant) for expression in expressions],
+                dtype=np.float64,
+            ),
+        )
+
+    def evaluate(self, values: np.ndarray) -> np.ndarray:
+        """Returns the polynomials at ``values`` (S, V) as an array with shape (S, K)."""
+        result = np.empty((len(values), len(self.constants)))
+        nonempty = np.diff(self.term_ptr) > 0
+        starts = self.term_ptr[:-1][nonempty]
+        chunk = max(1, _CHUNK_ELEMENTS // max(1, len(self.variables)))
+        for begin in range(0, len(values), chunk):
+            block = values[begin : begin + chunk]
+            products = np.ones((len(block), len(nonempty)))
+            if len(starts):
+                products[:, nonempty] = np.multiply.reduceat(
+                    block[:, self.variables], starts, axis=1
+                )
+            result[begin : begin + chunk] = (self.coefficients.T @ products.T).T
+        return result + self.constants
+
+
+@dataclasses.dataclass
+class _ArrayDecoder:
+    """
+    Decodes matrices of binary samples of a compiled instance.
+
+    The decision variables are ``bits @ decode_matrix + offset``, since every integer encoding
+    of jijmodeling_transpiler is linear in its bits and the other decision variables are bits.
+    """
+
+    compiled_instance: jmt.CompiledInstance
+    decode_matrix: "scipy.sparse.csr_matrix"
+    offset: np.ndarray
+    objective: _Polynomials
+    constraints: _Polynomials
+    constraint_slices: dict[str, slice]
+    penalties: _Polynomials
+    penalty_slices: dict[str, slice]
+
+    @classmethod
+    def from_compiled_instance(
+        cls, compiled_instance: jmt.CompiledInstance, binary_encoder
+    ) -> "_ArrayDecoder":
+        """Builds the decoder of a compiled instance and the binary encoder of its PUBO builder."""
+        num_variables = compiled_instance.var_map.var_num
+        encoded_int = {}
+        for encoder in binary_encoder.values():
+            encoded_int.update(encoder.encoded_int)
+        num_bits = max(
+            [num_variables]
+            + [encoder.var_num for encoder in binary_encoder.values()]
+        )
+
+        rows, columns, values = [], [], []
+        offset = np.zeros(num_variables)
+        for index in range(num_variables):
+            if index in encoded_int:
+                coefficients, offset[index] = encoded_int[index]
+                for (bit,), value in coefficients.items():
+                    rows.append(bit)
+                    columns.append(index)
+                    values.append(value)
+            else:
+                rows.append(index)
+                columns.append(index)
+                values.append(1.0)
+        decode_matrix = scipy.sparse.csr_matrix(
+            (np.array(values, dtype=np.float64), (rows, columns)),
+            shape=(num_bits, num_variables),
+        )
+
+        def stack(groups: dict[str, dict]) -> tuple[_Polynomials, dict[str, slice]]:
+            expressions, slices = [], {}
+            for label, expressions_by_forall in groups.items():
+                slices[label] = slice(
+                    len(expressions), len(expressions) + len(expressions_by_forall)
+                )
+                expressions.extend(expressions_by_forall.values())
+            return _Polynomials.from_expressions(expressions), slices
+
+        constraints, constraint_slices = stack(compiled_instance.constraint)
+        penalties, penalty_slices = stack(compiled_instance.penalty)
+        return cls(
+            compiled_instance=compiled_instance,
+            decode_matrix=decode_matrix,
+            offset=offset,
+            objective=_Polynomials.from_expressions([compiled_instance.objective]),
+            constraints=constraints,
+            constraint_slices=constraint_slices,
+            penalties=penalties,
+            penalty_slices=penalty_slices,
+        )
+
+    def qubo_bits(self, bits: np.ndarray, qubo_indices: np.ndarray) -> np.ndarray:
+        """
+        Returns the binary variables (S, B) of the PUBO for bits (S, N), where bit i is the QUBO
+        variable ``qubo_indices[i]``.
+        """
+        used = qubo_indices < self.decode_matrix.shape[0]
+        qubo_bits = np.zeros((len(bits), self.decode_matrix.shape[0]), dtype=np.uint8)
+        qubo_bits[:, qubo_indices[used]] = bits[:, used]
+        return qubo_bits
+
+    def variables(self, qubo_bits: np.ndarray) -> np.ndarray:
+        """Returns the decision variables (S, V) of the binary variables (S, B) of the PUBO."""
+        return (self.decode_matrix.T @ qubo_bits.T.astype(np.float64)).T + self.offset
+
+    def record(
+        self, variables: np.ndarray, num_occurrences: typ.Sequence[int]
+    ) -> jm.Record:
+        """Returns the record of the nonzero decision variables and the fixed variables."""
+        compiled_instance = self.compiled_instance
+        fixed_variables = compiled_instance.data.fixed_variables
+        solution = {}
+        for label, var_map in compiled_instance.var_map.var_map.items():
+            shape = tuple(compiled_instance.deci_var_shape[label])
+            subscripts = list(var_map.keys())
+            values = variables[:, list(var_map.values())]
+            fixed = [
+                (subscript, value)
+                for subscript, value in fixed_variables.get(label, {}).items()
+                if value != 0
+            ]
+            if fixed:
+                subscripts += [subscript for subscript, _ in fixed]
+                values = np.hstack(
+                    [values, np.tile([value for _, value in fixed], (len(values), 1))]
+                )
+            subscripts = np.array(subscripts, dtype=np.int64).reshape(
+                len(subscripts), len(shape)
+            )
+
+            rows, columns = np.nonzero(values)
+            bounds = np.searchsorted(rows, np.arange(len(values) + 1)).tolist()
+            nonzero_subscripts = subscripts[columns].T.tolist()
+            nonzero_values = values[rows, columns].astype(np.float64).tolist()
+            solution[label] = [
+                (
+                    tuple(axis[start:end] for axis in nonzero_subscripts),
+                    nonzero_values[start:end],
+                    shape,
+                )
+                for start, end in zip(bounds[:-1], bounds[1:])
+            ]
+        return jm.Record(solution=solution, num_occurrences=list(num_occurrences))
+
+    def evaluate_array(self, variables: np.ndarray) -> np.ndarray:
+        """
+        Evaluates the decision variables (S, V) in batch.
+
+        Returns:
+            np.ndarray: An array with shape (S, 1 + C + P) holding the objective, the violation of
+                each of the C constraint expressions and the value of each of the P penalty
+                expressions.
+        """
+        constraint_values = self.constraints.evaluate(variables)
+        for label, columns in self.constraint_slices.items():
+            condition = self.compiled_instance.problem.constraints[label].condition
+            if condition.kind == subs_expr.ConstraintKind.EQUAL:
+                constraint_values[:, columns] = np.abs(constraint_values[:, columns])
+            else:
+                constraint_values[:, columns] = np.maximum(
+                    constraint_values[:, columns], 0.0
+                )
+        return np.hstack(
+            [
+                self.objective.evaluate(variables),
+                constraint_values,
+                self.penalties.evaluate(variables),
+            ]
+        )
+
+    def evaluation(self, values: np.ndarray) -> jm.Evaluation:
+        """Builds the evaluation from the output (S, 1 + C + P) of `evaluate_array`."""
+        compiled_instance = self.compiled_instance
+        num_constraints = len(self.constraints.constants)
+        constraint_values = values[:, 1 : 1 + num_constraints]
+        penalty_values = values[:, 1 + num_constraints :]
+
+        violations, constraint_forall = {}, {}
+        per_sample: list[dict[str, np.ndarray]] = [{} for _ in range(len(values))]
+        for label, columns in self.constraint_slices.items():
+            label_values = constraint_values[:, columns]
+            violations[label] = label_values.sum(axis=1).tolist()
+            constraint_forall[label] = np.array(
+                [list(subs) for subs in compiled_instance.constraint[label].keys()]
+            )
+            for sample_values, row in zip(per_sample, label_values):
+                sample_values[label] = row
+
+        penalties = {
+            label: penalty_values[:, columns].sum(axis=1).tolist()
+            for label, columns in self.penalty_slices.items()
+        }
+        return jm.Evaluation(
+            objective=values[:, 0].copy(),
+            constraint_violations=violations,
+            constraint_forall=constraint_forall,
+            constraint_values=per_sample,
+            penalty=penalties,
+        )
+
+    def evaluate_bits(
+        self,
+        qubo_bits: np.ndarray,
+        variables: typ.Optional[np.ndarray] = None,
+        cache: typ.Optional["_EvaluationCache"] = None,
+        evaluate: typ.Optional[typ.Callable[[np.ndarray], np.ndarray]] = None,
+    ) -> np.ndarray:
+        """
+        Returns the output of `evaluate_array` for the binary variables (S, B) of the PUBO.
+
+        With a ``cache``, only the bitstrings it does not hold yet are evaluated. ``evaluate``
+        maps binary variables to the output of `evaluate_array`, e.g. in parallel, and defaults
+        to evaluating ``variables`` (computed if not given) in this process.
+        """
+        if evaluate is None:
+            if variables is None:
+                variables = self.variables(qubo_bits)
+            evaluate_rows = lambda rows: self.evaluate_array(variables[rows])
+        else:
+            evaluate_rows = lambda rows: evaluate(qubo_bits[rows])
+        if cache is None:
+            return evaluate_rows(slice(None))
+        return cache.evaluate(np.packbits(qubo_bits, axis=1), evaluate_rows)
+
+    def decode(
+        self,
+        qubo_bits: np.ndarray,
+        num_occurrences: typ.Sequence[int],
+        cache: typ.Optional["_EvaluationCache"] = None,
+        evaluate: typ.Optional[typ.Callable[[np.ndarray], np.ndarray]] = None,
+    ) -> jm.SampleSet:
+        """Decodes the binary variables (S, B) of the PUBO, see `evaluate_bits`."""
+        variables = self.variables(qubo_bits)
+        values = self.evaluate_bits(qubo_bits, variables, cache, evaluate)
+        return jm.SampleSet(
+            record=self.record(variables, num_occurrences),
+            evaluation=self.evaluation(values),
+            measuring_time=jm.MeasuringTime(),
+        )
+
+
+# The decoder of the worker processes of `QuantumConverter.evaluation_executor`.
+_worker_decoder: typ.Optional[_ArrayDecoder] = None
+
+# Number of shards per worker, so that uneven shards still keep every worker busy.
+_SHARDS_PER_WORKER = 4
+
+
+def _init_evaluation_worker(decoder: _ArrayDecoder) -> None:
+    global _worker_decoder
+    _worker_decoder = decoder
+
+
+def _evaluate_shard(
+    packed: np.ndarray, num_bits: int, decoder: typ.Optional[_ArrayDecoder]
+) -> np.ndarray:
+    decoder = decoder or _worker_decoder
+    qubo_bits = np.unpackbits(packed, axis=1, count=num_bits)
+    return decoder.evaluate_array(decoder.variables(qubo_bits))
+
+
+def _evaluate_in_parallel(
+    executor: concurrent.futures.Executor,
+    decoder: typ.Optional[_ArrayDecoder],
+    num_workers: int,
+    qubo_bits: np.ndarray,
+) -> np.ndarray:
+    """
+    Evaluates shards of the binary variables (S, B) on ``executor`` and stacks the results in
+    the order of the samples. The shards are sent as packed bits, and ``decoder`` is None if the
+    workers were initialized with it. ``num_workers`` sizes the shards; it is recorded by
+    `QuantumConverter.evaluation_executor` and is the CPU count for other executors.
+    """
+    num_shards = max(1, min(len(qubo_bits), num_workers * _SHARDS_PER_WORKER))
+    shards = [
+        np.packbits(shard, axis=1) for shard in np.array_split(qubo_bits, num_shards)
+    ]
+    results = executor.map(
+        _evaluate_shard,
+        shards,
+        itertools.repeat(qubo_bits.shape[1]),
+        itertools.repeat(decoder),
+    )
+    return np.vstack(list(results))
+
+
+class EvaluationCacheInfo(typ.NamedTuple):
+    """Statistics of the evaluation cache of a QuantumConverter, like ``functools.lru_cache``."""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class _EvaluationCache:
+    """
+    A bounded LRU cache of evaluated bitstrings, keyed by their packed binary variables.
+
+    Every entry is one row of `_ArrayDecoder.evaluate_array`.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: collections.OrderedDict[bytes, np.ndarray] = (
+            collections.OrderedDict()
+        )
+
+    def info(self) -> EvaluationCacheInfo:
+        return EvaluationCacheInfo(
+            self.hits, self.misses, self.maxsize, len(self._entries)
+        )
+
+    def clear(self) -> None:
+        self.hits = self.misses = 0
+        self._entries.clear()
+
+    def evaluate(
+        self,
+        packed: np.ndarray,
+        evaluate_rows: typ.Callable[[np.ndarray], np.ndarray],
+    ) -> np.ndarray:
+        """
+        Returns the evaluation of every row of ``packed``, calling ``evaluate_rows`` once with
+        the indices of the first occurrence of each bitstring that is not cached.
+        """
+        keys = [row.tobytes() for row in packed]
+        rows: list[typ.Optional[np.ndarray]] = []
+        missing: dict[bytes, int] = {}
+        for index, key in enumerate(keys):
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                # A repeated bitstring of this batch is evaluated once.
+                missing.setdefault(key, index)
+                self.misses += 1
+            rows.append(entry)
+
+        if missing:
+            new_values = evaluate_rows(np.fromiter(missing.values(), dtype=np.int64))
+            # Copy the rows, so that an entry does not keep its whole batch alive.
+            new_entries = {key: row.copy() for key, row in zip(missing, new_values)}
+            for index, key in enumerate(keys):
+                if rows[index] is None:
+                    rows[index] = new_entries[key]
+            for key, value in new_entries.items():
+                self._entries[key] = value
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        if not rows:
+            return evaluate_rows(np.zeros(0, dtype=np.int64))
+        return np.vstack(rows)
+
 
 # Helper functions for decoding results
 def decode_from_dict_binary_result(
@@ -19,6 +19,8 @@ QAOA-specific operations such as ansatz circuit generation and result decoding.
 Key Features:
 - Generation of QAOA ansatz circuits
 - Construction of cost Hamiltonians for QAOA
+- Exact NumPy statevector simulation of the ansatz (see :mod:`qamomile.core.qaoa_simulator`)
+- Closed-form expectation values of depth-1 QAOA (see :mod:`qamomile.core.qaoa_p1`)
 - Decoding of quantum computation results into classical optimization solutions
 
 
@@ -31,11 +33,21 @@ Note: This module requires `jijmodeling` and `jijmodeling_transpiler` for proble
 
 import typing as typ
 import jijmodeling_transpiler.core as jmt
+import numpy as np
 import qamomile.core.bitssample as qm_bs
 import qamomile.core.circuit as qm_c
 import qamomile.core.operator as qm_o
 from qamomile.core.converters.converter import QuantumConverter
-from qamomile.core.converters.utils import is_close_zero
+from qamomile.core.converters.utils import (
+    encode_hubo_terms,
+    encode_ising_terms,
+    is_close_zero,
+)
+from qamomile.core.ising_qubo import HUBOIsingModel, IsingModel
+from qamomile.core.qaoa_simulator import QAOASimulator
+
+if typ.TYPE_CHECKING:
+    from qamomile.core.qaoa_p1 import QAOAP1Evaluator
 
 
 class QAOAConverter(QuantumConverter):
@@ -62,7 +74,10 @@ class QAOAConverter(QuantumConverter):
     """
 
     def get_cost_ansatz(
-        self, gamma: qm_c.Parameter, name: str = "Cost"
+        self,
+        gamma: qm_c.Parameter,
+        name: str = "Cost",
+        ising: typ.Optional[typ.Union[IsingModel, HUBOIsingModel]] = None,
     ) -> qm_c.QuantumCircuit:
         """
         Generate the cost ansatz circuit (:math:`e^{-\gamma H_P}`) for QAOA.
@@ -71,15 +86,28 @@ class QAOAConverter(QuantumConverter):
         Args:
             gamma (qm_c.Parameter): The gamma parameter for the cost ansatz.
             name (str, optional): Name of the circuit. Defaults to "Cost".
+            ising (IsingModel | HUBOIsingModel, optional): The Ising model to encode, e.g. one component
+                from ``get_ising().decompose()``, or ``get_hubo_ising()`` whose k-local terms become
+                multi-qubit Z rotations. Defaults to the Ising model of the problem.
 
         Returns:
             qm_c.QuantumCircuit: The cost ansatz circuit.
         """
-        ising = self.get_ising()
+        ising = self.get_ising() if ising is None else ising
         num_qubits = ising.num_bits()
 
         cost = qm_c.QuantumCircuit(num_qubits, 0, name=name)
 
+        if isinstance(ising, HUBOIsingModel):
+            # Apply RZ, RZZ and multi-qubit Z rotations for terms of each order
+            spins = ising.spin_indices.tolist()
+            ptr = ising.term_ptr.tolist()
+            for start, end, w in zip(ptr[:-1], ptr[1:], ising.values.tolist()):
+                if not is_close_zero(w):
+                    cost.multi_rz(2 * w * gamma, spins[start:end])
+            cost.update_qubits_label(self._qubit_labels(ising))
+            return cost
+
         # Apply RZ gates for linear terms
         for i, hi in ising.linear.items():
             if not is_close_zero(hi):
@@ -90,12 +118,15 @@ class QAOAConverter(QuantumConverter):
             if not is_close_zero(Jij):
                 cost.rzz(2 * Jij * gamma, i, j)
 
-        cost.update_qubits_label(self.int2varlabel)
+        cost.update_qubits_label(self._qubit_labels(ising))
 
         return cost
 
     def get_qaoa_ansatz(
-        self, p: int, initial_hadamard: bool = True
+        self,
+        p: int,
+        initial_hadamard: bool = True,
+        ising: typ.Optional[typ.Union[IsingModel, HUBOIsingModel]] = None,
     ) -> qm_c.QuantumCircuit:
         """
         Generate the complete QAOA ansatz circuit.
@@ -103,11 +134,16 @@ class QAOAConverter(QuantumConverter):
         Args:
             p (int): Number of QAOA layers.
             initial_hadamard (bool, optional): Whether to apply initial Hadamard gates. Defaults to True.
+            ising (IsingModel, optional): The Ising model to encode. Passing each sub-model of
+                ``get_ising().decompose()`` gives one smaller circuit per connected component, whose
+                samples can be combined with ``qamomile.core.decomposition.stitch_bits_samplesets``,
+                and passing ``get_hubo_ising()`` encodes higher-order terms without auxiliary qubits.
+                Defaults to the Ising model of the problem.
 
         Returns:
             qm_c.QuantumCircuit: The complete QAOA ansatz circuit.
         """
-        ising = self.get_ising()
+        ising = self.get_ising() if ising is None else ising
         num_qubits = ising.num_bits()
         qaoa_circuit = qm_c.QuantumCircuit(num_qubits, 0, name="QAOA")
 
@@ -120,7 +156,7 @@ class QAOAConverter(QuantumConverter):
         for _p in range(p):
             beta = qm_c.Parameter(f"beta_{_p}")
             gamma = qm_c.Parameter(f"gamma_{_p}")
-            cost = self.get_cost_ansatz(gamma, name=f"Cost_{_p}")
+            cost = self.get_cost_ansatz(gamma, name=f"Cost_{_p}", ising=ising)
 
             mixer = qm_c.QuantumCircuit(num_qubits, 0, name=f"Mixer_{_p}")
             for i in range(num_qubits):
@@ -129,35 +165,94 @@ class QAOAConverter(QuantumConverter):
             qaoa_circuit.append(cost)
             qaoa_circuit.append(mixer)
 
-        qaoa_circuit.update_qubits_label(self.int2varlabel)
+        qaoa_circuit.update_qubits_label(self._qubit_labels(ising))
 
         return qaoa_circuit
 
-    def get_cost_hamiltonian(self) -> qm_o.Hamiltonian:
+    def _qubit_labels(
+        self, ising: typ.Union[IsingModel, HUBOIsingModel]
+    ) -> dict[int, str]:
+        """Returns the variable labels of the qubits of ``ising``, following its index map."""
+        if ising.index_map is None:
+            return self.int2varlabel
+        return {
+            i: self.int2varlabel[ising.ising2qubo_index(i)]
+            for i in range(ising.num_bits())
+            if ising.ising2qubo_index(i) in self.int2varlabel
+        }
+
+    def get_cost_hamiltonian(
+        self, ising: typ.Optional[typ.Union[IsingModel, HUBOIsingModel]] = None
+    ) -> qm_o.Hamiltonian:
         """
         Construct the cost Hamiltonian for QAOA.
 
+        Args:
+            ising (IsingModel | HUBOIsingModel, optional): The Ising model to encode.
+                Defaults to the Ising model of the problem.
+
         Returns:
             qm_o.Hamiltonian: The cost Hamiltonian.
         """
-        hamiltonian = qm_o.Hamiltonian()
-        ising = self.get_ising()
+        ising = self.get_ising() if ising is None else ising
+        if isinstance(ising, HUBOIsingModel):
+            return encode_hubo_terms(ising)
+        return encode_ising_terms(ising)
+
+    def get_qaoa_simulator(
+        self,
+        ising: typ.Optional[typ.Union[IsingModel, HUBOIsingModel]] = None,
+        initial_hadamard: bool = True,
+        dtype: typ.Union[type, np.dtype] = np.complex128,
+    ) -> QAOASimulator:
+        """
+        Create a NumPy statevector simulator of the QAOA ansatz.
 
-        # Add linear terms
-        for i, hi in ising.linear.items():
-            if not is_close_zero(hi):
-                hamiltonian.add_term((qm_o.PauliOperator(qm_o.Pauli.Z, i),), hi)
+        The simulator computes the cost diagonal once and evaluates the circuit of
+        `get_qaoa_ansatz` for any parameters without transpiling it to a quantum SDK,
+        which is much faster for parameter optimization on up to about 26 qubits.
+        Its samples can be decoded with `decode_bits_to_sampleset`.
 
-        # Add quadratic terms
-        for (i, j), Jij in ising.quad.items():
-            if not is_close_zero(Jij):
-                hamiltonian.add_term(
-                    (
-                        qm_o.PauliOperator(qm_o.Pauli.Z, i),
-                        qm_o.PauliOperator(qm_o.Pauli.Z, j),
-                    ),
-                    Jij,
-                )
-
-        hamiltonian.constant = ising.constant
-        return hamiltonian
+        Args:
+            ising (IsingModel | HUBOIsingModel, optional): The Ising model to simulate.
+                Defaults to the Ising model of the problem.
+            initial_hadamard (bool, optional): Start from the uniform superposition, as in
+                `get_qaoa_ansatz`. Defaults to True.
+            dtype (type | np.dtype, optional): The complex dtype of the statevector.
+                Defaults to np.complex128.
+
+        Returns:
+            QAOASimulator: The simulator.
+        """
+        ising = self.get_ising() if ising is None else ising
+        return QAOASimulator(ising, initial_hadamard=initial_hadamard, dtype=dtype)
+
+    def get_p1_evaluator(
+        self, ising: typ.Optional[IsingModel] = None
+    ) -> "QAOAP1Evaluator":
+        """
+        Create a closed-form evaluator of the expectation value of depth-1 QAOA.
+
+        The evaluator gives the expectation value of the cost Hamiltonian for the circuit of
+        `get_qaoa_ansatz` with ``p=1`` and its gradient without simulating the state, in time
+        linear in the number of couplings and triangles, and over whole grids of parameters.
+        This makes the search of the two parameters cheap on problems with thousands of spins,
+        e.g. to find initial points for deeper circuits.
+
+        Args:
+            ising (IsingModel, optional): The Ising model. Defaults to the Ising model of the problem.
+
+        Returns:
+            QAOAP1Evaluator: The evaluator.
+
+        Raises:
+            ValueError: If the model has higher-order terms.
+        """
+        from qamomile.core.qaoa_p1 import QAOAP1Evaluator
+
+        ising = self.get_ising() if ising is None else ising
+        if isinstance(ising, HUBOIsingModel):
+            raise ValueError(
+                "The closed-form depth-1 expectation only supports quadratic Ising models."
+            )
+        return QAOAP1Evaluator(ising)
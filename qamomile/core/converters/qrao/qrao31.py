@@ -51,7 +51,7 @@ from __future__ import annotations
 import typing as typ
 import numpy as np
 from qamomile.core.converters.converter import QuantumConverter
-from qamomile.core.converters.utils import is_close_zero
+from qamomile.core.converters.utils import encode_ising_terms
 from qamomile.core.ising_qubo import IsingModel
 import qamomile.core.operator as qm_o
 from .graph_coloring import greedy_graph_coloring, check_linear_term
@@ -87,34 +87,9 @@ def qrac31_encode_ising(
 ) -> tuple[qm_o.Hamiltonian, dict[int, qm_o.PauliOperator]]:
     encoded_ope = color_group_to_qrac_encode(color_group)
 
-    offset = ising.constant
-
-    hamiltonian = qm_o.Hamiltonian()
-    hamiltonian.constant = offset
-
-    # convert linear parts of the objective function into Hamiltonian.
-    for idx, coeff in ising.linear.items():
-        if is_close_zero(coeff):
-            continue
-
-        pauli = encoded_ope[idx]
-        hamiltonian.add_term((pauli,), np.sqrt(3) * coeff)
-
-    # create Pauli terms
-    for (i, j), coeff in ising.quad.items():
-        if is_close_zero(coeff):
-            continue
-
-        if i == j:
-            hamiltonian.constant += coeff
-            continue
-
-        pauli_i = encoded_ope[i]
-
-        pauli_j = encoded_ope[j]
-
-        hamiltonian.add_term((pauli_i, pauli_j), 3 * coeff)
-
+    hamiltonian = encode_ising_terms(
+        ising, encoded_ope, linear_scale=np.sqrt(3), quad_scale=3
+    )
     return hamiltonian, encoded_ope
 
 
@@ -144,13 +144,16 @@ def qrac32_encode_ising(
     hamiltonian = qm_o.Hamiltonian()
     hamiltonian.constant = offset
 
+    # each prime operator is reused for every term the variable appears in.
+    primes = {idx: create_prime_operator(pauli) for idx, pauli in encoded_ope.items()}
+
     # convert linear parts of the objective function into Hamiltonian.
+    # `+=` accumulates in place, so the encoding is linear in the number of terms.
     for idx, coeff in ising.linear.items():
         if is_close_zero(coeff):
             continue
 
-        pauli = encoded_ope[idx]
-        prime_i = create_prime_operator(pauli)
+        prime_i = primes[idx]
         hamiltonian += np.sqrt(6) * coeff * prime_i
 
     # create quad terms
@@ -162,11 +165,8 @@ def qrac32_encode_ising(
             hamiltonian.constant += coeff
             continue
 
-        pauli_i = encoded_ope[i]
-        prime_i = create_prime_operator(pauli_i)
-
-        pauli_j = encoded_ope[j]
-        prime_j = create_prime_operator(pauli_j)
+        prime_i = primes[i]
+        prime_j = primes[j]
 
         hamiltonian += 6 * coeff * prime_i * prime_j
 
@@ -67,7 +67,7 @@ from qamomile.core.converters.converter import QuantumConverter
 from qamomile.core.ising_qubo import IsingModel
 import qamomile.core.operator as qm_o
 from .graph_coloring import greedy_graph_coloring, check_linear_term
-from qamomile.core.converters.utils import is_close_zero
+from qamomile.core.converters.utils import ising_coefficient_arrays
 
 def numbering_space_efficient_encode(
     ising: IsingModel,
@@ -98,36 +98,30 @@ def qrac_space_efficient_encode_ising(
 ) -> tuple[qm_o.Hamiltonian, dict[int, qm_o.PauliOperator]]:
     encoded_ope = numbering_space_efficient_encode(ising)
 
-    offset = ising.constant
-
-    hamiltonian = qm_o.Hamiltonian()
-    hamiltonian.constant = offset
-
-    # convert linear parts of the objective function into Hamiltonian.
-    for idx, coeff in ising.linear.items():
-        if is_close_zero(coeff):
-            continue
-
-        pauli = encoded_ope[idx]
-        hamiltonian.add_term((pauli,), np.sqrt(3) * coeff)
-
-    # create Pauli terms
-    for (i, j), coeff in ising.quad.items():
-        if is_close_zero(coeff):
-            continue
-
-        if i == j:
-            hamiltonian.constant += coeff
-            continue
-
-        pauli_i = encoded_ope[i]
-
-        pauli_j = encoded_ope[j]
-
-        if pauli_i.index == pauli_j.index:
-            hamiltonian.add_term((qm_o.PauliOperator(qm_o.Pauli.Z, pauli_i.index),), np.sqrt(3) * coeff)
-        else:
-            hamiltonian.add_term((pauli_i, pauli_j), 3 * coeff)
+    linear, h, pairs, J, constant = ising_coefficient_arrays(ising)
+
+    def encode(spins: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        ops = [encoded_ope[i] for i in spins.ravel().tolist()]
+        qubits = np.array([op.index for op in ops], dtype=np.int64)
+        codes = np.array([op.pauli.value for op in ops], dtype=np.int64)
+        return qubits.reshape(spins.shape), codes.reshape(spins.shape)
+
+    linear_qubits, linear_codes = encode(linear)
+    pair_qubits, pair_codes = encode(pairs)
+    # Two variables on the same qubit are encoded by Z on that qubit.
+    same = pair_qubits[:, 0] == pair_qubits[:, 1]
+    pair_codes[same, 0] = qm_o.Pauli.Z.value
+    keep = np.ones(pairs.shape, dtype=bool)
+    keep[same, 1] = False
+
+    lengths = np.concatenate([np.ones(len(linear), dtype=np.int64), 2 - same])
+    hamiltonian = qm_o.Hamiltonian.from_arrays(
+        np.concatenate([[0], np.cumsum(lengths)]),
+        np.concatenate([linear_qubits, pair_qubits[keep]]),
+        np.concatenate([linear_codes, pair_codes[keep]]),
+        np.concatenate([np.sqrt(3) * h, np.where(same, np.sqrt(3), 3) * J]),
+        constant=constant,
+    )
 
     return hamiltonian, encoded_ope
 
@@ -0,0 +1,192 @@
+"""
+qamomile/core/converters/streaming.py
+
+This module provides the pieces of the streaming decode of QuantumConverter, for results with so
+many distinct bitstrings that their SampleSet does not fit in memory.
+
+The results are consumed as an iterable of batches (e.g. shot batches fetched from a backend one
+after the other) and processed in chunks of a bounded number of rows.
+``QuantumConverter.decode_stream`` yields a partial SampleSet per chunk, and
+``QuantumConverter.summarize_stream`` only keeps running aggregates in a `DecodeSummary`.
+
+Key Components:
+- BitsBatch: The accepted batch types.
+- iter_bits_chunks: Split batches into chunks of bits and numbers of occurrences.
+- DecodeSummary: Shot counts, objective histograms and the best feasible solutions.
+
+Usage:
+    summary = converter.summarize_stream(batches, k=5, bins=np.linspace(-10, 10, 41))
+    summary.best  # SampleSet of the 5 best feasible bitstrings
+    summary.feasible_histogram
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import typing as typ
+
+import numpy as np
+
+import qamomile.core.bitssample as qm_bs
+
+BitsBatch = typ.Union[
+    qm_bs.BitsSampleSet, np.ndarray, tuple[np.ndarray, typ.Sequence[int]]
+]
+
+
+def iter_bits_chunks(
+    batches: typ.Iterable[BitsBatch], chunk_size: typ.Optional[int] = None
+) -> typ.Iterator[tuple[np.ndarray, np.ndarray]]:
+    """
+    Splits batches of results into chunks of at most ``chunk_size`` rows.
+
+    Args:
+        batches (Iterable[BitsBatch]): BitsSampleSets, bit matrices with shape (S, N) (one
+            occurrence each), or pairs of a bit matrix and the numbers of occurrences of its rows.
+        chunk_size (Optional[int]): The maximum number of rows of a chunk. Defaults to None
+            (one chunk per batch).
+
+    Yields:
+        tuple[np.ndarray, np.ndarray]: Bits (S, N) as uint8 and the numbers of occurrences (S,).
+
+    Raises:
+        ValueError: If ``chunk_size`` is not positive.
+
+    Example:
+        >>> batch = qm_bs.BitsSampleSet([qm_bs.BitsSample(3, [0, 1]), qm_bs.BitsSample(1, [1, 1])])
+        >>> [(bits.tolist(), counts.tolist()) for bits, counts in iter_bits_chunks([batch], 1)]
+        [([[0, 1]], [3]), ([[1, 1]], [1])]
+    """
+    if chunk_size is not None and chunk_size <= 0:
+        raise ValueError(f"chunk_size must be positive, but got {chunk_size}.")
+    for batch in batches:
+        if isinstance(batch, qm_bs.BitsSampleSet):
+            counts = np.array(
+                [sample.num_occurrences for sample in batch.bitarrays], dtype=np.int64
+            )
+            bits = np.array(
+                [sample.bits for sample in batch.bitarrays], dtype=np.uint8
+            ).reshape(len(counts), -1 if len(counts) else 0)
+        elif isinstance(batch, tuple):
+            bits = np.asarray(batch[0], dtype=np.uint8)
+            counts = np.asarray(batch[1], dtype=np.int64)
+        else:
+            bits = np.asarray(batch, dtype=np.uint8)
+            counts = np.ones(len(bits), dtype=np.int64)
+
+        step = chunk_size or max(1, len(bits))
+        for start in range(0, len(bits), step):
+            yield bits[start : start + step], counts[start : start + step]
+
+
+@dataclasses.dataclass
+class DecodeSummary:
+    """
+    Running aggregates of a streamed decode, in memory bounded by ``k`` and the chunk size.
+
+    A sample is feasible if its total constraint violation is at most ``feasibility_tol``.
+
+    Attributes:
+        k (int): The number of best feasible bitstrings to keep.
+        bin_edges (Optional[np.ndarray]): The bin edges of the objective histograms.
+        maximize (bool): Whether larger objectives are better.
+        feasibility_tol (float): The tolerance of the total constraint violation.
+        num_shots (int): The number of shots seen.
+        num_feasible_shots (int): The number of feasible shots seen.
+        min_objective (float): The smallest objective seen (inf if none).
+        max_objective (float): The largest objective seen (-inf if none).
+        histogram (Optional[np.ndarray]): Shots per objective bin, like ``np.histogram``.
+            Objectives outside the bins are not counted.
+        feasible_histogram (Optional[np.ndarray]): The same for the feasible shots.
+        best_bits (np.ndarray): The binary variables of the PUBO of the best feasible bitstrings,
+            from best to worst with ties in lexicographic order of the bits, with shape (<= k, B).
+        best_objective (np.ndarray): Their objectives.
+        best_counts (np.ndarray): Their numbers of occurrences.
+        best (Optional[jm.experimental.SampleSet]): Their SampleSet, set by
+            ``QuantumConverter.summarize_stream`` at the end of the stream.
+    """
+
+    k: int = 10
+    bin_edges: typ.Optional[np.ndarray] = None
+    maximize: bool = False
+    feasibility_tol: float = 1e-9
+    num_shots: int = 0
+    num_feasible_shots: int = 0
+    min_objective: float = np.inf
+    max_objective: float = -np.inf
+    histogram: typ.Optional[np.ndarray] = None
+    feasible_histogram: typ.Optional[np.ndarray] = None
+    best_bits: np.ndarray = dataclasses.field(
+        default_factory=lambda: np.zeros((0, 0), dtype=np.uint8)
+    )
+    best_objective: np.ndarray = dataclasses.field(
+        default_factory=lambda: np.zeros(0)
+    )
+    best_counts: np.ndarray = dataclasses.field(
+        default_factory=lambda: np.zeros(0, dtype=np.int64)
+    )
+    best: typ.Any = None
+
+    def __post_init__(self):
+        if self.k < 0:
+            raise ValueError(f"k must be non-negative, but got {self.k}.")
+        if self.bin_edges is not None:
+            self.bin_edges = np.asarray(self.bin_edges, dtype=np.float64)
+            self.histogram = np.zeros(len(self.bin_edges) - 1, dtype=np.int64)
+            self.feasible_histogram = np.zeros(len(self.bin_edges) - 1, dtype=np.int64)
+
+    def update(
+        self,
+        qubo_bits: np.ndarray,
+        counts: np.ndarray,
+        objective: np.ndarray,
+        violation: np.ndarray,
+    ) -> None:
+        """
+        Adds a chunk of evaluated samples.
+
+        Args:
+            qubo_bits (np.ndarray): The binary variables (S, B) of the PUBO.
+            counts (np.ndarray): The numbers of occurrences (S,).
+            objective (np.ndarray): The objectives (S,).
+            violation (np.ndarray): The total constraint violations (S,).
+        """
+        feasible = violation <= self.feasibility_tol
+        self.num_shots += int(counts.sum())
+        self.num_feasible_shots += int(counts[feasible].sum())
+        if len(objective):
+            self.min_objective = min(self.min_objective, float(objective.min()))
+            self.max_objective = max(self.max_objective, float(objective.max()))
+        if self.bin_edges is not None:
+            self.histogram += np.histogram(objective, self.bin_edges, weights=counts)[
+                0
+            ].astype(np.int64)
+            self.feasible_histogram += np.histogram(
+                objective[feasible], self.bin_edges, weights=counts[feasible]
+            )[0].astype(np.int64)
+        if self.k > 0 and feasible.any():
+            self._update_best(qubo_bits[feasible], counts[feasible], objective[feasible])
+
+    def _update_best(
+        self, qubo_bits: np.ndarray, counts: np.ndarray, objective: np.ndarray
+    ) -> None:
+        if len(self.best_bits):
+            qubo_bits = np.vstack([self.best_bits, qubo_bits])
+            counts = np.concatenate([self.best_counts, counts])
+            objective = np.concatenate([self.best_objective, objective])
+        # The bitstrings are ranked by objective, then by their bits (np.unique sorts them and
+        # the argsort is stable). A bitstring has one objective, so this order is total and an
+        # evicted bitstring never comes back once k better ones are kept, even on ties at k:
+        # the counts of the kept ones are exact.
+        unique, first, inverse = np.unique(
+            qubo_bits, axis=0, return_index=True, return_inverse=True
+        )
+        unique_counts = np.zeros(len(unique), dtype=np.int64)
+        np.add.at(unique_counts, inverse.ravel(), counts)
+        unique_objective = objective[first]
+        order = np.argsort(
+            -unique_objective if self.maximize else unique_objective, kind="stable"
+        )[: self.k]
+        self.best_bits = unique[order]
+        self.best_counts = unique_counts[order]
+        self.best_objective = unique_objective[order]
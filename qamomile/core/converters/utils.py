@@ -1,4 +1,11 @@
 import math
+import typing as typ
+
+import numpy as np
+
+import qamomile.core.operator as qm_o
+from qamomile.core.ising_qubo import HUBOIsingModel, IsingModel
+
 
 def is_close_zero(value: float,abs_tol = 1e-15) -> bool:
     """
@@ -10,4 +17,114 @@ def is_close_zero(value: float,abs_tol = 1e-15) -> bool:
     Returns:
         bool: True if the value is close to zero, False otherwise.
     """
-    return math.isclose(value, 0.0, abs_tol=abs_tol)
\ No newline at end of file
+    return math.isclose(value, 0.0, abs_tol=abs_tol)
+
+
+def ising_coefficient_arrays(
+    ising: IsingModel, abs_tol: float = 1e-15
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, float]:
+    """
+    Collect the coefficients of an Ising model into arrays, skipping those close to zero.
+
+    Quadratic terms with two equal indices are added to the constant, since :math:`Z_i Z_i = I`.
+
+    Args:
+        ising (IsingModel): The Ising model.
+        abs_tol (float): Coefficients with an absolute value up to this tolerance are skipped.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, float]: The linear indices,
+        the linear coefficients, the quadratic index pairs with shape (n, 2),
+        the quadratic coefficients and the constant.
+
+    Examples:
+        >>> ising = IsingModel({(0, 1): 2.0, (1, 1): 1.0}, {0: 0.0, 1: 3.0}, 0.5)
+        >>> linear, h, pairs, J, constant = ising_coefficient_arrays(ising)
+        >>> linear.tolist(), h.tolist(), pairs.tolist(), J.tolist(), constant
+        ([1], [3.0], [[0, 1]], [2.0], 1.5)
+    """
+    linear, h = ising.linear_indices, ising.linear_values
+    keep = np.abs(h) > abs_tol
+    linear, h = linear[keep], h[keep]
+
+    pairs, J = ising.quad_indices, ising.quad_values
+    keep = np.abs(J) > abs_tol
+    pairs, J = pairs[keep], J[keep]
+
+    constant = ising.constant
+    diagonal = pairs[:, 0] == pairs[:, 1]
+    for value in J[diagonal].tolist():
+        constant += value
+    return linear, h, pairs[~diagonal], J[~diagonal], constant
+
+
+def encode_ising_terms(
+    ising: IsingModel,
+    encoded_ope: typ.Optional[dict[int, qm_o.PauliOperator]] = None,
+    linear_scale: float = 1.0,
+    quad_scale: float = 1.0,
+) -> qm_o.Hamiltonian:
+    """
+    Build the Hamiltonian :math:`a \\sum_i h_i P_i + b \\sum_{ij} J_{ij} P_i P_j + C` of an Ising model in one pass.
+
+    Args:
+        ising (IsingModel): The Ising model.
+        encoded_ope (Optional[dict[int, qm_o.PauliOperator]]): The Pauli operator :math:`P_i` of each spin.
+            Defaults to :math:`Z_i`.
+        linear_scale (float): The factor :math:`a` of the linear terms.
+        quad_scale (float): The factor :math:`b` of the quadratic terms.
+
+    Returns:
+        qm_o.Hamiltonian: The Hamiltonian.
+
+    Examples:
+        >>> ising = IsingModel({(0, 1): 2.0}, {0: 1.0}, 0.5)
+        >>> encode_ising_terms(ising)
+        Hamiltonian((Z0,): 1.0, (Z0, Z1): 2.0)
+    """
+    linear, h, pairs, J, constant = ising_coefficient_arrays(ising)
+    spins = np.concatenate([linear, pairs.ravel()])
+    if encoded_ope is None:
+        qubit_idx = spins
+        pauli_code = np.full(len(spins), qm_o.Pauli.Z.value)
+    else:
+        ops = [encoded_ope[i] for i in spins.tolist()]
+        qubit_idx = np.array([op.index for op in ops], dtype=np.int64)
+        pauli_code = np.array([op.pauli.value for op in ops], dtype=np.int64)
+    term_ptr = np.concatenate(
+        [np.arange(len(linear)), len(linear) + 2 * np.arange(len(J) + 1)]
+    )
+    return qm_o.Hamiltonian.from_arrays(
+        term_ptr,
+        qubit_idx,
+        pauli_code,
+        np.concatenate([linear_scale * h, quad_scale * J]),
+        constant=constant,
+    )
+
+
+def encode_hubo_terms(hubo: HUBOIsingModel, abs_tol: float = 1e-15) -> qm_o.Hamiltonian:
+    """
+    Build the Hamiltonian :math:`\\sum_S w_S \\prod_{i \\in S} Z_i + C` of a higher-order Ising model.
+
+    Args:
+        hubo (HUBOIsingModel): The higher-order Ising model.
+        abs_tol (float): Terms with coefficients within this tolerance of zero are dropped.
+
+    Returns:
+        qm_o.Hamiltonian: The Hamiltonian.
+
+    Examples:
+        >>> encode_hubo_terms(HUBOIsingModel({(0, 1, 2): 2.0, (1,): -1.0}, 0.5))
+        Hamiltonian((Z0, Z1, Z2): 2.0, (Z1,): -1.0)
+    """
+    lengths = np.diff(hubo.term_ptr)
+    keep = np.abs(hubo.values) > abs_tol
+    spins = hubo.spin_indices[np.repeat(keep, lengths)]
+    return qm_o.Hamiltonian.from_arrays(
+        np.concatenate([[0], np.cumsum(lengths[keep])]),
+        spins,
+        np.full(len(spins), qm_o.Pauli.Z.value),
+        hubo.values[keep],
+        constant=hubo.constant,
+    )
@@ -0,0 +1,142 @@
+"""
+qamomile/core/decomposition.py
+
+This module solves an Ising model component by component. Spins in different connected
+components of the quadratic terms do not interact, so every component can be sampled or
+optimized on its own with fewer qubits, and the results are stitched into one sample set
+over all spins.
+
+Key Components:
+- stitch_bits_samplesets: Combine per-component BitsSampleSets into one BitsSampleSet.
+- solve_components: Decompose an IsingModel, run a solver on every component (optionally
+  in a process pool) and stitch the results.
+
+Usage:
+    from qamomile.core.decomposition import solve_components
+
+    def solver(sub_ising: IsingModel) -> BitsSampleSet:
+        ...  # e.g. run QAOA built with QAOAConverter.get_qaoa_ansatz(p, ising=sub_ising)
+
+    bitssampleset = solve_components(ising, solver, max_workers=4)
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import typing as typ
+
+import numpy as np
+
+from qamomile.core.bitssample import BitsSample, BitsSampleSet
+from qamomile.core.ising_qubo import IsingModel
+
+
+def _shots(bitssampleset: BitsSampleSet, num_bits: int) -> np.ndarray:
+    """Expands a sample set into one row of bits per shot."""
+    if not bitssampleset.bitarrays:
+        raise ValueError("Every component must have at least one sample.")
+    bits = np.array(
+        [sample.bits[:num_bits] for sample in bitssampleset.bitarrays], dtype=np.uint8
+    ).reshape(-1, num_bits)
+    counts = [sample.num_occurrences for sample in bitssampleset.bitarrays]
+    return np.repeat(bits, counts, axis=0)
+
+
+def stitch_bits_samplesets(
+    components: typ.Sequence[np.ndarray],
+    bitssamplesets: typ.Sequence[BitsSampleSet],
+    num_bits: int,
+    seed: typ.Optional[int] = None,
+) -> BitsSampleSet:
+    """
+    Combines the sample sets of independent components into one sample set.
+
+    The shots of each component are shuffled and paired up, so a stitched shot is a draw from the
+    product of the component distributions. Components with fewer shots than the largest one
+    reuse their shots cyclically. Bits that belong to no component are 0.
+
+    Args:
+        components (Sequence[np.ndarray]): The spin indices of each component, as returned by
+            `IsingModel.connected_components`.
+        bitssamplesets (Sequence[BitsSampleSet]): The samples of each component, whose bit k is
+            spin ``components[i][k]``.
+        num_bits (int): The number of bits of the stitched samples.
+        seed (Optional[int]): Seed of the shuffling. Defaults to None.
+
+    Returns:
+        BitsSampleSet: The stitched samples, with identical bit arrays merged.
+
+    Raises:
+        ValueError: If the numbers of components and sample sets differ, or a sample set is empty.
+
+    Example:
+        >>> stitched = stitch_bits_samplesets(
+        ...     [np.array([0, 2]), np.array([1])],
+        ...     [BitsSampleSet([BitsSample(2, [1, 1])]), BitsSampleSet([BitsSample(2, [0])])],
+        ...     num_bits=3,
+        ... )
+        >>> stitched.bitarrays
+        [BitsSample(num_occurrences=2, bits=[1, 0, 1])]
+    """
+    if len(components) != len(bitssamplesets):
+        raise ValueError(
+            f"Got {len(bitssamplesets)} sample sets for {len(components)} components."
+        )
+    rng = np.random.default_rng(seed)
+    shots = [
+        rng.permutation(_shots(sampleset, len(spins)))
+        for spins, sampleset in zip(components, bitssamplesets)
+    ]
+    num_shots = max((len(s) for s in shots), default=1)
+    stitched = np.zeros((num_shots, num_bits), dtype=np.uint8)
+    for spins, component_shots in zip(components, shots):
+        stitched[:, spins] = np.resize(component_shots, (num_shots, len(spins)))
+
+    unique, counts = np.unique(stitched, axis=0, return_counts=True)
+    return BitsSampleSet(
+        [
+            BitsSample(int(count), bits)
+            for bits, count in zip(unique.tolist(), counts.tolist())
+        ]
+    )
+
+
+def solve_components(
+    ising: IsingModel,
+    solver: typ.Callable[[IsingModel], BitsSampleSet],
+    max_workers: typ.Optional[int] = None,
+    seed: typ.Optional[int] = None,
+) -> BitsSampleSet:
+    """
+    Solves every connected component of an Ising model separately and stitches the results.
+
+    Args:
+        ising (IsingModel): The Ising model to solve.
+        solver (Callable[[IsingModel], BitsSampleSet]): Samples or optimizes one component, given as
+            a sub-model from `IsingModel.decompose`. A bit of its result is 1 for spin -1, as in
+            ``QuantumConverter.decode_bits_to_sampleset``.
+        max_workers (Optional[int]): If given, the components are solved in a process pool with this
+            many workers, and ``solver`` must be picklable. Defaults to None (solved in this process).
+        seed (Optional[int]): Seed of the stitching, see `stitch_bits_samplesets`. Defaults to None.
+
+    Returns:
+        BitsSampleSet: Samples over all `num_bits` spins of ``ising``.
+
+    Example:
+        >>> ising = IsingModel({(0, 1): -1.0}, {2: 1.0}, 0.0)
+        >>> def solver(sub):
+        ...     best = min(range(2 ** sub.num_bits()), key=lambda v: sub.calc_energy(
+        ...         [1 - 2 * ((v >> i) & 1) for i in range(sub.num_bits())]))
+        ...     return BitsSampleSet.from_int_counts({best: 1}, sub.num_bits())
+        >>> solve_components(ising, solver).bitarrays
+        [BitsSample(num_occurrences=1, bits=[0, 0, 1])]
+    """
+    sub_models = ising.decompose()
+    if max_workers is None:
+        results = [solver(sub) for sub in sub_models]
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(solver, sub_models))
+    return stitch_bits_samplesets(
+        ising.connected_components(), results, ising.num_bits(), seed=seed
+    )
@@ -0,0 +1,402 @@
+"""
+This module groups the terms of a Hamiltonian into simultaneously measurable sets.
+
+Estimating :math:`\\langle H \\rangle` from shots needs one measurement setting per group
+of commuting terms instead of one per term. Two kinds of grouping are supported:
+
+- "qubit_wise": terms whose Pauli operators agree on every qubit where both act
+  non-trivially. Each group is measured with single-qubit basis changes.
+- "general": terms that commute as operators. Each group is measured after a
+  Clifford circuit (CNOT, CZ, S and H gates) that maps every term to a Z string.
+
+Terms are the vertices of a conflict graph whose edges join terms that can not be
+measured together. The graph is built with vectorized operations on the packed x/z masks
+(see :mod:`qamomile.core.symplectic`), and its colour classes, found by greedy or DSatur
+colouring, are the measurement groups.
+
+Key Components:
+- group_commuting_terms: Partition a Hamiltonian into MeasurementGroup objects.
+- MeasurementGroup: The terms, basis-change circuit and diagonalized form of one group.
+- conflict_graph: The vectorized conflict graph in CSR form.
+- greedy_coloring, dsatur_coloring: Graph colouring heuristics.
+
+Usage:
+    import qamomile.core.operator as qm_o
+    from qamomile.core.grouping import group_commuting_terms
+
+    h = qm_o.X(0) * qm_o.X(1) + qm_o.Z(0) * qm_o.Z(1) + qm_o.Z(0)
+    groups = group_commuting_terms(h, kind="general")
+    for group in groups:
+        print(group.hamiltonian, group.circuit)
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import typing as typ
+
+import numpy as np
+
+import qamomile.core.bitssample as qm_bs
+import qamomile.core.circuit as qm_c
+import qamomile.core.operator as qm_o
+from qamomile.core.symplectic import popcount
+
+
+def _unpack(masks: np.ndarray, num_qubits: int) -> np.ndarray:
+    bits = np.unpackbits(
+        np.ascontiguousarray(masks).view(np.uint8), axis=1, bitorder="little"
+    )
+    if bits.shape[1] < num_qubits:
+        bits = np.pad(bits, ((0, 0), (0, num_qubits - bits.shape[1])))
+    return bits[:, :num_qubits].astype(bool)
+
+
+def conflict_graph(
+    x: np.ndarray,
+    z: np.ndarray,
+    kind: typ.Literal["qubit_wise", "general"] = "qubit_wise",
+    max_pairs: int = 1 << 22,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Builds the graph joining Pauli strings that can not be measured together.
+
+    Two strings conflict when they do not qubit-wise commute ("qubit_wise"), i.e. they
+    act with different non-identity Paulis on some qubit, or when they anticommute
+    ("general"), i.e. their symplectic product :math:`|x_a \\wedge z_b| + |z_a \\wedge x_b|` is odd.
+
+    Args:
+        x (np.ndarray): X masks with shape (n, num_words).
+        z (np.ndarray): Z masks with shape (n, num_words).
+        kind (Literal["qubit_wise", "general"]): The commutation relation to use.
+        max_pairs (int): The maximum number of pairs compared at once.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The CSR ``indptr`` and ``indices`` arrays of the graph.
+
+    Example:
+        >>> x = np.array([[0b01], [0b00], [0b11]], dtype=np.uint64)
+        >>> z = np.array([[0b00], [0b01], [0b00]], dtype=np.uint64)
+        >>> indptr, indices = conflict_graph(x, z)
+        >>> indptr.tolist(), indices.tolist()
+        ([0, 1, 3, 4], [1, 0, 2, 1])
+    """
+    if kind not in ("qubit_wise", "general"):
+        raise ValueError(f"Invalid value for kind: {kind}")
+    n = len(x)
+    chunk = max(1, max_pairs // max(n, 1))
+    support = x | z
+    rows, cols = [], []
+    for start in range(0, n, chunk):
+        xa = x[start : start + chunk, None, :]
+        za = z[start : start + chunk, None, :]
+        if kind == "qubit_wise":
+            both = support[start : start + chunk, None, :] & support[None, :, :]
+            differ = (xa ^ x[None, :, :]) | (za ^ z[None, :, :])
+            conflict = (both & differ).any(axis=-1)
+        else:
+            product = (xa & z[None, :, :]) ^ (za & x[None, :, :])
+            conflict = (popcount(product) & 1).astype(bool)
+        r, c = np.nonzero(conflict)
+        rows.append(r + start)
+        cols.append(c)
+    rows = np.concatenate(rows) if rows else np.zeros(0, dtype=np.int64)
+    cols = np.concatenate(cols) if cols else np.zeros(0, dtype=np.int64)
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+    return indptr, cols.astype(np.int64)
+
+
+def greedy_coloring(indptr: np.ndarray, indices: np.ndarray) -> np.ndarray:
+    """
+    Colours a graph greedily, visiting vertices in order of decreasing degree.
+
+    Args:
+        indptr (np.ndarray): CSR row pointers of the graph.
+        indices (np.ndarray): CSR column indices of the graph.
+
+    Returns:
+        np.ndarray: The colour of each vertex, numbered from 0.
+
+    Example:
+        >>> greedy_coloring(np.array([0, 1, 3, 4]), np.array([1, 0, 2, 1])).tolist()
+        [1, 0, 1]
+    """
+    n = len(indptr) - 1
+    degree = np.diff(indptr)
+    colors = np.full(n, -1, dtype=np.int64)
+    for v in np.argsort(-degree, kind="stable").tolist():
+        neighbor_colors = colors[indices[indptr[v] : indptr[v + 1]]]
+        used = np.zeros(degree[v] + 1, dtype=bool)
+        used[neighbor_colors[(neighbor_colors >= 0) & (neighbor_colors <= degree[v])]] = True
+        colors[v] = int(np.argmin(used))
+    return colors
+
+
+def dsatur_coloring(indptr: np.ndarray, indices: np.ndarray) -> np.ndarray:
+    """
+    Colours a graph with the DSatur heuristic.
+
+    The next vertex is the uncoloured one whose neighbours already use the most distinct
+    colours (ties broken by degree), and it gets the smallest colour not used by them.
+    DSatur usually needs fewer colours than the plain greedy order.
+
+    Args:
+        indptr (np.ndarray): CSR row pointers of the graph.
+        indices (np.ndarray): CSR column indices of the graph.
+
+    Returns:
+        np.ndarray: The colour of each vertex, numbered from 0.
+
+    Example:
+        >>> dsatur_coloring(np.array([0, 1, 3, 4]), np.array([1, 0, 2, 1])).tolist()
+        [1, 0, 1]
+    """
+    n = len(indptr) - 1
+    degree = np.diff(indptr)
+    colors = np.full(n, -1, dtype=np.int64)
+    saturation = np.zeros(n, dtype=np.int64)
+    # seen[v, c] is True if a neighbour of v has colour c.
+    seen = np.zeros((n, 8), dtype=bool)
+    num_colors = 0
+    priority = degree.astype(np.float64)
+    for _ in range(n):
+        v = int(np.argmax(priority))
+        color = int(np.argmin(seen[v, : num_colors + 1]))
+        colors[v] = color
+        priority[v] = -np.inf
+        if color == num_colors:
+            num_colors += 1
+            if num_colors >= seen.shape[1]:
+                seen = np.pad(seen, ((0, 0), (0, seen.shape[1])))
+        neighbors = indices[indptr[v] : indptr[v + 1]]
+        new = neighbors[~seen[neighbors, color]]
+        seen[new, color] = True
+        saturation[new] += 1
+        uncolored = new[colors[new] < 0]
+        priority[uncolored] = saturation[uncolored] * (n + 1) + degree[uncolored]
+    return colors
+
+
+# Gates are kept as (name, qubits) tuples so that the same list drives both the
+# QuantumCircuit and the conjugation of the measured terms.
+_Gate = tuple[str, tuple[int, ...]]
+
+
+def _conjugate(
+    x: np.ndarray, z: np.ndarray, sign: np.ndarray, gates: list[_Gate]
+) -> None:
+    """
+    Conjugates Pauli strings :math:`P \\mapsto U P U^\\dagger` by Clifford gates in place.
+
+    The strings are unpacked boolean arrays with one column per qubit and ``sign``
+    holds the bit :math:`r` of the overall sign :math:`(-1)^r`.
+    """
+    for name, qubits in gates:
+        if name == "h":
+            (q,) = qubits
+            sign ^= x[:, q] & z[:, q]
+            x[:, q], z[:, q] = z[:, q].copy(), x[:, q].copy()
+        elif name == "s":
+            (q,) = qubits
+            sign ^= x[:, q] & z[:, q]
+            z[:, q] ^= x[:, q]
+        elif name == "z":
+            (q,) = qubits
+            sign ^= x[:, q]
+        elif name == "cx":
+            a, b = qubits
+            sign ^= x[:, a] & z[:, b] & ~(x[:, b] ^ z[:, a])
+            x[:, b] ^= x[:, a]
+            z[:, a] ^= z[:, b]
+        elif name == "cz":
+            a, b = qubits
+            sign ^= x[:, a] & x[:, b] & (z[:, a] ^ z[:, b])
+            z[:, a] ^= x[:, b]
+            z[:, b] ^= x[:, a]
+        else:
+            raise ValueError(f"Unsupported gate: {name}")
+
+
+def _qubit_wise_basis_change(x: np.ndarray, z: np.ndarray) -> list[_Gate]:
+    """Single-qubit rotations mapping every qubit-wise commuting string to a Z string."""
+    gates: list[_Gate] = []
+    basis_x = x.any(axis=0)
+    basis_z = z.any(axis=0)
+    for q in np.flatnonzero(basis_x).tolist():
+        if basis_z[q]:
+            # H S^dagger maps Y to Z, with S^dagger = S Z.
+            gates += [("z", (q,)), ("s", (q,))]
+        gates.append(("h", (q,)))
+    return gates
+
+
+def _general_basis_change(x: np.ndarray, z: np.ndarray) -> list[_Gate]:
+    """
+    Clifford gates mapping every string of a commuting set to a Z string.
+
+    The X block is brought to reduced row echelon form (row operations stay inside the
+    group generated by the strings). CNOTs then leave a single X on each pivot qubit,
+    CZs clear the Z entries between pivot qubits, S clears the Z entry on the pivot
+    itself, and finally H on every pivot qubit exchanges the remaining X for Z.
+    """
+    x = x.copy()
+    z = z.copy()
+    num_rows, num_qubits = x.shape
+    pivots: list[int] = []
+    for col in range(num_qubits):
+        row = len(pivots)
+        if row == num_rows:
+            break
+        candidates = np.flatnonzero(x[row:, col])
+        if len(candidates) == 0:
+            continue
+        pivot_row = row + int(candidates[0])
+        x[[row, pivot_row]] = x[[pivot_row, row]]
+        z[[row, pivot_row]] = z[[pivot_row, row]]
+        others = np.flatnonzero(x[:, col])
+        others = others[others != row]
+        x[others] ^= x[row]
+        z[others] ^= z[row]
+        pivots.append(col)
+
+    gates: list[_Gate] = []
+    sign = np.zeros(num_rows, dtype=bool)
+    for i, p in enumerate(pivots):
+        cnots = [("cx", (p, int(c))) for c in np.flatnonzero(x[i]) if c != p]
+        _conjugate(x, z, sign, cnots)
+        gates += cnots
+    for i, p in enumerate(pivots):
+        czs = [("cz", (p, q)) for q in pivots[i + 1 :] if z[i, q]]
+        _conjugate(x, z, sign, czs)
+        gates += czs
+    phases = [("s", (p,)) for i, p in enumerate(pivots) if z[i, p]]
+    hadamards = [("h", (p,)) for p in pivots]
+    gates += phases + hadamards
+    return gates
+
+
+@dataclasses.dataclass
+class MeasurementGroup:
+    """
+    A set of commuting terms measured together.
+
+    After applying `circuit` to the state, every term :math:`P_k` of the group becomes
+    diagonal: :math:`U P_k U^\\dagger = s_k Z^{m_k}`, where ``signs[k]`` is :math:`s_k = \\pm 1`
+    and ``z_masks[k]`` is the boolean qubit mask :math:`m_k`.
+
+    Attributes:
+        hamiltonian (qm_o.Hamiltonian): The terms of the group (without constant).
+        circuit (qm_c.QuantumCircuit): The basis-change circuit applied before measuring.
+        z_masks (np.ndarray): The diagonal masks of the terms with shape (num_terms, num_qubits).
+        signs (np.ndarray): The signs of the diagonalized terms with shape (num_terms,).
+        coeffs (np.ndarray): The coefficients of the terms with shape (num_terms,).
+    """
+
+    hamiltonian: qm_o.Hamiltonian
+    circuit: qm_c.QuantumCircuit
+    z_masks: np.ndarray
+    signs: np.ndarray
+    coeffs: np.ndarray
+
+    def expectation(self, bitssampleset: qm_bs.BitsSampleSet) -> float:
+        """
+        Estimates the expectation value of the group from measured bits.
+
+        Args:
+            bitssampleset (qm_bs.BitsSampleSet): Samples measured after `circuit`,
+                where ``bits[q]`` is the outcome of qubit ``q``.
+
+        Returns:
+            float: The estimated expectation value (the real part, for Hermitian groups).
+        """
+        if not bitssampleset.bitarrays:
+            return 0.0
+        num_qubits = self.z_masks.shape[1]
+        bits = np.array(
+            [sample.bits[:num_qubits] for sample in bitssampleset.bitarrays],
+            dtype=np.int64,
+        ).reshape(len(bitssampleset.bitarrays), -1)
+        counts = np.array(
+            [sample.num_occurrences for sample in bitssampleset.bitarrays],
+            dtype=np.float64,
+        )
+        parity = (bits @ self.z_masks[:, : bits.shape[1]].T.astype(np.int64)) & 1
+        values = (1 - 2 * parity) * self.signs[None, :]
+        means = counts @ values / counts.sum()
+        return float(np.real(means @ self.coeffs))
+
+
+def group_commuting_terms(
+    hamiltonian: qm_o.Hamiltonian,
+    kind: typ.Literal["qubit_wise", "general"] = "qubit_wise",
+    coloring: typ.Literal["dsatur", "greedy"] = "dsatur",
+) -> list[MeasurementGroup]:
+    """
+    Partitions the terms of a Hamiltonian into simultaneously measurable groups.
+
+    The constant of the Hamiltonian is not part of any group.
+
+    Args:
+        hamiltonian (qm_o.Hamiltonian): The Hamiltonian to measure.
+        kind (Literal["qubit_wise", "general"]): Group qubit-wise commuting terms, measured
+            with single-qubit rotations, or generally commuting terms, measured after a
+            Clifford circuit. Defaults to "qubit_wise".
+        coloring (Literal["dsatur", "greedy"]): The graph colouring heuristic. Defaults to "dsatur".
+
+    Returns:
+        list[MeasurementGroup]: The groups, largest first.
+
+    Example:
+        >>> h = qm_o.X(0) * qm_o.X(1) + qm_o.Y(0) * qm_o.Y(1) + qm_o.Z(0) * qm_o.Z(1)
+        >>> len(group_commuting_terms(h, kind="qubit_wise"))
+        3
+        >>> len(group_commuting_terms(h, kind="general"))
+        1
+    """
+    if coloring == "dsatur":
+        color_graph = dsatur_coloring
+    elif coloring == "greedy":
+        color_graph = greedy_coloring
+    else:
+        raise ValueError(f"Invalid value for coloring: {coloring}")
+
+    num_qubits = hamiltonian.num_qubits
+    terms = list(hamiltonian.terms.items())
+    if not terms:
+        return []
+    masks_x, masks_z, coeffs = hamiltonian.to_masks()
+    colors = color_graph(*conflict_graph(masks_x, masks_z, kind))
+    x = _unpack(masks_x, num_qubits)
+    z = _unpack(masks_z, num_qubits)
+
+    groups = []
+    for color in np.argsort(-np.bincount(colors), kind="stable").tolist():
+        members = np.flatnonzero(colors == color)
+        gx, gz = x[members], z[members]
+        if kind == "qubit_wise":
+            gates = _qubit_wise_basis_change(gx, gz)
+        else:
+            gates = _general_basis_change(gx, gz)
+
+        sign = np.zeros(len(members), dtype=bool)
+        gx, gz = gx.copy(), gz.copy()
+        _conjugate(gx, gz, sign, gates)
+
+        circuit = qm_c.QuantumCircuit(num_qubits, 0, name=f"Basis_{len(groups)}")
+        for name, qubits in gates:
+            getattr(circuit, name)(*qubits)
+
+        group_hamiltonian = qm_o.Hamiltonian(storage=hamiltonian.storage)
+        group_hamiltonian.accumulate(terms[i] for i in members.tolist())
+
+        groups.append(
+            MeasurementGroup(
+                hamiltonian=group_hamiltonian,
+                circuit=circuit,
+                z_masks=gz,
+                signs=np.where(sign, -1, 1),
+                coeffs=coeffs[members],
+            )
+        )
+    return groups
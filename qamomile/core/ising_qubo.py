@@ -1,22 +1,346 @@
+import collections.abc
+import copy
 import dataclasses
+import itertools
+import types
 import typing as typ
 
 import numpy as np
 
 
-@dataclasses.dataclass
+def _quad_arrays(
+    quad: typ.Mapping[tuple[int, int], float],
+) -> tuple[np.ndarray, np.ndarray]:
+    """Returns the index (E, 2) and value (E,) arrays of quadratic coefficients."""
+    return (
+        np.array(list(quad.keys()), dtype=np.int64).reshape(-1, 2),
+        np.fromiter(quad.values(), dtype=np.float64, count=len(quad)),
+    )
+
+
+def _linear_arrays(linear: typ.Mapping[int, float]) -> tuple[np.ndarray, np.ndarray]:
+    """Returns the index (L,) and value (L,) arrays of linear coefficients."""
+    return (
+        np.fromiter(linear.keys(), dtype=np.int64, count=len(linear)),
+        np.fromiter(linear.values(), dtype=np.float64, count=len(linear)),
+    )
+
+
+class _CoefficientView(collections.abc.MutableMapping):
+    """Dictionary of the quadratic or linear coefficients of an IsingModel.
+
+    The dictionary is built from the arrays of the model when it is first read, and again after
+    the arrays are replaced (e.g. by normalization). Changes are written back to the model: they
+    mark its arrays as stale, and the arrays are rebuilt from the dictionary the next time they
+    are read. A view detached from its model (when a new ``quad`` or ``linear`` is assigned)
+    keeps its contents as a plain dictionary.
+    """
+
+    def __init__(self, model: "IsingModel", kind: str):
+        self._model: typ.Optional["IsingModel"] = model
+        self._kind = kind
+        self._cache: typ.Optional[dict] = None
+
+    @property
+    def _data(self) -> dict:
+        if self._cache is None:
+            self._cache = self._model._coefficient_dict(self._kind)
+        return self._cache
+
+    def _detach(self) -> None:
+        self._cache = self._data
+        self._model = None
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __setitem__(self, key, value) -> None:
+        self._data[key] = value
+        if self._model is not None:
+            self._model._mark_stale(self._kind)
+
+    def __delitem__(self, key) -> None:
+        del self._data[key]
+        if self._model is not None:
+            self._model._mark_stale(self._kind)
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        return repr(self._data)
+
+    def copy(self) -> dict:
+        return dict(self._data)
+
+    def __deepcopy__(self, memo) -> dict:
+        # Plain dictionaries for dataclasses.asdict; IsingModel.__deepcopy__ builds its own views.
+        return copy.deepcopy(self._data, memo)
+
+
+# The fields keep dataclasses.replace, fields and asdict working as for the former dataclass;
+# __init__, __eq__ and __repr__ are written by hand.
+@dataclasses.dataclass(init=False, repr=False, eq=False)
 class IsingModel:
-    quad: dict[tuple[int, int], float]
-    linear: dict[int, float]
+    r"""Ising model :math:`\sum_{ij} J_{ij} z_i z_j + \sum_i h_i z_i + C` stored as coordinate arrays.
+
+    The quadratic coefficients are kept as an index array of shape (E, 2) with a value array,
+    and the linear coefficients as an index array with a value array. ``quad`` and ``linear``
+    are dictionaries built from the arrays on first access. Changing them (or assigning new
+    ones) updates the arrays, which are rebuilt when they are next read.
+
+    Attributes:
+        quad (MutableMapping[tuple[int, int], float]): Quadratic coefficients :math:`J_{ij}`.
+        linear (MutableMapping[int, float]): Linear coefficients :math:`h_i`.
+        constant (float): Constant term :math:`C`.
+        index_map (Optional[dict[int, int]]): Map between the indices of this model and the original QUBO.
+
+    Examples:
+        >>> ising = IsingModel({(0, 1): 2.0}, {0: 4.0, 1: 5.0}, 6.0)
+        >>> ising.quad_indices.tolist(), ising.quad_values.tolist()
+        ([[0, 1]], [2.0])
+        >>> ising.quad[(1, 2)] = -1.0
+        >>> ising.quad_indices.tolist(), ising.num_bits()
+        ([[0, 1], [1, 2]], 3)
+
+    """
+
+    quad: typ.MutableMapping[tuple[int, int], float]
+    linear: typ.MutableMapping[int, float]
     constant: float
     index_map: typ.Optional[dict[int, int]] = None
 
-    def num_bits(self) -> int:
-        num_bits = max(self.linear.keys(), default=-1)
-        num_bits = max(
-            num_bits, max((max(pair) for pair in self.quad.keys()), default=num_bits)
+    def __init__(
+        self,
+        quad: typ.Mapping[tuple[int, int], float],
+        linear: typ.Mapping[int, float],
+        constant: float,
+        index_map: typ.Optional[dict[int, int]] = None,
+    ):
+        self._quad_dict: typ.Optional[_CoefficientView] = None
+        self._linear_dict: typ.Optional[_CoefficientView] = None
+        self._set_arrays(*_quad_arrays(quad), *_linear_arrays(linear))
+        self.constant = constant
+        self.index_map = index_map
+
+    @classmethod
+    def from_arrays(
+        cls,
+        quad_indices: np.ndarray,
+        quad_values: np.ndarray,
+        linear_indices: np.ndarray,
+        linear_values: np.ndarray,
+        constant: float,
+        index_map: typ.Optional[dict[int, int]] = None,
+    ) -> "IsingModel":
+        """Creates an Ising model from coordinate arrays without building dictionaries.
+
+        Arrays that already have the right dtype (e.g. memory-mapped ones) are used without copying.
+
+        Args:
+            quad_indices (np.ndarray): Index pairs of the quadratic terms with shape (E, 2). Each pair must appear once.
+            quad_values (np.ndarray): Quadratic coefficients with shape (E,).
+            linear_indices (np.ndarray): Indices of the linear terms with shape (L,). Each index must appear once.
+            linear_values (np.ndarray): Linear coefficients with shape (L,).
+            constant (float): Constant term.
+            index_map (Optional[dict[int, int]]): Index map. Defaults to None.
+
+        Returns:
+            IsingModel: The Ising model.
+
+        Examples:
+            >>> ising = IsingModel.from_arrays(np.array([[0, 1]]), np.array([2.0]), np.array([0]), np.array([4.0]), 6.0)
+            >>> ising.quad, ising.linear
+            ({(0, 1): 2.0}, {0: 4.0})
+        """
+        ising = cls.__new__(cls)
+        ising._quad_dict = None
+        ising._linear_dict = None
+        ising._set_arrays(
+            np.asarray(quad_indices, dtype=np.int64).reshape(-1, 2),
+            np.asarray(quad_values, dtype=np.float64),
+            np.asarray(linear_indices, dtype=np.int64),
+            np.asarray(linear_values, dtype=np.float64),
+        )
+        ising.constant = constant
+        ising.index_map = index_map
+        return ising
+
+    def _set_arrays(
+        self,
+        quad_indices: np.ndarray,
+        quad_values: np.ndarray,
+        linear_indices: np.ndarray,
+        linear_values: np.ndarray,
+    ) -> None:
+        if len(quad_indices) != len(quad_values) or len(linear_indices) != len(
+            linear_values
+        ):
+            raise ValueError("The index and value arrays must have the same length.")
+        self._quad_indices = quad_indices
+        self._quad_values = quad_values
+        self._linear_indices = linear_indices
+        self._linear_values = linear_values
+        self._stale: set[str] = set()
+        self._num_bits: typ.Optional[int] = None
+        self._coupling = None
+        # Dictionaries handed out before show the new arrays.
+        for view in (self._quad_dict, self._linear_dict):
+            if view is not None:
+                view._cache = None
+
+    def _set_values(self, quad_values: np.ndarray, linear_values: np.ndarray) -> None:
+        """Replaces the coefficient values, keeping the indices."""
+        self._set_arrays(
+            self.quad_indices, quad_values, self.linear_indices, linear_values
+        )
+
+    def _mark_stale(self, kind: str) -> None:
+        """Records that the ``kind`` ("quad" or "linear") dictionary changed after the arrays."""
+        self._stale.add(kind)
+        self._num_bits = None
+        self._coupling = None
+
+    def _sync_arrays(self) -> None:
+        """Rebuilds the arrays from the dictionaries that were changed."""
+        if not self._stale:
+            return
+        stale, self._stale = self._stale, set()
+        if "quad" in stale:
+            self._quad_indices, self._quad_values = _quad_arrays(self._quad_dict)
+        if "linear" in stale:
+            self._linear_indices, self._linear_values = _linear_arrays(
+                self._linear_dict
+            )
+
+    def _coefficient_dict(self, kind: str) -> dict:
+        """Builds the ``kind`` ("quad" or "linear") dictionary from the arrays."""
+        if kind == "quad":
+            return dict(
+                zip(map(tuple, self.quad_indices.tolist()), self.quad_values.tolist())
+            )
+        return dict(zip(self.linear_indices.tolist(), self.linear_values.tolist()))
+
+    def __copy__(self) -> "IsingModel":
+        # A copy must not share the dictionaries, which write back to their model.
+        return IsingModel.from_arrays(
+            self.quad_indices,
+            self.quad_values,
+            self.linear_indices,
+            self.linear_values,
+            self.constant,
+            self.index_map,
         )
-        return num_bits + 1
+
+    def __deepcopy__(self, memo) -> "IsingModel":
+        return IsingModel.from_arrays(
+            self.quad_indices.copy(),
+            self.quad_values.copy(),
+            self.linear_indices.copy(),
+            self.linear_values.copy(),
+            self.constant,
+            copy.deepcopy(self.index_map, memo),
+        )
+
+    @property
+    def quad_indices(self) -> np.ndarray:
+        """Index pairs of the quadratic terms with shape (E, 2)."""
+        self._sync_arrays()
+        return self._quad_indices
+
+    @property
+    def quad_values(self) -> np.ndarray:
+        """Quadratic coefficients with shape (E,)."""
+        self._sync_arrays()
+        return self._quad_values
+
+    @property
+    def linear_indices(self) -> np.ndarray:
+        """Indices of the linear terms with shape (L,)."""
+        self._sync_arrays()
+        return self._linear_indices
+
+    @property
+    def linear_values(self) -> np.ndarray:
+        """Linear coefficients with shape (L,)."""
+        self._sync_arrays()
+        return self._linear_values
+
+    @property
+    def quad(self) -> typ.MutableMapping[tuple[int, int], float]:
+        if self._quad_dict is None:
+            self._quad_dict = _CoefficientView(self, "quad")
+        return self._quad_dict
+
+    @quad.setter
+    def quad(self, quad: typ.Mapping[tuple[int, int], float]) -> None:
+        quad_indices, quad_values = _quad_arrays(quad)
+        linear_indices, linear_values = self.linear_indices, self.linear_values
+        if self._quad_dict is not None:
+            self._quad_dict._detach()
+            self._quad_dict = None
+        self._set_arrays(quad_indices, quad_values, linear_indices, linear_values)
+
+    @property
+    def linear(self) -> typ.MutableMapping[int, float]:
+        if self._linear_dict is None:
+            self._linear_dict = _CoefficientView(self, "linear")
+        return self._linear_dict
+
+    @linear.setter
+    def linear(self, linear: typ.Mapping[int, float]) -> None:
+        linear_indices, linear_values = _linear_arrays(linear)
+        quad_indices, quad_values = self.quad_indices, self.quad_values
+        if self._linear_dict is not None:
+            self._linear_dict._detach()
+            self._linear_dict = None
+        self._set_arrays(quad_indices, quad_values, linear_indices, linear_values)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, IsingModel):
+            return NotImplemented
+        return (
+            self.quad == other.quad
+            and self.linear == other.linear
+            and self.constant == other.constant
+            and self.index_map == other.index_map
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"IsingModel(quad={dict(self.quad)}, linear={dict(self.linear)}, "
+            f"constant={self.constant}, index_map={self.index_map})"
+        )
+
+    def num_bits(self) -> int:
+        """Returns the highest index of the model plus one. The result is cached."""
+        if self._num_bits is None:
+            self._num_bits = (
+                max(
+                    int(self.quad_indices.max(initial=-1)),
+                    int(self.linear_indices.max(initial=-1)),
+                )
+                + 1
+            )
+        return self._num_bits
+
+    def _coupling_matrix(self):
+        """The quadratic coefficients as a ``scipy.sparse.csr_matrix``, built once."""
+        if self._coupling is None:
+            import scipy.sparse
+
+            size = self.num_bits()
+            self._coupling = scipy.sparse.csr_matrix(
+                (
+                    self.quad_values,
+                    (self.quad_indices[:, 0], self.quad_indices[:, 1]),
+                ),
+                shape=(size, size),
+            )
+        return self._coupling
 
     def calc_energy(self, state: list[int]) -> float:
         """Calculates the energy of the state.
@@ -27,13 +351,149 @@ class IsingModel:
             3.0
 
         """
+        state = np.asarray(state, dtype=np.float64)
         energy = self.constant
-        for (i, j), value in self.quad.items():
-            energy += value * state[i] * state[j]
-        for i, value in self.linear.items():
-            energy += value * state[i]
+        if len(self.quad_values):
+            energy += float(
+                self.quad_values
+                @ (state[self.quad_indices[:, 0]] * state[self.quad_indices[:, 1]])
+            )
+        if len(self.linear_values):
+            energy += float(self.linear_values @ state[self.linear_indices])
         return energy
 
+    def calc_energy_batch(self, states: np.ndarray) -> np.ndarray:
+        """Calculates the energies of many spin configurations at once.
+
+        The quadratic part is one sparse matrix product with all states.
+
+        Args:
+            states (np.ndarray): Spin configurations with values in {-1, 1} and shape (S, N),
+                where N is at least `num_bits`.
+
+        Returns:
+            np.ndarray: The energies with shape (S,).
+
+        Raises:
+            ValueError: If the states have fewer than `num_bits` columns.
+
+        Examples:
+            >>> ising = IsingModel({(0, 1): 2.0}, {0: 4.0, 1: 5.0}, 6.0)
+            >>> ising.calc_energy_batch(np.array([[1, -1], [1, 1]])).tolist()
+            [3.0, 17.0]
+
+        """
+        states = np.asarray(states)
+        if states.ndim != 2 or states.shape[1] < self.num_bits():
+            raise ValueError(
+                f"states must have shape (S, N) with N >= {self.num_bits()}, but got {states.shape}."
+            )
+        states = states[:, : self.num_bits()].astype(np.float64)
+        energies = np.full(len(states), float(self.constant))
+        if len(self.quad_values):
+            coupled = (self._coupling_matrix().T @ states.T).T
+            energies += np.einsum("si,si->s", coupled, states)
+        if len(self.linear_values):
+            h = np.bincount(
+                self.linear_indices,
+                weights=self.linear_values,
+                minlength=self.num_bits(),
+            )
+            energies += states @ h
+        return energies
+
+    def connected_components(self) -> list[np.ndarray]:
+        """Finds the groups of spins that are connected by quadratic terms.
+
+        Spins in different components do not interact, so each component can be solved on its own.
+        Only spins that appear in some term are included; a spin with only a linear term forms a
+        component by itself. This is a linear-time graph traversal of the quadratic terms.
+
+        Returns:
+            list[np.ndarray]: The sorted spin indices of each component, ordered by their smallest index.
+
+        Examples:
+            >>> ising = IsingModel({(0, 2): 1.0, (3, 4): 2.0}, {1: 0.5, 2: 1.0}, 0.0)
+            >>> [c.tolist() for c in ising.connected_components()]
+            [[0, 2], [1], [3, 4]]
+
+        """
+        labels, present = self._component_labels()
+        order = np.argsort(labels[present], kind="stable")
+        spins = np.flatnonzero(present)[order]
+        bounds = np.flatnonzero(np.diff(labels[spins])) + 1
+        return np.split(spins, bounds) if len(spins) else []
+
+    def _component_labels(self) -> tuple[np.ndarray, np.ndarray]:
+        """Returns the component label of every index below `num_bits` and a mask of the used ones."""
+        from scipy.sparse.csgraph import connected_components
+
+        size = self.num_bits()
+        present = np.zeros(size, dtype=bool)
+        present[self.quad_indices.ravel()] = True
+        present[self.linear_indices] = True
+        _, labels = connected_components(self._coupling_matrix(), directed=False)
+        return labels, present
+
+    def decompose(self) -> list["IsingModel"]:
+        """Splits the model into one independent Ising model per connected component.
+
+        The spins of each sub-model are numbered 0, 1, ... in the order of `connected_components`,
+        and its ``index_map`` maps them back, so `ising2qubo_index` of a sub-model gives the same index
+        as `ising2qubo_index` of this model. The constant is kept by the first sub-model, so the energies
+        of the sub-models add up to the energy of this model.
+
+        Returns:
+            list[IsingModel]: The sub-models, in the order of `connected_components`.
+
+        Examples:
+            >>> ising = IsingModel({(0, 2): 1.0, (3, 4): 2.0}, {1: 0.5, 2: 1.0}, 3.0)
+            >>> for sub in ising.decompose():
+            ...     print(dict(sub.quad), dict(sub.linear), sub.constant, sub.index_map)
+            {(0, 1): 1.0} {1: 1.0} 3.0 {0: 0, 1: 2}
+            {} {0: 0.5} 0.0 {0: 1}
+            {(0, 1): 2.0} {} 0.0 {0: 3, 1: 4}
+
+        """
+        components = self.connected_components()
+        if not components:
+            return []
+        # Number the components, and the spins within each component, in order.
+        component_of = np.empty(self.num_bits(), dtype=np.int64)
+        local_index = np.empty(self.num_bits(), dtype=np.int64)
+        for k, spins in enumerate(components):
+            component_of[spins] = k
+            local_index[spins] = np.arange(len(spins))
+
+        def split(indices: np.ndarray, owners: np.ndarray, values: np.ndarray):
+            order = np.argsort(owners, kind="stable")
+            bounds = np.searchsorted(owners[order], np.arange(1, len(components)))
+            return (
+                np.split(local_index[indices[order]], bounds),
+                np.split(values[order], bounds),
+            )
+
+        quad_indices, quad_values = split(
+            self.quad_indices, component_of[self.quad_indices[:, 0]], self.quad_values
+        )
+        linear_indices, linear_values = split(
+            self.linear_indices, component_of[self.linear_indices], self.linear_values
+        )
+        return [
+            IsingModel.from_arrays(
+                quad_indices[k],
+                quad_values[k],
+                linear_indices[k],
+                linear_values[k],
+                self.constant if k == 0 else 0.0,
+                {
+                    local: self.ising2qubo_index(spin)
+                    for local, spin in enumerate(spins.tolist())
+                },
+            )
+            for k, spins in enumerate(components)
+        ]
+
     def ising2qubo_index(self, index: int) -> int:
         if self.index_map is None:
             return index
@@ -54,22 +514,19 @@ class IsingModel:
 
         """
 
-        if not self.linear and not self.quad:
+        if not len(self.linear_values) and not len(self.quad_values):
             return  # 係数が存在しない場合は正規化しない
 
         max_coeff = max(
-            max((abs(value) for value in self.linear.values()), default=0),
-            max((abs(value) for value in self.quad.values()), default=0),
+            np.abs(self.linear_values).max(initial=0),
+            np.abs(self.quad_values).max(initial=0),
         )
 
         if max_coeff == 0:
             return  # すべての係数が0の場合は正規化しない
 
         self.constant /= max_coeff
-        for key in self.linear:
-            self.linear[key] /= max_coeff
-        for key in self.quad:
-            self.quad[key] /= max_coeff
+        self._set_values(self.quad_values / max_coeff, self.linear_values / max_coeff)
 
     def normalize_by_rms(self):
         r"""Normalize coefficients by the root mean square.
@@ -91,15 +548,14 @@ class IsingModel:
             :filter: docname in docnames
 
         """
-        if not self.linear and not self.quad:
+        if not len(self.linear_values) and not len(self.quad_values):
             return  # 係数が存在しない場合は正規化しない
 
-        # numpyのarrayに変換して二乗和を計算
-        quad_coeffs = np.array(list(self.quad.values()))
-        linear_coeffs = np.array(list(self.linear.values()))
+        quad_coeffs = self.quad_values
+        linear_coeffs = self.linear_values
 
-        E2 = len(self.quad)
-        E1 = len(self.linear)
+        E2 = len(quad_coeffs)
+        E1 = len(linear_coeffs)
 
         # np.sum(quad_coeffs ** 2)はnp.dot(quad_coeffs, quad_coeffs)より効率的
         quad_variance = np.sum(quad_coeffs**2) / E2 if E2 > 0 else 0
@@ -112,30 +568,374 @@ class IsingModel:
 
         # 正規化
         self.constant /= normalization_factor
-        for key in self.linear:
-            self.linear[key] /= normalization_factor
-        for key in self.quad:
-            self.quad[key] /= normalization_factor
+        self._set_values(
+            quad_coeffs / normalization_factor, linear_coeffs / normalization_factor
+        )
+
+
+class HUBOIsingModel:
+    r"""Higher-order Ising model :math:`\sum_S w_S \prod_{i \in S} z_i + C` with k-local terms.
+
+    The terms are stored like a CSR matrix: the spins of term ``t`` are
+    ``spin_indices[term_ptr[t]:term_ptr[t + 1]]`` and its coefficient is ``values[t]``.
+    Every term has at least one spin, and the spins of a term are distinct.
+
+    Attributes:
+        terms (Mapping[tuple[int, ...], float]): Coefficients :math:`w_S` keyed by the spins of each term.
+        constant (float): Constant term :math:`C`.
+        index_map (Optional[dict[int, int]]): Map between the indices of this model and the original QUBO.
+
+    Examples:
+        >>> hubo = HUBOIsingModel({(0, 1, 2): 2.0, (1,): -1.0}, 0.5)
+        >>> hubo.degree(), hubo.num_bits()
+        (3, 3)
+        >>> hubo.calc_energy_batch(np.array([[1, 1, 1], [1, -1, 1]])).tolist()
+        [1.5, -0.5]
+
+    """
+
+    def __init__(
+        self,
+        terms: typ.Mapping[tuple[int, ...], float],
+        constant: float,
+        index_map: typ.Optional[dict[int, int]] = None,
+    ):
+        lengths = np.fromiter(map(len, terms.keys()), dtype=np.int64, count=len(terms))
+        self._set_arrays(
+            np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64),
+            np.fromiter(
+                (i for key in terms.keys() for i in key),
+                dtype=np.int64,
+                count=int(lengths.sum()),
+            ),
+            np.fromiter(terms.values(), dtype=np.float64, count=len(terms)),
+        )
+        self.constant = constant
+        self.index_map = index_map
+
+    @classmethod
+    def from_arrays(
+        cls,
+        term_ptr: np.ndarray,
+        spin_indices: np.ndarray,
+        values: np.ndarray,
+        constant: float,
+        index_map: typ.Optional[dict[int, int]] = None,
+    ) -> "HUBOIsingModel":
+        """Creates a model from its term arrays.
+
+        Args:
+            term_ptr (np.ndarray): Start of the spins of each term in ``spin_indices``, with shape (T + 1,).
+            spin_indices (np.ndarray): The spins of all terms, concatenated.
+            values (np.ndarray): The coefficient of each term, with shape (T,).
+            constant (float): Constant term.
+            index_map (Optional[dict[int, int]]): Index map. Defaults to None.
+
+        Returns:
+            HUBOIsingModel: The model.
+        """
+        hubo = cls.__new__(cls)
+        hubo._set_arrays(
+            np.asarray(term_ptr, dtype=np.int64),
+            np.asarray(spin_indices, dtype=np.int64),
+            np.asarray(values, dtype=np.float64),
+        )
+        hubo.constant = constant
+        hubo.index_map = index_map
+        return hubo
+
+    @classmethod
+    def from_ising(cls, ising: IsingModel) -> "HUBOIsingModel":
+        """Creates a model with the linear and quadratic terms of an Ising model."""
+        num_linear = len(ising.linear_indices)
+        num_quad = len(ising.quad_indices)
+        return cls.from_arrays(
+            np.concatenate(
+                [np.arange(num_linear + 1), num_linear + 2 * np.arange(1, num_quad + 1)]
+            ),
+            np.concatenate([ising.linear_indices, ising.quad_indices.ravel()]),
+            np.concatenate([ising.linear_values, ising.quad_values]),
+            ising.constant,
+            ising.index_map,
+        )
+
+    def _set_arrays(
+        self, term_ptr: np.ndarray, spin_indices: np.ndarray, values: np.ndarray
+    ) -> None:
+        if len(term_ptr) != len(values) + 1 or term_ptr[-1] != len(spin_indices):
+            raise ValueError("term_ptr, spin_indices and values do not match.")
+        if np.any(np.diff(term_ptr) <= 0):
+            raise ValueError("Every term must have at least one spin.")
+        self._term_ptr = term_ptr
+        self._spin_indices = spin_indices
+        self._values = values
+        self._terms_dict: typ.Optional[types.MappingProxyType] = None
+
+    @property
+    def term_ptr(self) -> np.ndarray:
+        """Start of the spins of each term in `spin_indices`, with shape (T + 1,)."""
+        return self._term_ptr
+
+    @property
+    def spin_indices(self) -> np.ndarray:
+        """The spins of all terms, concatenated."""
+        return self._spin_indices
+
+    @property
+    def values(self) -> np.ndarray:
+        """The coefficient of each term, with shape (T,)."""
+        return self._values
+
+    @property
+    def terms(self) -> typ.Mapping[tuple[int, ...], float]:
+        if self._terms_dict is None:
+            spins = self._spin_indices.tolist()
+            ptr = self._term_ptr.tolist()
+            self._terms_dict = types.MappingProxyType(
+                {
+                    tuple(spins[start:end]): value
+                    for start, end, value in zip(ptr[:-1], ptr[1:], self._values.tolist())
+                }
+            )
+        return self._terms_dict
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, HUBOIsingModel):
+            return NotImplemented
+        return (
+            self.terms == other.terms
+            and self.constant == other.constant
+            and self.index_map == other.index_map
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"HUBOIsingModel(terms={dict(self.terms)}, constant={self.constant}, "
+            f"index_map={self.index_map})"
+        )
+
+    def degree(self) -> int:
+        """Returns the largest number of spins in a term (0 without terms)."""
+        return int(np.diff(self._term_ptr).max(initial=0))
+
+    def num_bits(self) -> int:
+        """Returns the highest index of the model plus one."""
+        return int(self._spin_indices.max(initial=-1)) + 1
+
+    def to_ising(self) -> IsingModel:
+        """Returns the equivalent quadratic Ising model.
+
+        Raises:
+            ValueError: If the model has terms with more than two spins.
+        """
+        if self.degree() > 2:
+            raise ValueError(
+                f"A model of degree {self.degree()} has no quadratic Ising form."
+            )
+        lengths = np.diff(self._term_ptr)
+        starts = self._term_ptr[:-1]
+        linear, quad = lengths == 1, lengths == 2
+        return IsingModel.from_arrays(
+            np.stack(
+                [self._spin_indices[starts[quad]], self._spin_indices[starts[quad] + 1]],
+                axis=1,
+            ),
+            self._values[quad],
+            self._spin_indices[starts[linear]],
+            self._values[linear],
+            self.constant,
+            self.index_map,
+        )
+
+    def calc_energy(self, state: list[int]) -> float:
+        """Calculates the energy of the state.
+
+        Examples:
+            >>> HUBOIsingModel({(0, 1, 2): 2.0, (1,): -1.0}, 0.5).calc_energy([1, -1, -1])
+            3.5
+
+        """
+        return float(self.calc_energy_batch(np.asarray(state)[None, :])[0])
+
+    def calc_energy_batch(self, states: np.ndarray) -> np.ndarray:
+        """Calculates the energies of many spin configurations at once.
+
+        The spins of all terms are gathered for every state and multiplied term by term with
+        ``np.multiply.reduceat``.
+
+        Args:
+            states (np.ndarray): Spin configurations with values in {-1, 1} and shape (S, N),
+                where N is at least `num_bits`.
+
+        Returns:
+            np.ndarray: The energies with shape (S,).
+
+        Raises:
+            ValueError: If the states have fewer than `num_bits` columns.
+        """
+        states = np.asarray(states)
+        if states.ndim != 2 or states.shape[1] < self.num_bits():
+            raise ValueError(
+                f"states must have shape (S, N) with N >= {self.num_bits()}, but got {states.shape}."
+            )
+        energies = np.full(len(states), float(self.constant))
+        if len(self._values):
+            gathered = states[:, self._spin_indices].astype(np.int8)
+            products = np.multiply.reduceat(gathered, self._term_ptr[:-1], axis=1)
+            energies += products @ self._values
+        return energies
+
+    def ising2qubo_index(self, index: int) -> int:
+        if self.index_map is None:
+            return index
+        return self.index_map[index]
+
+    def normalize_by_abs_max(self):
+        r"""Normalize coefficients by the absolute maximum value, as `IsingModel.normalize_by_abs_max`."""
+        max_coeff = np.abs(self._values).max(initial=0)
+        if max_coeff == 0:
+            return
+        self.constant /= max_coeff
+        self._set_arrays(self._term_ptr, self._spin_indices, self._values / max_coeff)
+
+    def normalize_by_rms(self):
+        r"""Normalize coefficients by the root mean square, as `IsingModel.normalize_by_rms`.
+
+        The mean square is taken separately over the terms of each order and summed.
+        """
+        lengths = np.diff(self._term_ptr)
+        variance = sum(
+            np.mean(self._values[lengths == k] ** 2) for k in np.unique(lengths)
+        )
+        normalization_factor = np.sqrt(variance)
+        if normalization_factor == 0:
+            return
+        self.constant /= normalization_factor
+        self._set_arrays(
+            self._term_ptr, self._spin_indices, self._values / normalization_factor
+        )
+
+
+def hubo_to_ising(
+    hubo: dict[tuple[int, ...], float], constant: float = 0.0
+) -> HUBOIsingModel:
+    r"""Converts a Higher-order Unconstrained Binary Optimization (HUBO) problem to a higher-order Ising model.
 
+    With :math:`x_i = (1 - z_i)/2`, a term :math:`w \prod_{i \in S} x_i` becomes
+    :math:`w 2^{-|S|} \sum_{T \subseteq S} (-1)^{|T|} \prod_{i \in T} z_i`, so a k-local term
+    stays k-local and no auxiliary variables are needed. Repeated indices in a key are merged,
+    since :math:`x_i^2 = x_i`.
 
-def calc_qubo_energy(qubo: dict[tuple[int, int], float], state: list[int]) -> float:
+    Args:
+        hubo (dict[tuple[int, ...], float]): HUBO coefficients, e.g. from ``get_hubo_dict``.
+        constant (float): Constant added to the model. Defaults to 0.0.
+
+    Returns:
+        HUBOIsingModel: The higher-order Ising model.
+
+    Examples:
+        >>> hubo_to_ising({(0, 1, 2): 8.0})
+        HUBOIsingModel(terms={(0,): -1.0, (1,): -1.0, (2,): -1.0, (0, 1): 1.0, (0, 2): 1.0, (1, 2): 1.0, (0, 1, 2): -1.0}, constant=1.0, index_map=None)
+
+    """
+    terms: dict[tuple[int, ...], float] = {}
+    for key, value in hubo.items():
+        spins = tuple(sorted(set(key)))
+        scale = value / 2 ** len(spins)
+        for size in range(len(spins) + 1):
+            sign = -scale if size % 2 else scale
+            for subset in itertools.combinations(spins, size):
+                if subset:
+                    terms[subset] = terms.get(subset, 0.0) + sign
+                else:
+                    constant += sign
+    return HUBOIsingModel(terms, constant)
+
+
+QuboType = typ.Union[dict[tuple[int, int], float], "scipy.sparse.spmatrix"]
+
+
+def _qubo_arrays(qubo: QuboType) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Returns the row indices, column indices and values of a QUBO dict or scipy.sparse matrix."""
+    if isinstance(qubo, dict):
+        if any(len(key) != 2 for key in qubo.keys()):
+            raise ValueError(
+                "QUBO keys must be index pairs; use hubo_to_ising for higher-order terms."
+            )
+        keys = np.array(list(qubo.keys()), dtype=np.int64).reshape(-1, 2)
+        values = np.fromiter(qubo.values(), dtype=np.float64, count=len(qubo))
+        return keys[:, 0], keys[:, 1], values
+    coo = qubo.tocoo()
+    coo.sum_duplicates()
+    return (
+        coo.row.astype(np.int64),
+        coo.col.astype(np.int64),
+        coo.data.astype(np.float64),
+    )
+
+
+def _first_appearance(indices: np.ndarray, size: int) -> np.ndarray:
+    """Returns the distinct non-negative ``indices`` below ``size`` in order of first appearance."""
+    first = np.full(size, len(indices), dtype=np.int64)
+    np.minimum.at(first, indices, np.arange(len(indices), dtype=np.int64))
+    present = np.flatnonzero(first < len(indices))
+    return present[np.argsort(first[present], kind="stable")]
+
+
+def calc_qubo_energy(qubo: QuboType, state: list[int]) -> float:
     """Calculates the energy of the state.
 
+    Args:
+        qubo (QuboType): QUBO coefficients as a dict or a scipy.sparse matrix.
+        state (list[int]): Binary values of the variables.
+
     Examples:
         >>> calc_qubo_energy({(0, 0): 1.0, (0, 1): 2.0, (1, 1): 3.0}, [1, 1])
         6.0
     """
-    energy = 0.0
-    for (i, j), value in qubo.items():
-        energy += value * state[i] * state[j]
-    return energy
+    rows, cols, values = _qubo_arrays(qubo)
+    state = np.asarray(state, dtype=np.float64)
+    return float(values @ (state[rows] * state[cols])) if len(values) else 0.0
+
+
+def calc_qubo_energy_batch(qubo: QuboType, states: np.ndarray) -> np.ndarray:
+    """Calculates the energies of many binary states at once with one sparse matrix product.
+
+    Args:
+        qubo (QuboType): QUBO coefficients as a dict or a scipy.sparse matrix.
+        states (np.ndarray): Binary states with shape (S, N), where N exceeds every QUBO index.
+
+    Returns:
+        np.ndarray: The energies with shape (S,).
+
+    Examples:
+        >>> qubo = {(0, 0): 1.0, (0, 1): 2.0, (1, 1): 3.0}
+        >>> calc_qubo_energy_batch(qubo, np.array([[1, 1], [1, 0], [0, 0]])).tolist()
+        [6.0, 1.0, 0.0]
+    """
+    import scipy.sparse
+
+    states = np.asarray(states, dtype=np.float64)
+    if states.ndim != 2:
+        raise ValueError(f"states must have shape (S, N), but got {states.shape}.")
+    rows, cols, values = _qubo_arrays(qubo)
+    size = states.shape[1]
+    if len(values) and max(rows.max(), cols.max()) >= size:
+        raise ValueError(f"The QUBO has indices beyond the {size} columns of states.")
+    matrix = scipy.sparse.csr_matrix((values, (cols, rows)), shape=(size, size))
+    # (matrix @ states.T)[j, s] = sum_i Q_ij x_i, so the energy is its product with x_j.
+    return np.einsum("js,sj->s", matrix @ states.T, states)
 
 
 def qubo_to_ising(
-    qubo: dict[tuple[int, int], float], constant: float = 0.0, simplify=False
+    qubo: QuboType, constant: float = 0.0, simplify=False
 ) -> IsingModel:
     r"""Converts a Quadratic Unconstrained Binary Optimization (QUBO) problem to an equivalent Ising model.
 
+    The QUBO is given as a dict or a scipy.sparse matrix, and is transformed with array operations.
+    ``constant`` is added to the constant of the Ising model. With ``simplify=True``, zero coefficients
+    are pruned and the remaining indices are compacted, recording the map in ``index_map``.
+
     QUBO:
         .. math::
             \sum_{ij} Q_{ij} x_i x_j,~\text{s.t.}~x_i \in \{0, 1\}
@@ -171,34 +971,45 @@ def qubo_to_ising(
         >>> assert ising.quad == {(0, 1): 0.5}
 
     """
-    ising_J: dict[tuple[int, int], float] = {}
-    ising_h: dict[int, float] = {}
-    constant = 0.0
-    for (i, j), value in qubo.items():
-        if i != j:
-            ising_J[(i, j)] = value / 4.0 + ising_J.get((i, j), 0.0)
-            constant += value / 4.0
-        else:
-            constant += value / 2.0
-        ising_h[i] = -value / 4.0 + ising_h.get(i, 0.0)
-        ising_h[j] = -value / 4.0 + ising_h.get(j, 0.0)
-
-    if simplify:
-        index_map = {}
-        _J, _h = {}, {}
-        for i, hi in ising_h.items():
-            if hi != 0.0:
-                if i not in index_map:
-                    index_map[i] = len(index_map)
-                _h[index_map[i]] = hi
-        for (i, j), Jij in ising_J.items():
-            if Jij != 0.0:
-                if i not in index_map:
-                    index_map[i] = len(index_map)
-                if j not in index_map:
-                    index_map[j] = len(index_map)
-                _J[(index_map[i], index_map[j])] = Jij
-        ising_J = _J
-        ising_h = _h
-        return IsingModel(ising_J, ising_h, constant, index_map)
-    return IsingModel(ising_J, ising_h, constant)
+    rows, cols, values = _qubo_arrays(qubo)
+    off_diagonal = rows != cols
+
+    # Every entry contributes -Q_ij / 4 to h_i and h_j, in the order of the entries.
+    spins = np.stack([rows, cols], axis=1).ravel()
+    spin_weights = np.repeat(-values / 4.0, 2)
+    # A cumulative sum adds the contributions in order, like a Python loop would.
+    constant = float(
+        np.cumsum(
+            np.concatenate(
+                [[constant], np.where(off_diagonal, values / 4.0, values / 2.0)]
+            )
+        )[-1]
+    )
+
+    size = int(spins.max()) + 1 if len(spins) else 0
+    linear_indices = _first_appearance(spins, size)
+    h = np.bincount(spins, weights=spin_weights, minlength=size)[linear_indices]
+
+    quad_indices = np.stack([rows, cols], axis=1)[off_diagonal]
+    J = values[off_diagonal] / 4.0
+
+    if not simplify:
+        return IsingModel.from_arrays(quad_indices, J, linear_indices, h, constant)
+
+    linear_indices, h = linear_indices[h != 0.0], h[h != 0.0]
+    quad_indices, J = quad_indices[J != 0.0], J[J != 0.0]
+    # New indices follow the first appearance in the linear terms, then in the quadratic terms.
+    appearance = np.concatenate([linear_indices, quad_indices.ravel()])
+    old_indices = _first_appearance(appearance, size)
+    rank = np.empty(size, dtype=np.int64)
+    rank[old_indices] = np.arange(len(old_indices))
+    new_indices = rank[appearance]
+    index_map = dict(zip(old_indices.tolist(), range(len(old_indices))))
+    return IsingModel.from_arrays(
+        new_indices[len(linear_indices) :].reshape(-1, 2),
+        J,
+        new_indices[: len(linear_indices)],
+        h,
+        constant,
+        index_map,
+    )
@@ -1,4 +1,5 @@
 import jijmodeling as jm
+import numpy as np
 import jijmodeling_transpiler.core as jmt
 import qamomile.core.operator as qm_o
 
@@ -122,13 +123,18 @@ class HamiltonianBuilder:
         Returns:
             qm_o.Hamiltonian: Qamomile Hamiltonian operator.
         """
-        hamiltonian = qm_o.Hamiltonian()
-        hamiltonian.constant = self._subsituted_expr.constant
-
-        for indices, coeff in self._subsituted_expr.coeff.items():
-            hamiltonian.add_term((self._reverse_var_map[i] for i in indices), coeff)
-
-        return hamiltonian
+        coeffs = self._subsituted_expr.coeff
+        ops = [self._reverse_var_map[i] for indices in coeffs.keys() for i in indices]
+        term_ptr = np.zeros(len(coeffs) + 1, dtype=np.int64)
+        np.cumsum([len(indices) for indices in coeffs.keys()], out=term_ptr[1:])
+
+        return qm_o.Hamiltonian.from_arrays(
+            term_ptr,
+            np.array([op.index for op in ops], dtype=np.int64),
+            np.array([op.pauli.value for op in ops], dtype=np.int64),
+            np.fromiter(coeffs.values(), dtype=np.complex128, count=len(coeffs)),
+            constant=self._subsituted_expr.constant,
+        )
 
     def build(self) -> qm_o.Hamiltonian:
         """Build Qamomile Hamiltonian operator.
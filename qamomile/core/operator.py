@@ -7,7 +7,12 @@ which are fundamental in quantum mechanics and quantum computing.
 Key Components:
 - Pauli: An enumeration of Pauli operators (X, Y, Z, I).
 - PauliOperator: A class representing a single Pauli operator acting on a specific qubit.
+  Instances are interned, so each (Pauli, qubit) pair exists once.
 - Hamiltonian: A class representing a quantum Hamiltonian as a sum of Pauli operator products.
+  Terms are stored either in a dictionary (default) or, with ``storage="symplectic"``,
+  as packed x/z bit masks (see :mod:`qamomile.core.symplectic`).
+- multiply_pauli_same_qubit / multiply_pauli_codes: Single-qubit Pauli products looked up
+  in a 4x4 product table, for one pair or whole arrays of operators.
 
 Usage:
     from qamomile.operator.hamiltonian import X, Y, Z, Hamiltonian
@@ -27,9 +32,31 @@ Usage:
 """
 
 import math
+import os
 import dataclasses
 import enum
-from typing import Dict, Tuple, Union, Optional
+from typing import Dict, Tuple, Union, Optional, Literal, Iterable
+
+import numpy as np
+
+from qamomile.core.symplectic import (
+    SymplecticTerms,
+    basis_masks,
+    diagonal_values,
+    flip_groups,
+    flip_values,
+    ints_to_masks,
+    multiply_masks,
+    num_words,
+    pack_terms,
+    reverse_bits,
+    unique_masks,
+)
+
+
+# Products of Hamiltonians with at least this many term pairs use the vectorized
+# engine in dict storage; below it the plain Python loop has less overhead.
+_VECTORIZED_PRODUCT_MIN_PAIRS = 16
 
 
 class Pauli(enum.Enum):
@@ -49,11 +76,18 @@ class Pauli(enum.Enum):
     I = 3
 
 
-@dataclasses.dataclass
+# Interned PauliOperator instances, keyed by (pauli, index).
+_PAULI_OPERATORS: Dict[Tuple[Pauli, int], "PauliOperator"] = {}
+
+
+@dataclasses.dataclass(frozen=True, eq=False, slots=True)
 class PauliOperator:
     """
     Represents a single Pauli operator acting on a specific qubit.
 
+    Instances are interned: constructing the same Pauli operator on the same qubit twice
+    returns the same immutable object, so terms share their operators and compare fast.
+
     Attributes:
         pauli (Pauli): The type of Pauli operator (X, Y, or Z).
         index (int): The index of the qubit on which this operator acts.
@@ -62,10 +96,37 @@ class PauliOperator:
         >>> X0 = PauliOperator(Pauli.X, 0)
         >>> print(X0)
         X0
+        >>> X0 is PauliOperator(Pauli.X, 0)
+        True
     """
 
     pauli: Pauli
     index: int
+    _hash: int = dataclasses.field(init=False, repr=False, compare=False)
+
+    def __new__(cls, pauli: Pauli, index: int) -> "PauliOperator":
+        op = _PAULI_OPERATORS.get((pauli, index))
+        if op is None:
+            op = object.__new__(cls)
+            object.__setattr__(op, "pauli", pauli)
+            object.__setattr__(op, "index", index)
+            object.__setattr__(op, "_hash", hash((pauli, index)))
+            _PAULI_OPERATORS[(pauli, index)] = op
+        return op
+
+    def __init__(self, pauli: Pauli, index: int) -> None:
+        # The attributes are set once in __new__.
+        pass
+
+    def __reduce__(self):
+        return (PauliOperator, (self.pauli, self.index))
+
+    def __eq__(self, other) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, PauliOperator):
+            return NotImplemented
+        return self.pauli == other.pauli and self.index == other.index
 
     def __hash__(self) -> int:
         """
@@ -74,7 +135,7 @@ class PauliOperator:
         Returns:
             int: A hash value based on the Pauli type and qubit index.
         """
-        return hash((self.pauli, self.index))
+        return self._hash
 
     def __repr__(self) -> str:
         """
@@ -93,8 +154,14 @@ class Hamiltonian:
     The Hamiltonian is stored as a dictionary where keys are tuples of PauliOperators
     and values are their corresponding coefficients.
 
+    With ``storage="symplectic"`` the terms are instead kept in a
+    :class:`qamomile.core.symplectic.SymplecticTerms` table of packed x/z bit masks
+    and a complex coefficient array. This is much lighter for Hamiltonians with
+    many terms; the dictionary returned by `terms` is then built on demand.
+
     Attributes:
-        _terms (Dict[Tuple[PauliOperator, ...], complex]): The terms of the Hamiltonian.
+        _terms (Dict[Tuple[PauliOperator, ...], complex]): The terms of the Hamiltonian (dict storage).
+        _table (Optional[SymplecticTerms]): The packed terms of the Hamiltonian (symplectic storage).
         constant (float): A constant term added to the Hamiltonian.
 
     Example:
@@ -103,12 +170,236 @@ class Hamiltonian:
         >>> H.add_term((PauliOperator(Pauli.Z, 2),), 1.0)
         >>> print(H.terms)
         {(X0, Y1): 0.5, (Z2,): 1.0}
+
+        >>> H = Hamiltonian(storage="symplectic")
+        >>> H.add_term((PauliOperator(Pauli.X, 0), PauliOperator(Pauli.Y, 1)), 0.5)
+        >>> H.add_term((PauliOperator(Pauli.Y, 1), PauliOperator(Pauli.X, 0)), 0.5)
+        >>> print(H.terms)
+        {(X0, Y1): 1.0}
     """
 
-    def __init__(self, num_qubits: Optional[int] = None) -> None:
+    def __init__(
+        self,
+        num_qubits: Optional[int] = None,
+        storage: Literal["dict", "symplectic"] = "dict",
+    ) -> None:
+        if storage not in ("dict", "symplectic"):
+            raise ValueError(f"Invalid value for storage: {storage}")
         self._terms: Dict[Tuple[PauliOperator, ...], complex] = {}
+        self._table: Optional[SymplecticTerms] = (
+            SymplecticTerms() if storage == "symplectic" else None
+        )
+        self._terms_cache: Optional[Dict[Tuple[PauliOperator, ...], complex]] = None
         self.constant: float = 0.0
         self._num_qubits = num_qubits
+        # Bit q is set if some term acts on qubit q. It is updated incrementally
+        # as terms are added or merged, so `num_qubits` and `support` are O(1).
+        self._support_mask: int = 0
+        # Number of dict terms reflected in the mask, used to detect terms that
+        # were inserted directly into the dictionary returned by `terms`.
+        self._support_num_terms: int = 0
+        self._support_cache: Optional[Tuple[int, frozenset]] = None
+
+    @classmethod
+    def from_arrays(
+        cls,
+        term_ptr: np.ndarray,
+        qubit_idx: np.ndarray,
+        pauli_code: np.ndarray,
+        coeff: np.ndarray,
+        constant: Union[float, complex] = 0.0,
+        num_qubits: Optional[int] = None,
+        storage: Literal["dict", "symplectic"] = "dict",
+    ) -> "Hamiltonian":
+        """
+        Builds a Hamiltonian from terms given as arrays in a CSR-style layout.
+
+        The operators of term ``t`` are ``qubit_idx[term_ptr[t]:term_ptr[t + 1]]`` and
+        ``pauli_code[term_ptr[t]:term_ptr[t + 1]]``, where the codes are the `Pauli` values
+        (X=0, Y=1, Z=2, I=3). The result is the same as calling `add_term` for every term,
+        but all terms are simplified, sorted and merged in one vectorized pass.
+
+        Args:
+            term_ptr (np.ndarray): Offsets of the terms with shape (num_terms + 1,), starting at 0.
+            qubit_idx (np.ndarray): The qubit index of each operator.
+            pauli_code (np.ndarray): The `Pauli` value of each operator.
+            coeff (np.ndarray): The coefficient of each term with shape (num_terms,).
+            constant (Union[float, complex]): The constant term. Defaults to 0.0.
+            num_qubits (Optional[int]): The fixed number of qubits. Defaults to None.
+            storage (Literal["dict", "symplectic"]): The storage of the terms. Defaults to "dict".
+
+        Returns:
+            Hamiltonian: The Hamiltonian.
+
+        Raises:
+            ValueError: If the arrays are inconsistent, or an index or code is invalid.
+
+        Example:
+            >>> H = Hamiltonian.from_arrays([0, 2, 3, 5], [1, 0, 2, 0, 0], [2, 0, 1, 0, 0], [1.0, 0.5, 2.0])
+            >>> print(H)
+            Hamiltonian((X0, Z1): 1.0, (Y2,): 0.5)
+            >>> H.constant
+            2.0
+        """
+        term_ptr = np.asarray(term_ptr, dtype=np.int64)
+        qubit_idx = np.asarray(qubit_idx, dtype=np.int64)
+        pauli_code = np.asarray(pauli_code, dtype=np.int64)
+        coeff = np.asarray(coeff, dtype=np.complex128)
+        if (
+            term_ptr.ndim != 1
+            or len(term_ptr) != len(coeff) + 1
+            or term_ptr[0] != 0
+            or term_ptr[-1] != len(qubit_idx)
+            or len(pauli_code) != len(qubit_idx)
+            or np.any(np.diff(term_ptr) < 0)
+        ):
+            raise ValueError(
+                "term_ptr must start at 0, be non-decreasing, end at len(qubit_idx), "
+                "and have one more entry than coeff; pauli_code must match qubit_idx."
+            )
+        if np.any(qubit_idx < 0):
+            raise ValueError("Qubit indices must be non-negative.")
+        if np.any((pauli_code < 0) | (pauli_code > 3)):
+            raise ValueError("Pauli codes must be 0 (X), 1 (Y), 2 (Z) or 3 (I).")
+
+        x, z, phase = pack_terms(
+            term_ptr,
+            qubit_idx,
+            _PAULI_CODE_X_BITS[pauli_code],
+            _PAULI_CODE_Z_BITS[pauli_code],
+        )
+        hamiltonian = cls(num_qubits=num_qubits, storage=storage)
+        hamiltonian.constant = _as_scalar(constant)
+        hamiltonian._add_unique_masks(*unique_masks(x, z, coeff * phase))
+        return hamiltonian
+
+    @classmethod
+    def from_pauli_strings(
+        cls,
+        labels: Iterable[str],
+        coeffs: Iterable[Union[float, complex]],
+        constant: Union[float, complex] = 0.0,
+        num_qubits: Optional[int] = None,
+        storage: Literal["dict", "symplectic"] = "dict",
+    ) -> "Hamiltonian":
+        """
+        Builds a Hamiltonian from Pauli strings such as ``"XIZ"``.
+
+        Character ``q`` of a label is the operator on qubit ``q``, one of "I", "X", "Y" and "Z".
+        Labels may have different lengths. See `from_arrays`.
+
+        Args:
+            labels (Iterable[str]): The Pauli strings.
+            coeffs (Iterable[Union[float, complex]]): The coefficient of each string.
+            constant (Union[float, complex]): The constant term. Defaults to 0.0.
+            num_qubits (Optional[int]): The fixed number of qubits. Defaults to None.
+            storage (Literal["dict", "symplectic"]): The storage of the terms. Defaults to "dict".
+
+        Returns:
+            Hamiltonian: The Hamiltonian.
+
+        Raises:
+            ValueError: If a label has an invalid character, or the numbers of labels and coefficients differ.
+
+        Example:
+            >>> print(Hamiltonian.from_pauli_strings(["XIZ", "IY", "XIZ"], [1.0, 0.5, 1.0]))
+            Hamiltonian((X0, Z2): 2.0, (Y1,): 0.5)
+        """
+        labels = list(labels)
+        lengths = np.array([len(label) for label in labels], dtype=np.int64)
+        chars = np.frombuffer("".join(labels).encode("ascii", "replace"), dtype=np.uint8)
+        codes = _PAULI_CHAR_CODES[chars]
+        if np.any(codes < 0):
+            raise ValueError("Pauli strings may only contain 'I', 'X', 'Y' and 'Z'.")
+
+        starts = np.cumsum(lengths) - lengths
+        terms = np.repeat(np.arange(len(labels)), lengths)
+        qubits = np.arange(len(chars)) - starts[terms]
+        keep = codes != Pauli.I.value
+        term_ptr = np.zeros(len(labels) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(terms[keep], minlength=len(labels)), out=term_ptr[1:])
+        return cls.from_arrays(
+            term_ptr,
+            qubits[keep],
+            codes[keep],
+            np.fromiter(coeffs, dtype=np.complex128),
+            constant=constant,
+            num_qubits=num_qubits,
+            storage=storage,
+        )
+
+    @classmethod
+    def from_masks(
+        cls,
+        x: np.ndarray,
+        z: np.ndarray,
+        coeffs: np.ndarray,
+        num_qubits: Optional[int] = None,
+        constant: Union[float, complex] = 0.0,
+        storage: Literal["dict", "symplectic"] = "symplectic",
+    ) -> "Hamiltonian":
+        """
+        Builds a Hamiltonian from packed Pauli masks, as returned by `to_masks`.
+
+        Row ``t`` of ``x`` and ``z`` holds the x and z bits of term ``t`` in little-endian
+        uint64 words (see :mod:`qamomile.core.symplectic`). The rows must be distinct and not
+        proportional to the identity. With symplectic storage the arrays are wrapped without
+        copying, so memory-mapped arrays stay mapped.
+
+        Args:
+            x (np.ndarray): The x masks with shape (num_terms, num_words).
+            z (np.ndarray): The z masks with shape (num_terms, num_words).
+            coeffs (np.ndarray): The complex coefficient of each term with shape (num_terms,).
+            num_qubits (Optional[int]): The fixed number of qubits. Defaults to None.
+            constant (Union[float, complex]): The constant term. Defaults to 0.0.
+            storage (Literal["dict", "symplectic"]): The storage of the terms.
+                Defaults to "symplectic".
+
+        Returns:
+            Hamiltonian: The Hamiltonian.
+
+        Example:
+            >>> H = X(0) * Z(1) + 0.5
+            >>> Hamiltonian.from_masks(*H.to_masks(), constant=H.constant) == H
+            True
+        """
+        hamiltonian = cls(num_qubits=num_qubits, storage=storage)
+        hamiltonian.constant = _as_scalar(constant)
+        table = SymplecticTerms.from_arrays(x, z, coeffs)
+        if storage == "symplectic":
+            hamiltonian._table = table
+            hamiltonian._support_mask = _support_of_masks(table.x, table.z)
+        else:
+            packed = cls(storage="symplectic")
+            packed._table = table
+            hamiltonian._add_terms_of(packed)
+        return hamiltonian
+
+    def to_masks(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns the packed Pauli masks and coefficients of the terms, without the constant.
+
+        With symplectic storage these are the arrays of the term table itself, so they must
+        not be modified. See `from_masks`.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, np.ndarray]: The x masks, z masks and coefficients.
+
+        Example:
+            >>> x, z, coeffs = (X(0) * Z(1)).to_masks()
+            >>> x.tolist(), z.tolist(), coeffs.tolist()
+            ([[1]], [[2]], [(1+0j)])
+        """
+        if self._table is not None:
+            return self._table.x, self._table.z, self._table.coeffs
+        return _terms_to_masks(self._terms.items())
+
+    @property
+    def storage(self) -> Literal["dict", "symplectic"]:
+        """
+        The storage mode of the terms, either "dict" or "symplectic".
+        """
+        return "dict" if self._table is None else "symplectic"
 
     @property
     def terms(self) -> Dict[Tuple[PauliOperator, ...], complex]:
@@ -123,8 +414,16 @@ class Hamiltonian:
             >>> H.add_term((PauliOperator(Pauli.X, 0), PauliOperator(Pauli.Y, 1)), 0.5)
             >>> print(H.terms)
             {(X0, Y1): 0.5}
+
+        Note:
+            With symplectic storage the dictionary is a snapshot built from the packed
+            masks. Modifying it does not modify the Hamiltonian.
         """
-        return self._terms
+        if self._table is None:
+            return self._terms
+        if self._terms_cache is None:
+            self._terms_cache = _table_to_terms(self._table)
+        return self._terms_cache
 
     def add_term(
         self, operators: Tuple[PauliOperator, ...], coeff: Union[float, complex]
@@ -146,6 +445,15 @@ class Hamiltonian:
             >>> print(H.terms)
             {(X0, Y1): (0.5+0.5j)}
         """
+        if self._table is not None:
+            x, z, phase = _operators_to_masks(tuple(operators))
+            if x or z:
+                self._table.add(x, z, phase * coeff)
+                self._terms_cache = None
+                self._support_mask |= x | z
+            else:
+                self.constant += phase * coeff
+            return
 
         operators, phase = simplify_pauliop_terms(operators)
         if operators:
@@ -157,9 +465,86 @@ class Hamiltonian:
                 self._terms[operators] += phase * coeff
             else:
                 self._terms[operators] = phase * coeff
+                for op in operators:
+                    self._support_mask |= 1 << int(op.index)
+                self._support_num_terms = len(self._terms)
         else:
             self.constant += phase * coeff
 
+    def accumulate(
+        self,
+        terms: Iterable[Tuple[Tuple[PauliOperator, ...], Union[float, complex]]],
+    ) -> None:
+        """
+        Adds many terms to the Hamiltonian in place.
+
+        This is equivalent to calling `add_term` for every ``(operators, coeff)`` pair.
+        With symplectic storage all terms are converted to masks first and merged
+        into the table in a single batch.
+
+        Args:
+            terms (Iterable[Tuple[Tuple[PauliOperator, ...], Union[float, complex]]]):
+                Pairs of a tuple of PauliOperators and its coefficient.
+
+        Example:
+            >>> H = Hamiltonian()
+            >>> H.accumulate([((PauliOperator(Pauli.Z, 0),), 1.0), ((PauliOperator(Pauli.Z, 0),), 0.5)])
+            >>> print(H.terms)
+            {(Z0,): 1.5}
+        """
+        if self._table is None:
+            for operators, coeff in terms:
+                self.add_term(operators, coeff)
+            return
+
+        x, z, coeffs = _terms_to_masks(terms)
+        identity = ~(x.any(axis=1) | z.any(axis=1))
+        if identity.any():
+            self.constant = _as_scalar(self.constant + coeffs[identity].sum())
+            x, z, coeffs = x[~identity], z[~identity], coeffs[~identity]
+        self._table.add_masks(x, z, coeffs)
+        self._terms_cache = None
+        self._support_mask |= _support_of_masks(x, z)
+
+    def _current_support_mask(self) -> int:
+        """Returns the support mask, rebuilding it if the terms dictionary was modified directly."""
+        if self._table is None and len(self._terms) != self._support_num_terms:
+            mask = 0
+            for term in self._terms:
+                for op in term:
+                    mask |= 1 << int(op.index)
+            self._support_mask = mask
+            self._support_num_terms = len(self._terms)
+        return self._support_mask
+
+    @property
+    def support(self) -> frozenset:
+        """
+        The indices of the qubits on which at least one term acts non-trivially.
+
+        The support is tracked incrementally as terms are added, so reading it does
+        not scan the terms.
+
+        Returns:
+            frozenset: The qubit indices.
+
+        Example:
+            >>> H = Hamiltonian()
+            >>> H.add_term((PauliOperator(Pauli.X, 0), PauliOperator(Pauli.Y, 3)), 1.0)
+            >>> sorted(H.support)
+            [0, 3]
+        """
+        mask = self._current_support_mask()
+        if self._support_cache is None or self._support_cache[0] != mask:
+            indices = []
+            rest = mask
+            while rest:
+                low = rest & -rest
+                indices.append(low.bit_length() - 1)
+                rest ^= low
+            self._support_cache = (mask, frozenset(indices))
+        return self._support_cache[1]
+
     @property
     def num_qubits(self) -> int:
         """
@@ -176,9 +561,215 @@ class Hamiltonian:
         """
         if self._num_qubits is not None:
             return self._num_qubits
-        if not self._terms:
-            return 0
-        return max(op.index for term in self.terms.keys() for op in term) + 1
+        return self._current_support_mask().bit_length()
+
+    @property
+    def fixed_num_qubits(self) -> Optional[int]:
+        """
+        The number of qubits given to the constructor, or None if it follows the terms.
+
+        Example:
+            >>> Hamiltonian(num_qubits=5).fixed_num_qubits
+            5
+            >>> print(X(2).fixed_num_qubits)
+            None
+        """
+        return self._num_qubits
+
+    def _basis_masks(
+        self, num_qubits: Optional[int], qubit_order: str
+    ) -> tuple[int, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns the number of qubits and the x masks, z masks and coefficients of this Hamiltonian
+        as computational basis indices, the constant included as an identity term.
+        """
+        if num_qubits is None:
+            num_qubits = self.num_qubits
+        elif num_qubits < self.num_qubits:
+            raise ValueError(
+                f"The Hamiltonian acts on {self.num_qubits} qubits, but num_qubits is {num_qubits}."
+            )
+        if qubit_order not in ("little", "big"):
+            raise ValueError(
+                f"Invalid qubit_order: {qubit_order}. Choose from 'little' or 'big'."
+            )
+        x, z, coeffs = self.to_masks()
+        x, z = basis_masks(x, num_qubits), basis_masks(z, num_qubits)
+        if qubit_order == "big":
+            x, z = reverse_bits(x, num_qubits), reverse_bits(z, num_qubits)
+        if self.constant != 0:
+            x = np.append(x, 0)
+            z = np.append(z, 0)
+            coeffs = np.append(coeffs, self.constant)
+        return num_qubits, x, z, coeffs
+
+    def _basis_action(
+        self, num_qubits: Optional[int], qubit_order: str
+    ) -> tuple[int, np.ndarray, list[tuple[np.ndarray, np.ndarray]]]:
+        """
+        Returns the number of qubits, the distinct bit flips and the flip groups
+        (see :func:`qamomile.core.symplectic.flip_groups`) of this Hamiltonian, constant included.
+        """
+        num_qubits, x, z, coeffs = self._basis_masks(num_qubits, qubit_order)
+        flips, groups = flip_groups(x, z, coeffs)
+        return num_qubits, flips, groups
+
+    def diagonal(
+        self,
+        num_qubits: Optional[int] = None,
+        qubit_order: Literal["little", "big"] = "little",
+        out: Optional[Union[np.ndarray, str, os.PathLike]] = None,
+        chunk_size: int = 1 << 20,
+    ) -> np.ndarray:
+        """
+        Computes the diagonal of a Hamiltonian made of Z operators only, i.e. the energy of every bitstring.
+
+        The vector is obtained with a fast Walsh–Hadamard transform of the coefficients, chunk by chunk,
+        so it can be written to a memory-mapped file when it does not fit in memory.
+
+        Args:
+            num_qubits (Optional[int]): The number of qubits. Defaults to `num_qubits`.
+            qubit_order (Literal["little", "big"]): The qubit order of the basis, see `to_sparse`.
+                Defaults to "little".
+            out (Optional[Union[np.ndarray, str, os.PathLike]]): An array of length 2**num_qubits to write into,
+                or the path of a file that is created as a ``np.memmap``. Defaults to a new array.
+            chunk_size (int): The number of entries computed at once. Must be a power of two. Defaults to 2**20.
+
+        Returns:
+            np.ndarray: The diagonal, real unless a coefficient is complex.
+
+        Raises:
+            ValueError: If the Hamiltonian has X or Y operators, an argument is invalid,
+                or ``out`` does not match the shape or dtype of the diagonal.
+
+        Example:
+            >>> H = Z(0) + 2.0 * Z(0) * Z(1) + 0.5
+            >>> H.diagonal().tolist()
+            [3.5, -2.5, -0.5, 1.5]
+        """
+        if chunk_size < 1 or chunk_size & (chunk_size - 1):
+            raise ValueError(f"chunk_size must be a power of two, but got {chunk_size}.")
+        num_qubits, x, z, coeffs = self._basis_masks(num_qubits, qubit_order)
+        if x.any():
+            raise ValueError(
+                "The diagonal can only be computed for Hamiltonians of Z operators."
+            )
+        dtype = np.complex128 if np.any(np.imag(coeffs) != 0) else np.float64
+        if len(coeffs) == 0 or dtype == np.float64:
+            coeffs = np.real(coeffs)
+        shape = (1 << num_qubits,)
+        if out is None:
+            out = np.empty(shape, dtype=dtype)
+        elif isinstance(out, (str, os.PathLike)):
+            out = np.memmap(out, dtype=dtype, mode="w+", shape=shape)
+        elif out.shape != shape or not np.can_cast(dtype, out.dtype):
+            raise ValueError(
+                f"out must have shape {shape} and a dtype that can hold {np.dtype(dtype)}."
+            )
+        return diagonal_values(
+            z, coeffs, num_qubits, out, chunk_qubits=chunk_size.bit_length() - 1
+        )
+
+    def to_sparse(
+        self,
+        num_qubits: Optional[int] = None,
+        qubit_order: Literal["little", "big"] = "little",
+    ):
+        """
+        Builds the matrix of the Hamiltonian as a ``scipy.sparse.csr_matrix``.
+
+        The matrix is assembled directly from the x/z bit masks of the terms, without tensor products:
+        all terms with the same X/Y positions flip the same bits of a basis state, so they share
+        one nonzero entry per row.
+
+        Args:
+            num_qubits (Optional[int]): The number of qubits of the matrix. Defaults to `num_qubits`.
+            qubit_order (Literal["little", "big"]): With "little", qubit 0 is the least significant bit
+                of the basis index (as in Qiskit). With "big", qubit 0 is the most significant bit
+                (as in QuTiP's ``tensor``). Defaults to "little".
+
+        Returns:
+            scipy.sparse.csr_matrix: The complex matrix with shape (2**num_qubits, 2**num_qubits).
+
+        Raises:
+            ValueError: If num_qubits is smaller than `num_qubits` or qubit_order is invalid.
+
+        Example:
+            >>> H = X(0) + 2.0 * Z(1)
+            >>> H.to_sparse().toarray().real.tolist()
+            [[2.0, 1.0, 0.0, 0.0], [1.0, 2.0, 0.0, 0.0], [0.0, 0.0, -2.0, 1.0], [0.0, 0.0, 1.0, -2.0]]
+        """
+        import scipy.sparse
+
+        num_qubits, flips, groups = self._basis_action(num_qubits, qubit_order)
+        dim = 1 << num_qubits
+        rows = np.arange(dim, dtype=np.int64)
+        indices = rows[:, None] ^ flips[None, :]
+        data = flip_values(rows, groups)
+        indptr = np.arange(dim + 1, dtype=np.int64) * len(flips)
+        matrix = scipy.sparse.csr_matrix(
+            (data.ravel(), indices.ravel(), indptr), shape=(dim, dim)
+        )
+        matrix.eliminate_zeros()
+        matrix.sort_indices()
+        return matrix
+
+    def as_linear_operator(
+        self,
+        num_qubits: Optional[int] = None,
+        qubit_order: Literal["little", "big"] = "little",
+        chunk_size: int = 1 << 16,
+    ):
+        """
+        Wraps the Hamiltonian as a matrix-free ``scipy.sparse.linalg.LinearOperator``.
+
+        Applying the operator never stores the matrix: the basis states are processed in chunks
+        of ``chunk_size`` rows. Every application allocates a new output array, and besides the
+        input and the output only the temporaries of one chunk are held.
+        It can be passed to ``scipy.sparse.linalg.eigsh`` for exact diagonalization.
+
+        Args:
+            num_qubits (Optional[int]): The number of qubits. Defaults to `num_qubits`.
+            qubit_order (Literal["little", "big"]): The qubit order of the basis, see `to_sparse`.
+                Defaults to "little".
+            chunk_size (int): The number of basis states processed at once. Defaults to 65536.
+
+        Returns:
+            scipy.sparse.linalg.LinearOperator: The complex operator with shape (2**num_qubits, 2**num_qubits).
+
+        Raises:
+            ValueError: If num_qubits is smaller than `num_qubits` or qubit_order is invalid.
+
+        Example:
+            >>> H = X(0) + 2.0 * Z(1)
+            >>> H.as_linear_operator() @ np.array([1.0, 0.0, 0.0, 0.0])
+            array([2.+0.j, 1.+0.j, 0.+0.j, 0.+0.j])
+        """
+        import scipy.sparse.linalg
+
+        num_qubits, flips, groups = self._basis_action(num_qubits, qubit_order)
+        dim = 1 << num_qubits
+        # A single chunk is evaluated once instead of on every application.
+        single_chunk = flip_values(np.arange(dim, dtype=np.int64), groups) if dim <= chunk_size else None
+
+        def matmat(vectors: np.ndarray) -> np.ndarray:
+            vectors = np.asarray(vectors).reshape(dim, -1)
+            out = np.zeros(vectors.shape, dtype=np.result_type(vectors, np.complex128))
+            for start in range(0, dim, chunk_size):
+                rows = np.arange(start, min(start + chunk_size, dim), dtype=np.int64)
+                values = single_chunk if single_chunk is not None else flip_values(rows, groups)
+                for g, flip in enumerate(flips.tolist()):
+                    out[start : start + len(rows)] += (
+                        values[:, g, None] * vectors[rows ^ flip]
+                    )
+            return out
+
+        return scipy.sparse.linalg.LinearOperator(
+            (dim, dim),
+            matvec=lambda vector: matmat(vector).ravel(),
+            matmat=matmat,
+            dtype=np.complex128,
+        )
 
     def to_latex(self) -> str:
         """
@@ -248,7 +839,7 @@ class Hamiltonian:
             Hamiltonian((X0, Y1): 0.5, (Z2,): 1.0)
         """
         terms_str = ", ".join(
-            f"{operators}: {coeff}" for operators, coeff in self._terms.items()
+            f"{operators}: {coeff}" for operators, coeff in self.terms.items()
         )
         return f"Hamiltonian({terms_str})"
 
@@ -257,13 +848,78 @@ class Hamiltonian:
             return False
         return self.terms == other.terms and self.constant == other.constant
 
+    def _copy(self, storage: Optional[str] = None) -> "Hamiltonian":
+        """
+        Returns a copy of the terms and constant of this Hamiltonian,
+        optionally converted to another storage mode. The fixed number of qubits is not copied.
+        """
+        storage = self.storage if storage is None else storage
+        h = Hamiltonian(storage=storage)
+        h.constant = self.constant
+        if storage == self.storage:
+            if self._table is None:
+                h._terms = self._terms.copy()
+            else:
+                h._table = self._table.copy()
+            h._support_mask = self._current_support_mask()
+            h._support_num_terms = self._support_num_terms
+        else:
+            h._add_terms_of(self)
+        return h
+
+    def _add_terms_of(self, other: "Hamiltonian", factor: complex = 1.0) -> None:
+        """Adds ``factor`` times the terms of ``other`` (without its constant) to this Hamiltonian."""
+        if self._table is not None and other._table is not None:
+            self._table.add_masks(other._table.x, other._table.z, factor * other._table.coeffs)
+            self._terms_cache = None
+            self._support_mask |= other._support_mask
+        elif self._table is None and other._table is None:
+            for term, coeff in other._terms.items():
+                self.add_term(term, coeff * factor)
+        else:
+            for term, coeff in other.terms.items():
+                self.add_term(term, coeff * factor)
+
+    def _add_product(self, left: "Hamiltonian", right: "Hamiltonian") -> None:
+        """
+        Adds the product of the terms of ``left`` and ``right`` (without their constants)
+        using the vectorized engine :func:`qamomile.core.symplectic.multiply_masks`.
+        """
+        self._add_unique_masks(*multiply_masks(*left.to_masks(), *right.to_masks()))
+
+    def _add_unique_masks(
+        self, x: np.ndarray, z: np.ndarray, coeffs: np.ndarray
+    ) -> None:
+        """
+        Adds packed terms whose rows are distinct, moving rows proportional to the identity
+        into the constant.
+        """
+        identity = ~(x.any(axis=1) | z.any(axis=1))
+        if identity.any():
+            self.constant = _as_scalar(self.constant + coeffs[identity].sum())
+            x, z, coeffs = x[~identity], z[~identity], coeffs[~identity]
+        if self._table is not None:
+            self._table.add_masks(x, z, coeffs)
+            self._terms_cache = None
+            self._support_mask |= _support_of_masks(x, z)
+        elif not self._terms:
+            self._terms = _masks_to_terms(x, z, coeffs)
+            self._support_mask |= _support_of_masks(x, z)
+            self._support_num_terms = len(self._terms)
+        else:
+            for term, coeff in _masks_to_terms(x, z, coeffs).items():
+                self.add_term(term, coeff)
+
+    def _result_storage(self, other: "Hamiltonian") -> str:
+        """Symplectic storage wins when the operands of a binary operation disagree."""
+        if self._table is not None or other._table is not None:
+            return "symplectic"
+        return "dict"
+
     def __add__(self, other):
         if isinstance(other, Hamiltonian):
-            h = Hamiltonian()
-            h._terms = self._terms.copy()
-            h.constant = self.constant
-            for term, coeff in other.terms.items():
-                h.add_term(term, coeff)
+            h = self._copy(self._result_storage(other))
+            h._add_terms_of(other)
             h.constant += other.constant
 
             if h.num_qubits < self.num_qubits:
@@ -271,16 +927,52 @@ class Hamiltonian:
 
             return h
         elif isinstance(other, (int, float, complex)):
-            h = Hamiltonian(num_qubits = self.num_qubits)
-            h._terms = self._terms.copy()
+            h = self._copy()
+            h._num_qubits = self.num_qubits
             h.constant = self.constant + other
-            
+
             return h
         else:
             raise ValueError("Unsupported addition operation.")
 
     def __radd__(self, other):
         return self.__add__(other)
+
+    def __iadd__(self, other):
+        """
+        Adds ``other`` to this Hamiltonian in place.
+
+        Unlike `__add__`, the existing terms are not copied, so accumulating
+        many Hamiltonians with ``+=`` takes time linear in the total number of terms.
+        """
+        if isinstance(other, Hamiltonian):
+            if other is self:
+                other = other._copy()
+            if self._num_qubits is not None:
+                self._num_qubits = max(self._num_qubits, other.num_qubits)
+            self._add_terms_of(other)
+            self.constant += other.constant
+            return self
+        elif isinstance(other, (int, float, complex)):
+            self.constant += other
+            return self
+        else:
+            raise ValueError("Unsupported addition operation.")
+
+    def __isub__(self, other):
+        if isinstance(other, Hamiltonian):
+            if other is self:
+                other = other._copy()
+            if self._num_qubits is not None:
+                self._num_qubits = max(self._num_qubits, other.num_qubits)
+            self._add_terms_of(other, -1.0)
+            self.constant += -1.0 * other.constant
+            return self
+        elif isinstance(other, (int, float, complex)):
+            self.constant += -1.0 * other
+            return self
+        else:
+            raise ValueError("Unsupported subtraction operation.")
     
     def __sub__(self, other):
         return self + (-1.0 * other)
@@ -290,28 +982,35 @@ class Hamiltonian:
 
     def __mul__(self, other):
         if isinstance(other, (int, float, complex)):
-            h = Hamiltonian(num_qubits = self.num_qubits)
-            for term, coeff in self.terms.items():
-                h.add_term(term, coeff * other)
+            if self._table is not None:
+                h = self._copy()
+                h._table.scale(other)
+            else:
+                h = Hamiltonian()
+                for term, coeff in self.terms.items():
+                    h.add_term(term, coeff * other)
+            h._num_qubits = self.num_qubits
             h.constant = self.constant * other
             return h
         elif isinstance(other, Hamiltonian):
-            h = Hamiltonian()
-            for term1, coeff1 in self.terms.items():
-                for term2, coeff2 in other.terms.items():
-                    term, phase = simplify_pauliop_terms(term1 + term2)
-                    if term:
-                        h.add_term(term, phase * coeff1 * coeff2)
-                    else:
-                        h.constant += phase * coeff1 * coeff2
+            h = Hamiltonian(storage=self._result_storage(other))
+            num_pairs = len(self.terms) * len(other.terms)
+            if h._table is not None or num_pairs >= _VECTORIZED_PRODUCT_MIN_PAIRS:
+                h._add_product(self, other)
+            else:
+                for term1, coeff1 in self.terms.items():
+                    for term2, coeff2 in other.terms.items():
+                        term, phase = simplify_pauliop_terms(term1 + term2)
+                        if term:
+                            h.add_term(term, phase * coeff1 * coeff2)
+                        else:
+                            h.constant += phase * coeff1 * coeff2
 
             if not math.isclose(abs(other.constant), 0.0, abs_tol=1e-15):
-                for terms, coeff1 in self.terms.items():
-                    h.add_term(terms, coeff1 * other.constant)
+                h._add_terms_of(self, other.constant)
 
             if not math.isclose(abs(self.constant), 0.0, abs_tol=1e-15):
-                for terms, coeff2 in other.terms.items():
-                    h.add_term(terms, coeff2 * self.constant)
+                h._add_terms_of(other, self.constant)
 
             h.constant += self.constant * other.constant
 
@@ -325,6 +1024,35 @@ class Hamiltonian:
     def __rmul__(self, other):
         return self.__mul__(other)
 
+    def __imul__(self, other):
+        """
+        Multiplies this Hamiltonian by ``other`` in place.
+
+        Scalars rescale the coefficients without copying the terms. A product with
+        another Hamiltonian is computed as in `__mul__` and replaces the terms.
+        """
+        if isinstance(other, (int, float, complex)):
+            if self._table is not None:
+                self._table.scale(other)
+                self._terms_cache = None
+            else:
+                for term in self._terms:
+                    self._terms[term] *= other
+            self.constant *= other
+            return self
+        elif isinstance(other, Hamiltonian):
+            product = self * other
+            self._terms = product._terms
+            self._table = product._table
+            self._terms_cache = None
+            self.constant = product.constant
+            self._num_qubits = product._num_qubits
+            self._support_mask = product._support_mask
+            self._support_num_terms = product._support_num_terms
+            return self
+        else:
+            raise ValueError("Unsupported multiplication operation.")
+
     def __neg__(self):
         return -1.0 * self
 
@@ -413,45 +1141,36 @@ def multiply_pauli_same_qubit(
         (Z0, 1j)
     """
 
-    if pauli1.index == pauli2.index:
-        if pauli1.pauli == pauli2.pauli:
-            return PauliOperator(Pauli.I, pauli1.index), 1.0
-
-        elif pauli1.pauli == Pauli.X:
-            if pauli2.pauli == Pauli.Y:
-                return PauliOperator(Pauli.Z, pauli1.index), 1.0j
-
-            elif pauli2.pauli == Pauli.Z:
-                return PauliOperator(Pauli.Y, pauli1.index), -1.0j
-
-            elif pauli2.pauli == Pauli.I:
-                return PauliOperator(Pauli.X, pauli1.index), 1.0
-
-        elif pauli1.pauli == Pauli.Y:
-            if pauli2.pauli == Pauli.X:
-                return PauliOperator(Pauli.Z, pauli1.index), -1.0j
-
-            elif pauli2.pauli == Pauli.Z:
-                return PauliOperator(Pauli.X, pauli1.index), 1.0j
+    if pauli1.index != pauli2.index:
+        raise ValueError("Pauli operators act on different qubits.")
+    pauli, phase = _PAULI_PRODUCTS[pauli1.pauli.value][pauli2.pauli.value]
+    return PauliOperator(pauli, pauli1.index), phase
 
-            elif pauli2.pauli == Pauli.I:
-                return PauliOperator(Pauli.Y, pauli1.index), 1.0
 
-        elif pauli1.pauli == Pauli.Z:
-            if pauli2.pauli == Pauli.X:
-                return PauliOperator(Pauli.Y, pauli1.index), 1.0j
+def multiply_pauli_codes(
+    pauli1: np.ndarray, pauli2: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Multiplies columns of single-qubit Pauli operators elementwise.
 
-            elif pauli2.pauli == Pauli.Y:
-                return PauliOperator(Pauli.X, pauli1.index), -1.0j
+    The operators are given by their `Pauli` values (X=0, Y=1, Z=2, I=3), and each pair
+    is looked up in the same 4x4 product table as `multiply_pauli_same_qubit`.
 
-            elif pauli2.pauli == Pauli.I:
-                return PauliOperator(Pauli.Z, pauli1.index), 1.0
+    Args:
+        pauli1 (np.ndarray): The `Pauli` values of the left operators.
+        pauli2 (np.ndarray): The `Pauli` values of the right operators, broadcastable with ``pauli1``.
 
-        elif pauli1.pauli == Pauli.I:
-            return pauli2, 1.0
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The `Pauli` values of the products and their complex phases.
 
-    else:
-        raise ValueError("Pauli operators act on different qubits.")
+    Example:
+        >>> codes, phases = multiply_pauli_codes(np.array([0, 1, 2]), np.array([1, 1, 0]))
+        >>> [Pauli(code) for code in codes], phases.tolist()
+        ([<Pauli.Z: 2>, <Pauli.I: 3>, <Pauli.Y: 1>], [1j, (1+0j), 1j])
+    """
+    pauli1 = np.asarray(pauli1)
+    pauli2 = np.asarray(pauli2)
+    return _PAULI_PRODUCT_CODES[pauli1, pauli2], _PAULI_PRODUCT_PHASES[pauli1, pauli2]
 
 
 def simplify_pauliop_terms(
@@ -474,29 +1193,140 @@ def simplify_pauliop_terms(
         ((Z0, Z1), 1j)
     """
     phase = 1.0
-    paulis = {}
+    paulis: Dict[int, Pauli] = {}
 
     for op in term:
-        if op.index in paulis:
-            paulis[op.index].append(op)
+        pauli = paulis.get(op.index)
+        if pauli is None:
+            paulis[op.index] = op.pauli
         else:
-            paulis[op.index] = [op]
+            paulis[op.index], _phase = _PAULI_PRODUCTS[pauli.value][op.pauli.value]
+            phase *= _phase
+
+    pauli_list = tuple(
+        PauliOperator(pauli, index)
+        for index, pauli in paulis.items()
+        if pauli is not Pauli.I
+    )
+    return pauli_list, phase
+
+
+# _PAULI_PRODUCTS[a.value][b.value] = (c, phase) such that a * b = phase * c on the same qubit.
+_PAULI_PRODUCTS: Tuple[Tuple[Tuple[Pauli, complex], ...], ...] = (
+    ((Pauli.I, 1.0), (Pauli.Z, 1.0j), (Pauli.Y, -1.0j), (Pauli.X, 1.0)),
+    ((Pauli.Z, -1.0j), (Pauli.I, 1.0), (Pauli.X, 1.0j), (Pauli.Y, 1.0)),
+    ((Pauli.Y, 1.0j), (Pauli.X, -1.0j), (Pauli.I, 1.0), (Pauli.Z, 1.0)),
+    ((Pauli.X, 1.0), (Pauli.Y, 1.0), (Pauli.Z, 1.0), (Pauli.I, 1.0)),
+)
+_PAULI_PRODUCT_CODES = np.array(
+    [[pauli.value for pauli, _ in row] for row in _PAULI_PRODUCTS], dtype=np.int8
+)
+_PAULI_PRODUCT_PHASES = np.array(
+    [[phase for _, phase in row] for row in _PAULI_PRODUCTS], dtype=np.complex128
+)
+
+# X and Z bits of the single-qubit operators, indexed by `Pauli` value (X=0, Y=1, Z=2, I=3).
+_PAULI_CODE_X_BITS = np.array([1, 1, 0, 0], dtype=np.int64)
+_PAULI_CODE_Z_BITS = np.array([0, 1, 1, 0], dtype=np.int64)
+# `Pauli` value of each ASCII character of a Pauli string, -1 if invalid.
+_PAULI_CHAR_CODES = np.full(256, -1, dtype=np.int64)
+_PAULI_CHAR_CODES[[ord(pauli.name) for pauli in Pauli]] = [pauli.value for pauli in Pauli]
+
+_PAULI_TO_BITS = {Pauli.X: (1, 0), Pauli.Y: (1, 1), Pauli.Z: (0, 1), Pauli.I: (0, 0)}
+_BITS_TO_PAULI = (Pauli.I, Pauli.X, Pauli.Z, Pauli.Y)  # indexed by x + 2 * z
+
+
+def _operators_to_masks(
+    operators: tuple[PauliOperator, ...],
+) -> tuple[int, int, complex]:
+    """
+    Converts a product of Pauli operators into integer x/z masks and a phase factor.
 
-    for qubit_index, _pauli_list in paulis.items():
-        if len(_pauli_list) == 1:
-            continue
-        else:
-            op = _pauli_list[0]
-            for i in range(1, len(_pauli_list)):
-                op, _phase = multiply_pauli_same_qubit(op, _pauli_list[i])
-                phase *= _phase
+    Operators on distinct qubits commute, so the input order only matters when a qubit
+    appears more than once; only then is the product simplified.
+
+    Example:
+        >>> _operators_to_masks((PauliOperator(Pauli.X, 0), PauliOperator(Pauli.Y, 2)))
+        (5, 4, 1.0)
+    """
+    phase = 1.0
+    if len({op.index for op in operators}) != len(operators):
+        operators, phase = simplify_pauliop_terms(operators)
+    x = z = 0
+    for op in operators:
+        x_bit, z_bit = _PAULI_TO_BITS[op.pauli]
+        x |= x_bit << int(op.index)
+        z |= z_bit << int(op.index)
+    return x, z, phase
+
+
+def _support_of_masks(x: np.ndarray, z: np.ndarray) -> int:
+    """Returns the union of the x/z masks of all rows as a Python integer."""
+    if len(x) == 0:
+        return 0
+    support = np.bitwise_or.reduce(x | z, axis=0).astype("<u8")
+    return int.from_bytes(support.tobytes(), "little")
 
-            paulis[qubit_index] = [op]
 
-    pauli_list = []
+def _as_scalar(value: complex) -> Union[float, complex]:
+    """Drops a vanishing imaginary part so that real coefficients stay floats."""
+    value = complex(value)
+    return value.real if value.imag == 0 else value
 
-    for _pauli_list in paulis.values():
-        if _pauli_list[0].pauli != Pauli.I:
-            pauli_list.append(_pauli_list[0])
 
-    return tuple(pauli_list), phase
+def _terms_to_masks(
+    terms: Iterable[Tuple[Tuple[PauliOperator, ...], complex]],
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Converts (operators, coefficient) pairs into x/z masks and a coefficient array.
+
+    Terms proportional to the identity are kept as rows with both masks zero.
+    """
+    xs, zs, coeffs = [], [], []
+    for term, coeff in terms:
+        x, z, phase = _operators_to_masks(tuple(term))
+        xs.append(x)
+        zs.append(z)
+        coeffs.append(phase * coeff)
+    words = num_words(max((max(x.bit_length(), z.bit_length()) for x, z in zip(xs, zs)), default=0))
+    return (
+        ints_to_masks(xs, words),
+        ints_to_masks(zs, words),
+        np.array(coeffs, dtype=np.complex128),
+    )
+
+
+def _masks_to_terms(
+    x: np.ndarray, z: np.ndarray, coeffs: np.ndarray
+) -> Dict[Tuple[PauliOperator, ...], complex]:
+    """
+    Builds the dictionary representation of unique, non-identity packed terms.
+
+    Operators in each term are sorted by qubit index, as in `Hamiltonian.add_term`.
+    Coefficients with a vanishing imaginary part are returned as floats.
+    """
+    x = np.unpackbits(np.ascontiguousarray(x).view(np.uint8), axis=1, bitorder="little")
+    z = np.unpackbits(np.ascontiguousarray(z).view(np.uint8), axis=1, bitorder="little")
+    rows, qubits = np.nonzero(x | z)
+    codes = x[rows, qubits] + 2 * z[rows, qubits]
+    # Only the distinct (qubit, code) pairs are looked up; the rest reuse the interned operators.
+    keys, inverse = np.unique(qubits * 4 + codes, return_inverse=True)
+    distinct = [
+        PauliOperator(_BITS_TO_PAULI[key % 4], key // 4) for key in keys.tolist()
+    ]
+    ops = [distinct[i] for i in inverse.ravel().tolist()]
+    bounds = np.cumsum(np.bincount(rows, minlength=len(coeffs))).tolist()
+
+    terms = {}
+    start = 0
+    for end, coeff in zip(bounds, np.asarray(coeffs).tolist()):
+        terms[tuple(ops[start:end])] = coeff.real if coeff.imag == 0 else coeff
+        start = end
+    return terms
+
+
+def _table_to_terms(
+    table: SymplecticTerms,
+) -> Dict[Tuple[PauliOperator, ...], complex]:
+    """Builds the dictionary representation of the packed terms."""
+    return _masks_to_terms(table.x, table.z, table.coeffs)
@@ -201,6 +201,7 @@ class LocalSearch:
         initial_state: np.ndarray,
         max_iter: int = -1,
         local_search_method: str = "best_improvement",
+        decompose: bool = False,
     ) -> jm.experimental.SampleSet:
         """
         Runs the local search algorithm until convergence or until a maximum number of iterations.
@@ -210,6 +211,9 @@ class LocalSearch:
             max_iter (int): Maximum number of iterations to run the local search. Defaults to -1 (no limit).
             local_search_method (str): Method of local search ("best_improvement" or "first_improvement").
                 Defaults to "best_improvement".
+            decompose (bool): If True, the search runs separately on each connected component of the
+                Ising model (see `IsingModel.decompose`), with ``max_iter`` applying to each component.
+                Defaults to False.
 
         Returns:
             jm.experimental.SampleSet: The decoded solution after the local search.
@@ -224,12 +228,25 @@ class LocalSearch:
             )
 
         method = method_map[local_search_method]
-        result = self._run_local_search(method, initial_state, max_iter)
+        if decompose:
+            result = initial_state.copy()
+            for spins, sub_ising in zip(
+                self.ising.connected_components(), self.ising.decompose()
+            ):
+                result[spins] = self._run_local_search(
+                    method, initial_state[spins], max_iter, sub_ising
+                )
+        else:
+            result = self._run_local_search(method, initial_state, max_iter)
         decoded_sampleset = self.decode(result)
         return decoded_sampleset
 
     def _run_local_search(
-        self, method: Callable, initial_state: np.ndarray, max_iter: int
+        self,
+        method: Callable,
+        initial_state: np.ndarray,
+        max_iter: int,
+        ising: Optional[IsingModel] = None,
     ) -> np.ndarray:
         """
         Internal method to perform the local search on the Ising model.
@@ -238,13 +255,14 @@ class LocalSearch:
             method (Callable): The local search method (either best or first improvement).
             initial_state (np.ndarray): The initial state to start the search from.
             max_iter (int): The maximum number of iterations for the local search.
+            ising (Optional[IsingModel]): The Ising model to search. Defaults to `self.ising`.
 
         Returns:
             np.ndarray: The final state after convergence or reaching the iteration limit.
         """
         current_state = initial_state.copy()
         ising_matrix = IsingMatrix()
-        ising_matrix.to_ising_matrix(self.ising)
+        ising_matrix.to_ising_matrix(self.ising if ising is None else ising)
         N = len(current_state)
         counter = 0
 
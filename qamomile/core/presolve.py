@@ -0,0 +1,227 @@
+"""
+qamomile/core/presolve.py
+
+This module provides a classical presolve for Ising models that removes spins whose optimal
+value can be decided before any quantum computation, so fewer qubits and shallower circuits
+are needed.
+
+Two reductions are applied until neither applies any more (energies are minimized):
+
+- Dominant fields: if :math:`|h_i| > \\sum_j |J_{ij}|`, the spin is fixed to
+  :math:`z_i = -\\mathrm{sign}(h_i)` whatever its neighbours are, and its couplings are folded
+  into the fields of the neighbours.
+- Degree-one elimination: a spin coupled to a single spin :math:`j` takes the value
+  :math:`z_i = -\\mathrm{sign}(J_{ij} z_j + h_i)` in an optimal solution, so it is replaced by a
+  field on :math:`j` and a constant that reproduce :math:`\\min_{z_i} z_i (J_{ij} z_j + h_i)`.
+  Chains of such spins are removed one after the other.
+
+Both keep the minimum: for every state of the reduced model, the reconstructed state of the
+original model has the same energy, and it is optimal for the removed spins.
+
+Key Components:
+- presolve_ising: Reduce an IsingModel and record how to reconstruct the removed spins.
+- PresolveResult: The reduced model with the reconstruction of full states.
+
+Usage:
+    from qamomile.core.presolve import presolve_ising
+
+    result = presolve_ising(ising)
+    reduced = result.ising  # solve this one
+    full_bits = result.reconstruct_bits(reduced_bits)
+"""
+
+from __future__ import annotations
+
+import dataclasses
+
+import numpy as np
+
+from qamomile.core.ising_qubo import IsingModel
+
+
+@dataclasses.dataclass
+class PresolveResult:
+    """
+    The result of `presolve_ising`.
+
+    The removed spins are recorded in removal order: spin ``removed[k]`` takes the value
+    :math:`-\\mathrm{sign}(c_k z_{p_k} + f_k)` with ``c_k = couplings[k]``, ``p_k = partners[k]`` and
+    ``f_k = fields[k]`` (+1 on a tie), where ``partners[k]`` is -1 for a fixed spin.
+
+    Attributes:
+        ising (IsingModel): The reduced model. Its spins are numbered 0, 1, ... in the order of
+            ``kept``, and its ``index_map`` maps them to the indices of the original model's QUBO.
+        original (IsingModel): The model before presolve.
+        kept (np.ndarray): The original indices of the spins of the reduced model.
+        removed (np.ndarray): The original indices of the removed spins.
+        partners (np.ndarray): The spin each removed spin depends on, or -1.
+        couplings (np.ndarray): The coupling to the partner.
+        fields (np.ndarray): The field of each removed spin when it was removed.
+    """
+
+    ising: IsingModel
+    original: IsingModel
+    kept: np.ndarray
+    removed: np.ndarray
+    partners: np.ndarray
+    couplings: np.ndarray
+    fields: np.ndarray
+
+    def reconstruct_spins(self, spins: np.ndarray) -> np.ndarray:
+        """
+        Extends states of the reduced model to states of the original model.
+
+        Args:
+            spins (np.ndarray): Spin values in {-1, 1} of the reduced model, with shape (S, len(kept))
+                or (len(kept),).
+
+        Returns:
+            np.ndarray: Spin values of the original model, with shape (S, original.num_bits())
+                or (original.num_bits(),).
+        """
+        spins = np.asarray(spins)
+        single = spins.ndim == 1
+        spins = spins.reshape(1 if single else len(spins), len(self.kept))
+        full = np.ones((len(spins), self.original.num_bits()), dtype=np.int8)
+        full[:, self.kept] = spins
+        # Later removals only depend on spins that were still present, so undo them first.
+        for k in range(len(self.removed) - 1, -1, -1):
+            local_field = np.full(len(full), self.fields[k])
+            if self.partners[k] >= 0:
+                local_field += self.couplings[k] * full[:, self.partners[k]]
+            full[:, self.removed[k]] = np.where(local_field > 0, -1, 1)
+        return full[0] if single else full
+
+    def reconstruct_bits(self, bits: np.ndarray) -> np.ndarray:
+        """
+        Same as `reconstruct_spins` for bits, where bit 1 is spin -1.
+
+        Args:
+            bits (np.ndarray): Bits of the reduced model, with shape (S, len(kept)) or (len(kept),).
+
+        Returns:
+            np.ndarray: Bits of the original model.
+        """
+        spins = 1 - 2 * np.asarray(bits, dtype=np.int8)
+        return ((1 - self.reconstruct_spins(spins)) // 2).astype(np.uint8)
+
+
+def presolve_ising(
+    ising: IsingModel,
+    fix_dominant: bool = True,
+    eliminate_degree_one: bool = True,
+) -> PresolveResult:
+    """
+    Removes the spins of an Ising model whose optimal value does not need a solver.
+
+    Every spin is visited once, and again each time one of its neighbours is removed, so the
+    cost is linear in the number of terms for bounded degrees.
+
+    Args:
+        ising (IsingModel): The model to reduce.
+        fix_dominant (bool): Fix spins whose field dominates the sum of their couplings. Defaults to True.
+        eliminate_degree_one (bool): Eliminate spins with a single coupling. Defaults to True.
+
+    Returns:
+        PresolveResult: The reduced model and its reconstruction.
+
+    Example:
+        >>> ising = IsingModel({(0, 1): 1.0, (1, 2): 1.0, (2, 3): -1.0, (3, 1): 0.5}, {0: 3.0}, 0.0)
+        >>> result = presolve_ising(ising)
+        >>> result.kept.tolist(), result.removed.tolist()
+        ([1, 2, 3], [0])
+        >>> result.ising
+        IsingModel(quad={(0, 1): 1.0, (1, 2): -1.0, (2, 0): 0.5}, linear={0: -1.0, 1: 0.0, 2: 0.0}, constant=-3.0, index_map={0: 1, 1: 2, 2: 3})
+        >>> result.reconstruct_spins([1, 1, 1]).tolist()
+        [-1, 1, 1, 1]
+    """
+    num_bits = ising.num_bits()
+    fields = np.bincount(
+        ising.linear_indices, weights=ising.linear_values, minlength=num_bits
+    ).tolist()
+    neighbours: list[dict[int, float]] = [{} for _ in range(num_bits)]
+    for (i, j), value in zip(ising.quad_indices.tolist(), ising.quad_values.tolist()):
+        if i == j:
+            continue
+        neighbours[i][j] = neighbours[i].get(j, 0.0) + value
+        neighbours[j][i] = neighbours[j].get(i, 0.0) + value
+
+    present = np.zeros(num_bits, dtype=bool)
+    present[ising.quad_indices.ravel()] = True
+    present[ising.linear_indices] = True
+    alive = present.copy()
+    constant = 0.0
+    removed, partners, couplings, removed_fields = [], [], [], []
+
+    def remove(i: int, partner: int, coupling: float) -> None:
+        removed.append(i)
+        partners.append(partner)
+        couplings.append(coupling)
+        removed_fields.append(fields[i])
+        alive[i] = False
+
+    queue = list(np.flatnonzero(present)[::-1].tolist())
+    while queue:
+        i = queue.pop()
+        if not alive[i]:
+            continue
+        h = fields[i]
+        # A spin without couplings is dominated by its field, even a zero one.
+        if fix_dominant and (
+            not neighbours[i] or abs(h) > sum(abs(v) for v in neighbours[i].values())
+        ):
+            spin = -1.0 if h > 0 else 1.0
+            constant += h * spin
+            for j, value in neighbours[i].items():
+                fields[j] += value * spin
+                del neighbours[j][i]
+                queue.append(j)
+            neighbours[i] = {}
+            remove(i, -1, 0.0)
+        elif eliminate_degree_one and len(neighbours[i]) == 1:
+            ((j, value),) = neighbours[i].items()
+            # min over z_i of z_i (value * z_j + h) is a + b z_j for z_j = +-1.
+            plus, minus = -abs(value + h), -abs(h - value)
+            constant += (plus + minus) / 2
+            fields[j] += (plus - minus) / 2
+            del neighbours[j][i]
+            neighbours[i] = {}
+            queue.append(j)
+            remove(i, j, value)
+
+    kept = np.flatnonzero(alive)
+    new_index = np.full(num_bits, -1, dtype=np.int64)
+    new_index[kept] = np.arange(len(kept))
+
+    quad_indices = ising.quad_indices
+    keep_quad = (
+        alive[quad_indices[:, 0]]
+        & alive[quad_indices[:, 1]]
+        & (quad_indices[:, 0] != quad_indices[:, 1])
+        if len(quad_indices)
+        else np.zeros(0, dtype=bool)
+    )
+    # Diagonal couplings z_i z_i are constants.
+    diagonal = quad_indices[:, 0] == quad_indices[:, 1]
+    constant += float(ising.quad_values[diagonal].sum())
+
+    # Every kept spin gets a (possibly zero) field, so the reduced model has len(kept) spins.
+    kept_fields = np.array(fields, dtype=np.float64)[kept]
+
+    reduced = IsingModel.from_arrays(
+        new_index[quad_indices[keep_quad]],
+        ising.quad_values[keep_quad],
+        np.arange(len(kept)),
+        kept_fields,
+        ising.constant + constant,
+        {new: ising.ising2qubo_index(old) for new, old in enumerate(kept.tolist())},
+    )
+    return PresolveResult(
+        ising=reduced,
+        original=ising,
+        kept=kept,
+        removed=np.array(removed, dtype=np.int64),
+        partners=np.array(partners, dtype=np.int64),
+        couplings=np.array(couplings, dtype=np.float64),
+        fields=np.array(removed_fields, dtype=np.float64),
+    )
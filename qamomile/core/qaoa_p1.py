@@ -0,0 +1,354 @@
+r"""
+qamomile/core/qaoa_p1.py
+
+This module evaluates the depth-1 QAOA expectation value of an Ising model in closed form,
+without simulating the state, so the two parameters can be searched on problems with thousands
+of spins in milliseconds and used as initial points of deeper circuits.
+
+For the state :math:`e^{-i\beta \sum_i X_i} e^{-i\gamma H_P} |+\rangle^{\otimes n}` of
+``QAOAConverter.get_qaoa_ansatz(p=1)`` with
+:math:`H_P = \sum_i h_i Z_i + \sum_{i<j} J_{ij} Z_i Z_j + C`, conjugating the Pauli operators
+through the two layers gives, with :math:`c_{ik} = \cos 2\gamma J_{ik}`,
+
+.. math::
+    \langle Z_i \rangle = \sin 2\beta \, \sin 2\gamma h_i \prod_{k \ne i} c_{ik}
+
+.. math::
+    \langle Z_i Z_j \rangle = \tfrac{1}{2} \sin 4\beta \, (\langle Y_i Z_j \rangle_\gamma + \langle Z_i Y_j \rangle_\gamma)
+        + \sin^2 2\beta \, \langle Y_i Y_j \rangle_\gamma
+
+where :math:`\langle Y_i Z_j \rangle_\gamma = \cos 2\gamma h_i \sin 2\gamma J_{ij} \prod_{k \ne i, j} c_{ik}`
+and
+
+.. math::
+    \langle Y_i Y_j \rangle_\gamma = \tfrac{1}{2} \Big[
+        \cos 2\gamma (h_i - h_j) \prod_{k \ne i, j} \cos 2\gamma (J_{ik} - J_{jk})
+        - \cos 2\gamma (h_i + h_j) \prod_{k \ne i, j} \cos 2\gamma (J_{ik} + J_{jk}) \Big].
+
+The products run over neighbours only, and the last ones differ from the products of the
+neighbours of i and j only at common neighbours (triangles), so the cost is linear in the number
+of couplings and triangles. Products are accumulated as logarithms of absolute values and signs
+to avoid underflow on high-degree spins, and the expectation is
+:math:`C + \sin 2\beta\, a(\gamma) + \tfrac{1}{2}\sin 4\beta\, b(\gamma) + \sin^2 2\beta\, c(\gamma)`,
+so a grid over :math:`\beta` costs nothing beyond the grid over :math:`\gamma`.
+
+Key Components:
+- QAOAP1Evaluator: Expectation values, gradients and grids of depth-1 QAOA.
+
+Usage:
+    evaluator = qaoa_converter.get_p1_evaluator()
+    energies = evaluator.grid(np.linspace(0, np.pi, 64), np.linspace(0, np.pi / 2, 32))
+"""
+
+from __future__ import annotations
+
+import typing as typ
+
+import numpy as np
+import scipy.sparse
+
+from qamomile.core.ising_qubo import IsingModel
+
+# Number of array elements processed at once; grids of gammas are split into chunks below it.
+_CHUNK_ELEMENTS = 1 << 22
+
+# Below this |cos|, dividing a factor out of a product cancels its huge logarithmic derivative,
+# so the derivatives by gamma are taken by central differences with step `_GRADIENT_STEP`.
+_DEGENERATE_COS = 1e-6
+_GRADIENT_STEP = 1e-6
+
+
+def _log_cos(angles: np.ndarray, rates: np.ndarray) -> tuple[np.ndarray, ...]:
+    """
+    Returns the logarithm of the absolute value, the negativity and the derivative of the
+    logarithm of ``cos(angles)``, where ``rates`` is the derivative of ``angles``.
+    """
+    cos = np.cos(angles)
+    # A factor of exactly zero is clamped, so that dividing it out of a product is not -inf + inf.
+    log_abs = np.log(np.maximum(np.abs(cos), np.finfo(np.float64).tiny))
+    return log_abs, (cos < 0).astype(np.float64), -rates * np.tan(angles)
+
+
+def _from_log(log_abs: np.ndarray, negatives: np.ndarray) -> np.ndarray:
+    """Returns the products whose logarithms of absolute values and numbers of negative factors are given."""
+    return np.where(np.round(negatives) % 2 == 1, -1.0, 1.0) * np.exp(log_abs)
+
+
+class QAOAP1Evaluator:
+    """
+    Closed-form expectation value of depth-1 QAOA on an Ising model.
+
+    The structure of the model (couplings in both directions and triangles) is prepared once, and
+    every method is vectorized over parameters.
+
+    Attributes:
+        ising (IsingModel): The model.
+
+    Example:
+        >>> evaluator = QAOAP1Evaluator(IsingModel({(0, 1): 1.0}, {}, 0.0))
+        >>> round(float(evaluator.expectation(np.pi / 8, np.pi / 8)), 6)
+        0.707107
+    """
+
+    def __init__(self, ising: IsingModel):
+        """
+        Prepares the couplings, fields and triangles of the model.
+
+        Args:
+            ising (IsingModel): The model, with spins 0, ..., n - 1.
+        """
+        self.ising = ising
+        num_spins = ising.num_bits()
+        self._fields = np.bincount(
+            ising.linear_indices, weights=ising.linear_values, minlength=num_spins
+        )
+
+        i, j = ising.quad_indices.T
+        diagonal = i == j
+        # z_i z_i = 1, so diagonal couplings are constants.
+        self._constant = float(ising.constant + ising.quad_values[diagonal].sum())
+        couplings = scipy.sparse.coo_matrix(
+            (
+                ising.quad_values[~diagonal],
+                (np.minimum(i, j)[~diagonal], np.maximum(i, j)[~diagonal]),
+            ),
+            shape=(num_spins, num_spins),
+        ).tocsr()
+        couplings.sum_duplicates()
+        couplings.eliminate_zeros()
+        upper = couplings.tocoo()
+        num_edges = upper.nnz
+
+        # Half-edge d < num_edges is i -> j with i < j, and d + num_edges is j -> i.
+        self._source = np.concatenate([upper.row, upper.col]).astype(np.int64)
+        self._target = np.concatenate([upper.col, upper.row]).astype(np.int64)
+        self._couplings = np.concatenate([upper.data, upper.data])
+        self._num_edges = num_edges
+        self._incidence = scipy.sparse.csr_matrix(
+            (
+                np.ones(2 * num_edges),
+                (np.arange(2 * num_edges), self._source),
+            ),
+            shape=(2 * num_edges, num_spins),
+        )
+        self._triangle_edges, self._triangle_ik, self._triangle_jk = self._triangles(
+            num_spins
+        )
+        self._triangle_incidence = scipy.sparse.csr_matrix(
+            (
+                np.ones(len(self._triangle_edges)),
+                (np.arange(len(self._triangle_edges)), self._triangle_edges),
+            ),
+            shape=(len(self._triangle_edges), num_edges),
+        )
+
+    def _triangles(self, num_spins: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns, for every common neighbour k of the spins of an edge i < j, the edge and the
+        half-edges i -> k and j -> k.
+        """
+        keys = self._source * num_spins + self._target
+        order = np.argsort(keys)
+        sorted_keys = keys[order]
+
+        def half_edge(source: np.ndarray, target: np.ndarray) -> np.ndarray:
+            return order[np.searchsorted(sorted_keys, source * num_spins + target)]
+
+        by_source = np.argsort(self._source, kind="stable")
+        bounds = np.searchsorted(self._source[by_source], np.arange(num_spins + 1))
+        firsts, seconds, centers = [], [], []
+        for k in range(num_spins):
+            neighbours = np.sort(self._target[by_source[bounds[k] : bounds[k + 1]]])
+            if len(neighbours) < 2:
+                continue
+            a, b = np.triu_indices(len(neighbours), 1)
+            firsts.append(neighbours[a])
+            seconds.append(neighbours[b])
+            centers.append(np.full(len(a), k))
+        if not centers:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty, empty
+
+        first, second, center = map(np.concatenate, (firsts, seconds, centers))
+        wedge_keys = first * num_spins + second
+        position = np.minimum(np.searchsorted(sorted_keys, wedge_keys), len(keys) - 1)
+        closed = sorted_keys[position] == wedge_keys
+        first, second, center = first[closed], second[closed], center[closed]
+        return (
+            half_edge(first, second),
+            half_edge(first, center),
+            half_edge(second, center),
+        )
+
+    def _coefficients(self, gammas: np.ndarray) -> tuple[np.ndarray, ...]:
+        """
+        Returns a, b, c of the expectation and their derivatives by gamma, with the shape of
+        ``gammas`` (G,).
+        """
+        size = max(1, 2 * self._num_edges + 2 * len(self._triangle_edges))
+        chunk = max(1, _CHUNK_ELEMENTS // size)
+        parts = [
+            self._coefficients_chunk(gammas[start : start + chunk])
+            for start in range(0, len(gammas), chunk)
+        ]
+        if not parts:
+            return tuple(np.zeros(0) for _ in range(6))
+        return tuple(np.concatenate(values) for values in zip(*parts))
+
+    def _coefficients_chunk(
+        self, gammas: np.ndarray, central_differences: bool = True
+    ) -> tuple[np.ndarray, ...]:
+        theta = 2 * gammas[:, None]
+        h = self._fields
+        J = self._couplings
+        source, target = self._source, self._target
+
+        # Products over the neighbours of every spin of cos(2 gamma J_ik).
+        log_c, neg_c, dlog_c = _log_cos(theta * J, 2 * J)
+        smallest_log = np.min(log_c, axis=1, initial=0.0)
+        node_log = np.asarray(log_c @ self._incidence)
+        node_neg = np.asarray(neg_c @ self._incidence)
+        node_dlog = np.asarray(dlog_c @ self._incidence)
+
+        # <Z_i> / sin(2 beta) = sin(2 gamma h_i) prod_k c_ik
+        node_product = _from_log(node_log, node_neg)
+        sin_h, cos_h = np.sin(theta * h), np.cos(theta * h)
+        z = sin_h * node_product
+        dz = (2 * h * cos_h + sin_h * node_dlog) * node_product
+        a, da = z @ h, dz @ h
+
+        # <Y_i Z_j> = cos(2 gamma h_i) sin(2 gamma J_ij) prod_{k != j} c_ik for half-edge i -> j
+        excl_log = node_log[:, source] - log_c
+        excl_neg = node_neg[:, source] - neg_c
+        excl_dlog = node_dlog[:, source] - dlog_c
+        excl = _from_log(excl_log, excl_neg)
+        sin_j, cos_j = np.sin(theta * J), np.cos(theta * J)
+        lead = cos_h[:, source] * sin_j
+        dlead = (
+            -2 * h[source] * sin_h[:, source] * sin_j
+            + cos_h[:, source] * 2 * J * cos_j
+        )
+        yz = lead * excl
+        dyz = (dlead + lead * excl_dlog) * excl
+        b, db = yz @ J, dyz @ J
+
+        # <Y_i Y_j> from the products over the neighbours of i but j and of j but i, corrected
+        # at common neighbours k by cos(2 gamma (J_ik +- J_jk)) / (c_ik c_jk).
+        num_edges = self._num_edges
+        forward, backward = slice(0, num_edges), slice(num_edges, 2 * num_edges)
+        pair_log = excl_log[:, forward] + excl_log[:, backward]
+        pair_neg = excl_neg[:, forward] + excl_neg[:, backward]
+        pair_dlog = excl_dlog[:, forward] + excl_dlog[:, backward]
+        ik, jk = self._triangle_ik, self._triangle_jk
+        i, j = source[forward], target[forward]
+        c = np.zeros(len(gammas))
+        dc = np.zeros(len(gammas))
+        for sign in (-1.0, 1.0):
+            combined = J[ik] + sign * J[jk]
+            log_t, neg_t, dlog_t = _log_cos(theta * combined, 2 * combined)
+            smallest_log = np.minimum(smallest_log, np.min(log_t, axis=1, initial=0.0))
+            corrections = (
+                (log_t - log_c[:, ik] - log_c[:, jk]) @ self._triangle_incidence,
+                (neg_t - neg_c[:, ik] - neg_c[:, jk]) @ self._triangle_incidence,
+                (dlog_t - dlog_c[:, ik] - dlog_c[:, jk]) @ self._triangle_incidence,
+            )
+            product = _from_log(
+                pair_log + np.asarray(corrections[0]), pair_neg + np.asarray(corrections[1])
+            )
+            product_dlog = pair_dlog + np.asarray(corrections[2])
+            fields = h[i] + sign * h[j]
+            # The plus sign enters with a minus: <Y_i Y_j> = (P_- cos(h_i - h_j) - P_+ cos(h_i + h_j)) / 2
+            weight = -0.5 * sign
+            cos_f, sin_f = np.cos(theta * fields), np.sin(theta * fields)
+            yy = weight * cos_f * product
+            dyy = weight * (-2 * fields * sin_f + cos_f * product_dlog) * product
+            c += yy @ J[forward]
+            dc += dyy @ J[forward]
+
+        degenerate = smallest_log < np.log(_DEGENERATE_COS)
+        if central_differences and degenerate.any():
+            shifted = gammas[degenerate]
+            plus = self._coefficients_chunk(shifted + _GRADIENT_STEP, False)
+            minus = self._coefficients_chunk(shifted - _GRADIENT_STEP, False)
+            for derivative, above, below in zip((da, db, dc), plus, minus):
+                derivative[degenerate] = (above - below) / (2 * _GRADIENT_STEP)
+        return a, b, c, da, db, dc
+
+    def expectation(
+        self, gammas: typ.Union[float, np.ndarray], betas: typ.Union[float, np.ndarray]
+    ) -> np.ndarray:
+        """
+        Returns the expectation value of the cost Hamiltonian, including its constant.
+
+        Args:
+            gammas (float | np.ndarray): The cost angles.
+            betas (float | np.ndarray): The mixer angles, broadcast against ``gammas``.
+
+        Returns:
+            np.ndarray: The expectation values with the broadcast shape.
+        """
+        return self.expectation_and_gradient(gammas, betas)[0]
+
+    def expectation_and_gradient(
+        self, gammas: typ.Union[float, np.ndarray], betas: typ.Union[float, np.ndarray]
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns the expectation value and its derivatives by gamma and beta.
+
+        Where some factor cos(2 gamma J) of the products is close to zero, the derivatives by
+        gamma are central differences of the closed form instead.
+
+        Args:
+            gammas (float | np.ndarray): The cost angles.
+            betas (float | np.ndarray): The mixer angles, broadcast against ``gammas``.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, np.ndarray]: The expectation values and their derivatives
+                by gamma and by beta, with the broadcast shape.
+        """
+        gammas, betas = np.broadcast_arrays(
+            np.asarray(gammas, dtype=np.float64), np.asarray(betas, dtype=np.float64)
+        )
+        a, b, c, da, db, dc = self._coefficients(gammas.ravel())
+        beta = betas.ravel()
+        sin2, half_sin4, sin2_squared = (
+            np.sin(2 * beta),
+            0.5 * np.sin(4 * beta),
+            np.sin(2 * beta) ** 2,
+        )
+        energy = self._constant + sin2 * a + half_sin4 * b + sin2_squared * c
+        d_gamma = sin2 * da + half_sin4 * db + sin2_squared * dc
+        d_beta = 2 * np.cos(2 * beta) * a + 2 * np.cos(4 * beta) * b + 2 * np.sin(4 * beta) * c
+        shape = gammas.shape
+        return energy.reshape(shape), d_gamma.reshape(shape), d_beta.reshape(shape)
+
+    def grid(self, gammas: np.ndarray, betas: np.ndarray) -> np.ndarray:
+        """
+        Returns the expectation values on the grid ``gammas`` x ``betas``.
+
+        The expensive part only depends on gamma, so the cost grows with ``len(gammas)``.
+
+        Args:
+            gammas (np.ndarray): The cost angles (G,).
+            betas (np.ndarray): The mixer angles (B,).
+
+        Returns:
+            np.ndarray: The expectation values with shape (G, B).
+
+        Example:
+            >>> evaluator = QAOAP1Evaluator(IsingModel({(0, 1): 1.0, (1, 2): 1.0}, {0: 0.5}, 0.0))
+            >>> gammas, betas = np.linspace(0, np.pi, 33), np.linspace(0, np.pi / 2, 17)
+            >>> energies = evaluator.grid(gammas, betas)
+            >>> g, b = np.unravel_index(np.argmin(energies), energies.shape)
+            >>> bool(energies[g, b] < 0)
+            True
+        """
+        gammas = np.asarray(gammas, dtype=np.float64).ravel()
+        betas = np.asarray(betas, dtype=np.float64).ravel()
+        a, b, c = self._coefficients(gammas)[:3]
+        return (
+            self._constant
+            + np.outer(a, np.sin(2 * betas))
+            + np.outer(b, 0.5 * np.sin(4 * betas))
+            + np.outer(c, np.sin(2 * betas) ** 2)
+        )
@@ -0,0 +1,255 @@
+r"""
+qamomile/core/qaoa_simulator.py
+
+This module provides an exact statevector simulator of the QAOA ansatz written with NumPy, for
+evaluating many parameter sets without transpiling circuits to a quantum SDK.
+
+The cost Hamiltonian of an Ising model is diagonal in the computational basis, so its diagonal
+:math:`E(z)` over all :math:`2^n` states is computed once, and a cost layer
+:math:`e^{-i\gamma H_P}` is one elementwise phase multiplication. The mixer
+:math:`e^{-i\beta \sum_i X_i}` is a product of 2x2 rotations, applied a few qubits at a time
+as one matrix product over an axis of the state reshaped to a tensor. The state uses :math:`2^n` complex amplitudes, e.g. 1 GiB in
+double precision or 512 MiB in single precision for 26 qubits.
+
+The simulated circuit is the one of ``QAOAConverter.get_qaoa_ansatz``: Hadamard gates, then for
+each layer the cost rotations ``RZ(2 h_i gamma)`` and ``RZZ(2 J_ij gamma)`` (multi-qubit Z
+rotations for higher-order terms) and the mixer ``RX(2 beta)`` on every qubit. Qubit i is spin i
+and bit i of the basis state index, and bit 1 is spin -1.
+
+Key Components:
+- cost_diagonal: The energies of all basis states of an Ising model.
+- QAOASimulator: Statevectors, expectation values and samples of the QAOA ansatz.
+
+Usage:
+    simulator = qaoa_converter.get_qaoa_simulator()
+    energy = simulator.expectation(betas=[0.3], gammas=[0.7])
+    sampleset = qaoa_converter.decode_bits_to_sampleset(
+        simulator.sample([0.3], [0.7], shots=1000, seed=0)
+    )
+"""
+
+from __future__ import annotations
+
+import typing as typ
+
+import numpy as np
+
+from qamomile.core.bitssample import BitsSampleSet
+from qamomile.core.ising_qubo import HUBOIsingModel, IsingModel
+from qamomile.core.symplectic import diagonal_values
+
+
+def cost_diagonal(ising: typ.Union[IsingModel, HUBOIsingModel]) -> np.ndarray:
+    """
+    Computes the energy of every basis state of an Ising model, including the constant.
+
+    Every term is the Z string of its spins, so the diagonal is
+    :func:`qamomile.core.symplectic.diagonal_values` of the bit masks of the terms: one fast
+    Walsh-Hadamard transform of the coefficients binned by mask, chunk by chunk.
+
+    Args:
+        ising (IsingModel | HUBOIsingModel): The model, with spins 0, ..., n - 1.
+
+    Returns:
+        np.ndarray: The energies with shape (2**n,), where bit i of the index is 1 for spin -1.
+
+    Example:
+        >>> cost_diagonal(IsingModel({(0, 1): 2.0}, {0: 1.0}, 0.5)).tolist()
+        [3.5, -2.5, -0.5, 1.5]
+    """
+    num_qubits = ising.num_bits()
+    if isinstance(ising, HUBOIsingModel):
+        masks = np.zeros(len(ising.values), dtype=np.int64)
+        if len(ising.values):
+            masks = np.bitwise_or.reduceat(
+                np.left_shift(1, ising.spin_indices.astype(np.int64)),
+                ising.term_ptr[:-1],
+            )
+        values = ising.values
+    else:
+        spins = np.left_shift(1, ising.quad_indices.astype(np.int64))
+        # z_i z_i = 1, so a diagonal coupling has mask 0 and is a constant.
+        masks = np.concatenate(
+            [
+                spins[:, 0] ^ spins[:, 1],
+                np.left_shift(1, ising.linear_indices.astype(np.int64)),
+            ]
+        )
+        values = np.concatenate([ising.quad_values, ising.linear_values])
+    # The constant is the term with mask 0.
+    return diagonal_values(
+        np.append(masks, 0),
+        np.append(values, ising.constant).astype(np.float64),
+        num_qubits,
+        np.empty(2**num_qubits),
+        _DIAGONAL_CHUNK_QUBITS,
+    )
+
+
+# Base-2 logarithm of the number of energies computed at once by `cost_diagonal`.
+_DIAGONAL_CHUNK_QUBITS = 20
+
+# Number of qubits whose mixer rotations are applied together as one Kronecker product matrix.
+_MIXER_BLOCK = 4
+
+
+class QAOASimulator:
+    """
+    Exact statevector simulator of the QAOA ansatz of an Ising model.
+
+    Attributes:
+        ising (IsingModel | HUBOIsingModel): The simulated model.
+        num_qubits (int): The number of qubits, ``ising.num_bits()``.
+        diagonal (np.ndarray): The energies of all basis states, see `cost_diagonal`.
+        initial_hadamard (bool): Whether the ansatz starts from :math:`|+\\rangle^{\\otimes n}`
+            instead of :math:`|0\\rangle^{\\otimes n}`.
+        dtype (np.dtype): The complex dtype of the statevector.
+
+    Example:
+        >>> simulator = QAOASimulator(IsingModel({(0, 1): 1.0}, {}, 0.0))
+        >>> round(simulator.expectation(betas=[np.pi / 8], gammas=[np.pi / 8]), 6)
+        0.707107
+    """
+
+    def __init__(
+        self,
+        ising: typ.Union[IsingModel, HUBOIsingModel],
+        initial_hadamard: bool = True,
+        dtype: typ.Union[type, np.dtype] = np.complex128,
+    ):
+        """
+        Initializes the simulator and computes the cost diagonal.
+
+        Args:
+            ising (IsingModel | HUBOIsingModel): The model, with spins 0, ..., n - 1.
+            initial_hadamard (bool): Start from the uniform superposition. Defaults to True.
+            dtype (type | np.dtype): ``np.complex128`` or ``np.complex64`` for half the memory.
+                Defaults to np.complex128.
+
+        Raises:
+            ValueError: If ``dtype`` is not a complex dtype.
+        """
+        self.dtype = np.dtype(dtype)
+        if self.dtype.kind != "c":
+            raise ValueError(f"dtype must be complex, but got {self.dtype}.")
+        self.ising = ising
+        self.num_qubits = ising.num_bits()
+        self.initial_hadamard = initial_hadamard
+        self.diagonal = cost_diagonal(ising)
+        # Integer-like costs take few distinct values, whose phases are cheaper to compute once
+        # and gather than to exponentiate for every state.
+        levels, inverse = np.unique(self.diagonal, return_inverse=True)
+        if len(levels) <= len(self.diagonal) // 8:
+            self._levels: typ.Optional[np.ndarray] = levels
+            self._level_index = inverse.astype(np.int32)
+        else:
+            self._levels = None
+
+    def statevector(
+        self, betas: typ.Sequence[float], gammas: typ.Sequence[float]
+    ) -> np.ndarray:
+        """
+        Returns the state after the QAOA layers.
+
+        Args:
+            betas (Sequence[float]): The mixer angles of the p layers.
+            gammas (Sequence[float]): The cost angles of the p layers.
+
+        Returns:
+            np.ndarray: The amplitudes with shape (2**num_qubits,).
+
+        Raises:
+            ValueError: If ``betas`` and ``gammas`` have different lengths.
+        """
+        if len(betas) != len(gammas):
+            raise ValueError(
+                f"Got {len(betas)} betas and {len(gammas)} gammas; one of each per layer."
+            )
+        size = 2**self.num_qubits
+        if self.initial_hadamard:
+            state = np.full(size, 1 / np.sqrt(size), dtype=self.dtype)
+        else:
+            state = np.zeros(size, dtype=self.dtype)
+            state[0] = 1.0
+        for beta, gamma in zip(betas, gammas):
+            state *= self._cost_phases(float(gamma))
+            state = self._apply_mixer(state, float(beta))
+        return state
+
+    def _cost_phases(self, gamma: float) -> np.ndarray:
+        """Returns the diagonal of the cost layer, exp(-i gamma E(z))."""
+        if self._levels is not None:
+            phases = np.exp(-1j * gamma * self._levels).astype(self.dtype)
+            return phases[self._level_index]
+        return np.exp(-1j * gamma * self.diagonal).astype(self.dtype, copy=False)
+
+    def _apply_mixer(self, state: np.ndarray, beta: float) -> np.ndarray:
+        """Applies RX(2 beta) to every qubit of ``state``, _MIXER_BLOCK qubits at a time."""
+        rotation = np.array(
+            [[np.cos(beta), -1j * np.sin(beta)], [-1j * np.sin(beta), np.cos(beta)]],
+            dtype=self.dtype,
+        )
+        qubit = 0
+        while qubit < self.num_qubits:
+            width = min(_MIXER_BLOCK, self.num_qubits - qubit)
+            block = rotation
+            for _ in range(width - 1):
+                block = np.kron(block, rotation)
+            tensor = state.reshape(-1, 2**width, 2**qubit)
+            state = np.matmul(block, tensor).reshape(-1)
+            qubit += width
+        return state
+
+    def probabilities(
+        self, betas: typ.Sequence[float], gammas: typ.Sequence[float]
+    ) -> np.ndarray:
+        """Returns the probabilities of all basis states, see `statevector`."""
+        state = self.statevector(betas, gammas)
+        return state.real.astype(np.float64) ** 2 + state.imag.astype(np.float64) ** 2
+
+    def expectation(
+        self, betas: typ.Sequence[float], gammas: typ.Sequence[float]
+    ) -> float:
+        """
+        Returns the expectation value of the cost Hamiltonian, including its constant.
+
+        Args:
+            betas (Sequence[float]): The mixer angles of the p layers.
+            gammas (Sequence[float]): The cost angles of the p layers.
+
+        Returns:
+            float: The expected energy.
+        """
+        return float(self.probabilities(betas, gammas) @ self.diagonal)
+
+    def sample(
+        self,
+        betas: typ.Sequence[float],
+        gammas: typ.Sequence[float],
+        shots: int,
+        seed: typ.Optional[int] = None,
+    ) -> BitsSampleSet:
+        """
+        Samples the state after the QAOA layers in the computational basis.
+
+        Args:
+            betas (Sequence[float]): The mixer angles of the p layers.
+            gammas (Sequence[float]): The cost angles of the p layers.
+            shots (int): The number of shots.
+            seed (Optional[int]): The seed of the sampling. Defaults to None.
+
+        Returns:
+            BitsSampleSet: The samples, where bit i is qubit i, ready for
+                ``QuantumConverter.decode_bits_to_sampleset``.
+        """
+        cumulative = np.cumsum(self.probabilities(betas, gammas))
+        rng = np.random.default_rng(seed)
+        shots_states = np.searchsorted(
+            cumulative, rng.random(shots) * cumulative[-1], side="right"
+        )
+        states, counts = np.unique(
+            np.minimum(shots_states, len(cumulative) - 1), return_counts=True
+        )
+        return BitsSampleSet.from_int_counts(
+            dict(zip(states.tolist(), counts.tolist())), self.num_qubits
+        )
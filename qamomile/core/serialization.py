@@ -0,0 +1,262 @@
+"""
+This module provides a compact binary file format for Hamiltonians and Ising models.
+
+A file holds a small JSON header followed by raw little-endian arrays, each aligned to
+64 bytes. Pauli strings are stored as packed x/z masks (see :mod:`qamomile.core.symplectic`)
+and Ising models as coordinate arrays, so loading is a matter of mapping the arrays with
+``np.memmap``: several processes opening the same file share its pages, and a large
+operator is available without parsing or unpickling it.
+
+Key Components:
+- save_hamiltonian / load_hamiltonian: Store and map a :class:`qamomile.core.operator.Hamiltonian`.
+- save_ising_model / load_ising_model: Store and map a :class:`qamomile.core.ising_qubo.IsingModel`.
+- write_arrays / read_arrays: Store and map named arrays of any other object.
+
+Usage:
+    from qamomile.core.serialization import save_hamiltonian, load_hamiltonian
+
+    save_hamiltonian(hamiltonian, "cost.qmb")
+    hamiltonian = load_hamiltonian("cost.qmb")  # memory-mapped, symplectic storage
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import typing as typ
+
+import numpy as np
+
+from qamomile.core.ising_qubo import IsingModel
+from qamomile.core.operator import Hamiltonian
+
+_MAGIC = b"QAMOMILE"
+_VERSION = 1
+_ALIGNMENT = 64
+_HEADER_LENGTH_DTYPE = np.dtype("<u8")
+
+PathType = typ.Union[str, os.PathLike]
+MmapMode = typ.Optional[typ.Literal["r", "c"]]
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+def write_arrays(
+    file: PathType, kind: str, meta: dict, arrays: dict[str, np.ndarray]
+) -> None:
+    """
+    Writes named arrays and a JSON header to a Qamomile binary file.
+
+    This is the format of `save_hamiltonian` and `save_ising_model`, for other modules that
+    store their own objects as arrays.
+
+    Args:
+        file (PathType): The path of the file to write.
+        kind (str): The name of the stored object, checked by `read_arrays`.
+        meta (dict): JSON-serializable metadata of the object.
+        arrays (dict[str, np.ndarray]): The arrays of the object by name.
+    """
+    arrays = {
+        name: np.ascontiguousarray(array, dtype=np.asarray(array).dtype.newbyteorder("<"))
+        for name, array in arrays.items()
+    }
+    entries = {}
+    offset = 0
+    for name, array in arrays.items():
+        entries[name] = {
+            "dtype": array.dtype.str,
+            "shape": list(array.shape),
+            "offset": offset,
+        }
+        offset = _aligned(offset + array.nbytes)
+    header = json.dumps(
+        {"version": _VERSION, "kind": kind, "meta": meta, "arrays": entries}
+    ).encode("utf-8")
+    data_start = _aligned(len(_MAGIC) + _HEADER_LENGTH_DTYPE.itemsize + len(header))
+
+    with open(file, "wb") as f:
+        f.write(_MAGIC)
+        f.write(np.array(len(header), dtype=_HEADER_LENGTH_DTYPE).tobytes())
+        f.write(header)
+        for name, array in arrays.items():
+            f.seek(data_start + entries[name]["offset"])
+            f.write(array.tobytes())
+        f.truncate(data_start + offset)
+
+
+def read_arrays(
+    file: PathType, kind: str, mmap_mode: MmapMode
+) -> tuple[dict, dict[str, np.ndarray]]:
+    """
+    Reads the header of a file written by `write_arrays` and maps (or reads) its arrays.
+
+    Args:
+        file (PathType): The path of the file to read.
+        kind (str): The expected name of the stored object.
+        mmap_mode (MmapMode): "c" or "r" maps the arrays copy-on-write or read-only,
+            and None reads them into memory.
+
+    Returns:
+        tuple[dict, dict[str, np.ndarray]]: The metadata and the arrays by name.
+
+    Raises:
+        ValueError: If the file is not a Qamomile binary file of ``kind`` or
+            ``mmap_mode`` is invalid.
+    """
+    if mmap_mode not in ("r", "c", None):
+        raise ValueError(
+            f"Invalid mmap_mode: {mmap_mode}. Choose from 'r', 'c' or None."
+        )
+    with open(file, "rb") as f:
+        if f.read(len(_MAGIC)) != _MAGIC:
+            raise ValueError(f"{file} is not a Qamomile binary file.")
+        length = int(np.frombuffer(f.read(_HEADER_LENGTH_DTYPE.itemsize), _HEADER_LENGTH_DTYPE)[0])
+        header = json.loads(f.read(length).decode("utf-8"))
+        if header["version"] != _VERSION:
+            raise ValueError(f"Unsupported file version: {header['version']}.")
+        if header["kind"] != kind:
+            raise ValueError(f"{file} stores a {header['kind']}, not a {kind}.")
+        data_start = _aligned(len(_MAGIC) + _HEADER_LENGTH_DTYPE.itemsize + length)
+
+        arrays = {}
+        for name, entry in header["arrays"].items():
+            dtype = np.dtype(entry["dtype"])
+            shape = tuple(entry["shape"])
+            count = int(np.prod(shape))
+            if count == 0:
+                arrays[name] = np.zeros(shape, dtype=dtype)
+            elif mmap_mode is None:
+                f.seek(data_start + entry["offset"])
+                arrays[name] = np.fromfile(f, dtype=dtype, count=count).reshape(shape)
+            else:
+                arrays[name] = np.memmap(
+                    file,
+                    dtype=dtype,
+                    mode=mmap_mode,
+                    offset=data_start + entry["offset"],
+                    shape=shape,
+                )
+    return header["meta"], arrays
+
+
+def save_hamiltonian(hamiltonian: Hamiltonian, file: PathType) -> None:
+    """
+    Saves a Hamiltonian as packed Pauli masks and complex coefficients.
+
+    Args:
+        hamiltonian (Hamiltonian): The Hamiltonian to save.
+        file (PathType): The path of the file to write.
+
+    Example:
+        >>> import tempfile, os
+        >>> import qamomile.core.operator as qm_o
+        >>> path = os.path.join(tempfile.mkdtemp(), "h.qmb")
+        >>> save_hamiltonian(qm_o.X(0) * qm_o.Z(1) + 0.5, path)
+        >>> load_hamiltonian(path) == qm_o.X(0) * qm_o.Z(1) + 0.5
+        True
+    """
+    x, z, coeffs = hamiltonian.to_masks()
+    constant = complex(hamiltonian.constant)
+    meta = {
+        "storage": hamiltonian.storage,
+        "num_qubits": hamiltonian.fixed_num_qubits,
+        "constant": [constant.real, constant.imag],
+    }
+    write_arrays(file, "Hamiltonian", meta, {"x": x, "z": z, "coeffs": coeffs})
+
+
+def load_hamiltonian(
+    file: PathType,
+    mmap_mode: MmapMode = "c",
+    storage: typ.Optional[typ.Literal["dict", "symplectic"]] = None,
+) -> Hamiltonian:
+    """
+    Loads a Hamiltonian saved by `save_hamiltonian`.
+
+    With symplectic storage the term table is backed by the mapped arrays directly,
+    so the cost of loading does not depend on the number of terms.
+
+    Args:
+        file (PathType): The path of the file to read.
+        mmap_mode (MmapMode): "c" maps the arrays copy-on-write, so the pages are shared
+            until the Hamiltonian is modified. "r" maps them read-only, so the file can not
+            be changed through them: the first in-place change of the Hamiltonian (e.g.
+            ``h *= 2`` or ``h += other``) copies all of its terms into memory. None reads the
+            arrays into memory. Defaults to "c".
+        storage (Optional[Literal["dict", "symplectic"]]): The storage of the returned
+            Hamiltonian. Defaults to the storage of the saved Hamiltonian.
+
+    Returns:
+        Hamiltonian: The loaded Hamiltonian.
+
+    Raises:
+        ValueError: If the file is not a saved Hamiltonian or an option is invalid.
+    """
+    meta, arrays = read_arrays(file, "Hamiltonian", mmap_mode)
+    return Hamiltonian.from_masks(
+        arrays["x"],
+        arrays["z"],
+        arrays["coeffs"],
+        num_qubits=meta["num_qubits"],
+        constant=complex(*meta["constant"]),
+        storage=meta["storage"] if storage is None else storage,
+    )
+
+
+def save_ising_model(ising: IsingModel, file: PathType) -> None:
+    """
+    Saves the coordinate arrays of an Ising model.
+
+    Args:
+        ising (IsingModel): The Ising model to save.
+        file (PathType): The path of the file to write.
+
+    Example:
+        >>> import tempfile, os
+        >>> path = os.path.join(tempfile.mkdtemp(), "ising.qmb")
+        >>> save_ising_model(IsingModel({(0, 1): 2.0}, {0: 4.0}, 6.0, {3: 0, 5: 1}), path)
+        >>> load_ising_model(path)
+        IsingModel(quad={(0, 1): 2.0}, linear={0: 4.0}, constant=6.0, index_map={3: 0, 5: 1})
+    """
+    arrays = {
+        "quad_indices": ising.quad_indices,
+        "quad_values": ising.quad_values,
+        "linear_indices": ising.linear_indices,
+        "linear_values": ising.linear_values,
+    }
+    if ising.index_map is not None:
+        arrays["index_map"] = np.array(
+            list(ising.index_map.items()), dtype=np.int64
+        ).reshape(-1, 2)
+    meta = {"constant": float(ising.constant)}
+    write_arrays(file, "IsingModel", meta, arrays)
+
+
+def load_ising_model(file: PathType, mmap_mode: MmapMode = "c") -> IsingModel:
+    """
+    Loads an Ising model saved by `save_ising_model`.
+
+    Args:
+        file (PathType): The path of the file to read.
+        mmap_mode (MmapMode): How the arrays are opened, see `load_hamiltonian`. Defaults to "c".
+
+    Returns:
+        IsingModel: The loaded Ising model, backed by the mapped arrays.
+
+    Raises:
+        ValueError: If the file is not a saved Ising model or an option is invalid.
+    """
+    meta, arrays = read_arrays(file, "IsingModel", mmap_mode)
+    index_map = None
+    if "index_map" in arrays:
+        index_map = dict(map(tuple, arrays["index_map"].tolist()))
+    return IsingModel.from_arrays(
+        arrays["quad_indices"],
+        arrays["quad_values"],
+        arrays["linear_indices"],
+        arrays["linear_values"],
+        meta["constant"],
+        index_map,
+    )
@@ -0,0 +1,757 @@
+"""
+This module provides a bit-packed (symplectic) storage for sums of Pauli strings.
+
+A Pauli string on :math:`n` qubits is represented by two bit masks :math:`x` and :math:`z`,
+where the operator acting on qubit :math:`q` is
+
+.. math::
+    I \\ (x_q = 0, z_q = 0),\\quad X \\ (x_q = 1, z_q = 0),\\quad Z \\ (x_q = 0, z_q = 1),\\quad Y \\ (x_q = 1, z_q = 1).
+
+Each mask is packed into ``uint64`` words (qubit :math:`q` lives in bit ``q % 64`` of word ``q // 64``),
+so a term costs :math:`2 \\lceil n / 64 \\rceil` words instead of a tuple of Python objects.
+
+Key Components:
+- SymplecticTerms: A growable table of packed Pauli strings with complex coefficients
+  and a hash index used to merge duplicated strings.
+- num_words: The number of ``uint64`` words needed for a given number of qubits.
+- unique_masks: Merge duplicated rows of mask arrays, summing their coefficients.
+- multiply_masks: Multiply two sums of Pauli strings, all term pairs at once.
+- pack_terms: Pack products of single-qubit operators given in a CSR-style layout.
+- flip_groups / flip_values: The action of Pauli strings on computational basis states,
+  used to build sparse matrices without tensor products.
+- walsh_hadamard / diagonal_values: The diagonal of a sum of Z strings.
+
+This module only works with integer masks. The conversion from and to
+:class:`qamomile.core.operator.PauliOperator` lives in :mod:`qamomile.core.operator`.
+
+Usage:
+    from qamomile.core.symplectic import SymplecticTerms
+
+    table = SymplecticTerms()
+    table.add(0b01, 0b10, 0.5)  # 0.5 * X0 Z1
+    print(len(table))
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+
+WORD_BITS = 64
+_WORD_DTYPE = np.dtype("<u8")
+_WORD_MASK = (1 << WORD_BITS) - 1
+
+# i**k for k = 0, 1, 2, 3
+_I_POWERS = np.array([1.0, 1.0j, -1.0, -1.0j], dtype=np.complex128)
+
+if hasattr(np, "bitwise_count"):
+
+    def _popcount_words(words: np.ndarray) -> np.ndarray:
+        return np.bitwise_count(words).sum(axis=-1, dtype=np.int64)
+
+else:
+    _BYTE_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+    def _popcount_words(words: np.ndarray) -> np.ndarray:
+        counts = _BYTE_POPCOUNT[np.ascontiguousarray(words).view(np.uint8)]
+        return counts.reshape(*words.shape[:-1], words.shape[-1] * 8).sum(axis=-1, dtype=np.int64)
+
+
+def num_words(num_qubits: int) -> int:
+    """
+    Returns the number of ``uint64`` words needed to store masks for the given number of qubits.
+
+    Args:
+        num_qubits (int): The number of qubits.
+
+    Returns:
+        int: The number of words. At least one word is always used.
+
+    Example:
+        >>> num_words(64)
+        1
+        >>> num_words(65)
+        2
+    """
+    return max(1, -(-num_qubits // WORD_BITS))
+
+
+def popcount(words: np.ndarray) -> np.ndarray:
+    """
+    Counts the set bits of each mask, summing over the last (word) axis.
+
+    Args:
+        words (np.ndarray): Masks with shape (..., num_words).
+
+    Returns:
+        np.ndarray: The number of set bits with shape (...).
+
+    Example:
+        >>> popcount(np.array([[0b1011, 1], [0, 0]], dtype=np.uint64)).tolist()
+        [4, 0]
+    """
+    return _popcount_words(np.asarray(words, dtype=_WORD_DTYPE))
+
+
+def ints_to_masks(values: list[int], words: int) -> np.ndarray:
+    """
+    Converts Python integer masks into an array of ``uint64`` words.
+
+    Args:
+        values (list[int]): Integer masks, bit ``q`` for qubit ``q``.
+        words (int): The number of words per mask.
+
+    Returns:
+        np.ndarray: The masks with shape (len(values), words).
+    """
+    if words == 1:
+        return np.array(values, dtype=_WORD_DTYPE).reshape(-1, 1)
+    return np.array(
+        [
+            [(value >> (WORD_BITS * k)) & _WORD_MASK for k in range(words)]
+            for value in values
+        ],
+        dtype=_WORD_DTYPE,
+    ).reshape(-1, words)
+
+
+def _pad_words(masks: np.ndarray, words: int) -> np.ndarray:
+    if masks.shape[1] >= words:
+        return masks
+    return np.pad(masks, ((0, 0), (0, words - masks.shape[1])))
+
+
+def _row_keys(x: np.ndarray, z: np.ndarray) -> np.ndarray:
+    """Views each (x, z) row pair as a single opaque byte string for hashing and sorting."""
+    rows = np.ascontiguousarray(np.hstack([x, z]), dtype=_WORD_DTYPE)
+    return rows.view(np.dtype((np.void, rows.shape[1] * rows.itemsize))).ravel()
+
+
+def unique_masks(
+    x: np.ndarray, z: np.ndarray, coeffs: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Merges duplicated Pauli strings and sums their coefficients.
+
+    The merged rows keep the order of their first occurrence.
+
+    Args:
+        x (np.ndarray): X masks with shape (n, num_words).
+        z (np.ndarray): Z masks with shape (n, num_words).
+        coeffs (np.ndarray): Coefficients with shape (n,).
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: The unique x masks, z masks and summed coefficients.
+
+    Example:
+        >>> x = np.array([[1], [0], [1]], dtype=np.uint64)
+        >>> z = np.array([[0], [1], [0]], dtype=np.uint64)
+        >>> ux, uz, uc = unique_masks(x, z, np.array([1.0, 2.0, 3.0]))
+        >>> ux.ravel().tolist(), uz.ravel().tolist(), uc.tolist()
+        ([1, 0], [0, 1], [(4+0j), (2+0j)])
+    """
+    coeffs = np.asarray(coeffs, dtype=np.complex128)
+    if len(coeffs) == 0:
+        return x, z, coeffs
+    _, first, inverse = np.unique(
+        _row_keys(x, z), return_index=True, return_inverse=True
+    )
+    inverse = inverse.ravel()
+    # np.unique sorts the rows; reorder the groups by first occurrence.
+    order = np.argsort(first, kind="stable")
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    group = rank[inverse]
+    summed = np.bincount(group, weights=coeffs.real, minlength=len(order)) + 1j * (
+        np.bincount(group, weights=coeffs.imag, minlength=len(order))
+    )
+    rows = first[order]
+    return x[rows], z[rows], summed
+
+
+def multiply_masks(
+    x1: np.ndarray,
+    z1: np.ndarray,
+    c1: np.ndarray,
+    x2: np.ndarray,
+    z2: np.ndarray,
+    c2: np.ndarray,
+    max_pairs: int = 1 << 22,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    r"""
+    Multiplies two sums of Pauli strings, :math:`(\sum_a c_a P_a)(\sum_b c_b P_b)`.
+
+    With :math:`P = i^{x \cdot z} X^x Z^z`, the product of two strings is
+
+    .. math::
+        P_a P_b = i^{|x_a \wedge z_a| + |x_b \wedge z_b| + 2|z_a \wedge x_b| - |x \wedge z|}
+        \, P(x_a \oplus x_b, z_a \oplus z_b),
+
+    where :math:`|\cdot|` is the popcount. All pairs are formed with broadcasting XORs and
+    popcounts, and duplicates are merged with :func:`unique_masks`. The first operand is
+    processed in chunks so that at most ``max_pairs`` pairs are materialized at a time.
+
+    Args:
+        x1 (np.ndarray): X masks of the left operand with shape (n1, words).
+        z1 (np.ndarray): Z masks of the left operand with shape (n1, words).
+        c1 (np.ndarray): Coefficients of the left operand with shape (n1,).
+        x2 (np.ndarray): X masks of the right operand with shape (n2, words).
+        z2 (np.ndarray): Z masks of the right operand with shape (n2, words).
+        c2 (np.ndarray): Coefficients of the right operand with shape (n2,).
+        max_pairs (int): The maximum number of pairs materialized at once.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: The merged x masks, z masks and coefficients.
+        Rows with both masks zero are proportional to the identity.
+
+    Example:
+        >>> one = np.array([[1]], dtype=np.uint64)
+        >>> zero = np.array([[0]], dtype=np.uint64)
+        >>> x, z, c = multiply_masks(one, zero, np.array([1.0]), one, one, np.array([1.0]))
+        >>> x.ravel().tolist(), z.ravel().tolist(), c.tolist()  # X0 * Y0 = i Z0
+        ([0], [1], [1j])
+    """
+    words = max(x1.shape[1], x2.shape[1])
+    x1, z1 = _pad_words(x1, words), _pad_words(z1, words)
+    x2, z2 = _pad_words(x2, words), _pad_words(z2, words)
+    c1 = np.asarray(c1, dtype=np.complex128)
+    c2 = np.asarray(c2, dtype=np.complex128)
+    if len(c1) == 0 or len(c2) == 0:
+        empty = np.zeros((0, words), dtype=_WORD_DTYPE)
+        return empty, empty.copy(), np.zeros(0, dtype=np.complex128)
+
+    y2 = popcount(x2 & z2)[None, :]
+    chunk = max(1, max_pairs // len(c2))
+    parts = []
+    for start in range(0, len(c1), chunk):
+        xa = x1[start : start + chunk, None, :]
+        za = z1[start : start + chunk, None, :]
+        x = xa ^ x2[None, :, :]
+        z = za ^ z2[None, :, :]
+        exponent = popcount(xa & za) + y2 + 2 * popcount(za & x2[None, :, :])
+        exponent -= popcount(x & z)
+        coeffs = c1[start : start + chunk, None] * c2[None, :]
+        coeffs *= _I_POWERS[exponent % 4]
+        parts.append(
+            unique_masks(x.reshape(-1, words), z.reshape(-1, words), coeffs.ravel())
+        )
+    if len(parts) == 1:
+        return parts[0]
+    return unique_masks(
+        np.concatenate([p[0] for p in parts]),
+        np.concatenate([p[1] for p in parts]),
+        np.concatenate([p[2] for p in parts]),
+    )
+
+
+def pack_terms(
+    term_ptr: np.ndarray,
+    qubits: np.ndarray,
+    x_bits: np.ndarray,
+    z_bits: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    r"""
+    Packs products of single-qubit Pauli operators given in a CSR-style layout.
+
+    The operators of term :math:`t` are the entries ``term_ptr[t]:term_ptr[t + 1]``, in product order.
+    A single-qubit operator is :math:`i^{x z} X^x Z^z`, so a product of them equals
+
+    .. math::
+        i^{\sum_k x_k z_k + 2 \sum_{a < b} z_a x_b - |x \wedge z|} P(x, z),
+
+    where the pairs :math:`a < b` only run over operators on the same qubit, and :math:`x`, :math:`z`
+    are the XORs of the bits on each qubit. All terms are processed in one pass.
+
+    Args:
+        term_ptr (np.ndarray): Offsets of the terms with shape (num_terms + 1,).
+        qubits (np.ndarray): Qubit index of each operator.
+        x_bits (np.ndarray): X bit of each operator.
+        z_bits (np.ndarray): Z bit of each operator.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: The x masks, z masks and the phase of each term.
+
+    Example:
+        >>> x, z, phase = pack_terms(np.array([0, 2]), np.array([0, 0]), np.array([1, 1]), np.array([0, 1]))
+        >>> x.ravel().tolist(), z.ravel().tolist(), phase.tolist()  # X0 * Y0 = i Z0
+        ([0], [1], [1j])
+    """
+    term_ptr = np.asarray(term_ptr, dtype=np.int64)
+    qubits = np.asarray(qubits, dtype=np.int64)
+    x_bits = np.asarray(x_bits, dtype=np.int64)
+    z_bits = np.asarray(z_bits, dtype=np.int64)
+    num_terms = len(term_ptr) - 1
+    words = num_words(int(qubits.max()) + 1 if len(qubits) else 0)
+    x = np.zeros((num_terms, words), dtype=_WORD_DTYPE)
+    z = np.zeros((num_terms, words), dtype=_WORD_DTYPE)
+    if len(qubits) == 0:
+        return x, z, np.ones(num_terms, dtype=np.complex128)
+
+    terms = np.repeat(np.arange(num_terms), np.diff(term_ptr))
+    word = qubits // WORD_BITS
+    bit = np.left_shift(np.uint64(1), (qubits % WORD_BITS).astype(np.uint64))
+    # XOR handles repeated qubits: X0 X0 cancels, X0 Z0 gives both bits.
+    np.bitwise_xor.at(x, (terms[x_bits == 1], word[x_bits == 1]), bit[x_bits == 1])
+    np.bitwise_xor.at(z, (terms[z_bits == 1], word[z_bits == 1]), bit[z_bits == 1])
+
+    # Count, for every operator, the Z bits of the earlier operators on the same qubit of the same term.
+    order = np.lexsort((qubits, terms))
+    sorted_terms, sorted_qubits = terms[order], qubits[order]
+    sorted_x, sorted_z = x_bits[order], z_bits[order]
+    starts = np.ones(len(order), dtype=bool)
+    starts[1:] = (sorted_terms[1:] != sorted_terms[:-1]) | (
+        sorted_qubits[1:] != sorted_qubits[:-1]
+    )
+    z_before = np.cumsum(sorted_z) - sorted_z
+    z_before -= z_before[starts][np.cumsum(starts) - 1]
+
+    exponent = np.bincount(terms, weights=x_bits * z_bits, minlength=num_terms)
+    exponent += 2 * np.bincount(
+        sorted_terms, weights=sorted_x * z_before, minlength=num_terms
+    )
+    exponent = exponent.astype(np.int64) - popcount(x & z)
+    return x, z, _I_POWERS[exponent % 4]
+
+
+def parity(values: np.ndarray) -> np.ndarray:
+    """
+    Computes the parity of the set bits of each non-negative 64-bit integer.
+
+    Args:
+        values (np.ndarray): Integers to reduce.
+
+    Returns:
+        np.ndarray: 0 or 1 for each value, with the same shape and an integer dtype.
+
+    Example:
+        >>> parity(np.array([0, 1, 3, 7])).tolist()
+        [0, 1, 0, 1]
+    """
+    values = np.array(values, dtype=np.uint64)
+    for shift in (32, 16, 8, 4, 2, 1):
+        values ^= values >> np.uint64(shift)
+    return (values & np.uint64(1)).astype(np.int64)
+
+
+def basis_masks(masks: np.ndarray, num_qubits: int) -> np.ndarray:
+    """
+    Converts packed masks of at most 63 qubits into ``int64`` computational basis indices.
+
+    Args:
+        masks (np.ndarray): Masks with shape (n, num_words).
+        num_qubits (int): The number of qubits of the basis.
+
+    Returns:
+        np.ndarray: The masks as integers with shape (n,).
+
+    Raises:
+        ValueError: If ``num_qubits`` exceeds 63 or a mask acts outside of the basis.
+    """
+    if num_qubits > WORD_BITS - 1:
+        raise ValueError(
+            f"A computational basis of {num_qubits} qubits cannot be indexed; at most {WORD_BITS - 1} qubits are supported."
+        )
+    if len(masks) == 0:
+        return np.zeros(0, dtype=np.int64)
+    if masks.shape[1] > 1 and masks[:, 1:].any():
+        raise ValueError(f"The masks act on qubits outside of {num_qubits} qubits.")
+    values = masks[:, 0].astype(np.int64)
+    if (values >> num_qubits).any():
+        raise ValueError(f"The masks act on qubits outside of {num_qubits} qubits.")
+    return values
+
+
+def reverse_bits(values: np.ndarray, num_qubits: int) -> np.ndarray:
+    """
+    Reverses the order of the lowest ``num_qubits`` bits of each integer.
+
+    Args:
+        values (np.ndarray): Integers with at most ``num_qubits`` significant bits.
+        num_qubits (int): The number of bits to reverse.
+
+    Returns:
+        np.ndarray: The reversed integers.
+
+    Example:
+        >>> reverse_bits(np.array([1, 6]), 3).tolist()
+        [4, 3]
+    """
+    values = np.asarray(values, dtype=np.int64)
+    reversed_values = np.zeros_like(values)
+    for q in range(num_qubits):
+        reversed_values |= ((values >> q) & 1) << (num_qubits - 1 - q)
+    return reversed_values
+
+
+def flip_groups(
+    x: np.ndarray, z: np.ndarray, coeffs: np.ndarray
+) -> tuple[np.ndarray, list[tuple[np.ndarray, np.ndarray]]]:
+    r"""
+    Groups Pauli strings by their bit flip for the action on computational basis states.
+
+    With :math:`P = i^{x \cdot z} X^x Z^z`, a string maps a basis state as
+
+    .. math::
+        \langle r | P | r \oplus x \rangle = (-i)^{|x \wedge z|} (-1)^{|r \wedge z|},
+
+    so every string sharing the same :math:`x` has its nonzero entries at the same positions.
+    The phase :math:`(-i)^{|x \wedge z|}` is folded into the returned coefficients.
+
+    Args:
+        x (np.ndarray): X masks as ``int64`` basis indices with shape (n,).
+        z (np.ndarray): Z masks as ``int64`` basis indices with shape (n,).
+        coeffs (np.ndarray): Coefficients with shape (n,).
+
+    Returns:
+        tuple[np.ndarray, list[tuple[np.ndarray, np.ndarray]]]: The distinct flips and,
+        for each flip, the z masks and phased coefficients of its strings.
+
+    Example:
+        >>> flips, groups = flip_groups(np.array([1, 1]), np.array([0, 1]), np.array([1.0, 1.0]))
+        >>> flips.tolist(), groups[0][1].tolist()  # X0 + Y0
+        ([1], [(1+0j), -1j])
+    """
+    coeffs = np.asarray(coeffs, dtype=np.complex128)
+    coeffs = coeffs * _I_POWERS[(-popcount((x & z)[:, None])) % 4]
+    flips, inverse = np.unique(x, return_inverse=True)
+    inverse = inverse.ravel()
+    groups = []
+    for g in range(len(flips)):
+        selected = inverse == g
+        groups.append((z[selected], coeffs[selected]))
+    return flips, groups
+
+
+def flip_values(
+    rows: np.ndarray, groups: list[tuple[np.ndarray, np.ndarray]]
+) -> np.ndarray:
+    r"""
+    Evaluates :math:`\sum_t c_t (-1)^{|r \wedge z_t|}` for each row and each flip group.
+
+    Args:
+        rows (np.ndarray): Basis indices with shape (m,).
+        groups (list[tuple[np.ndarray, np.ndarray]]): The groups returned by :func:`flip_groups`.
+
+    Returns:
+        np.ndarray: The matrix entries with shape (m, len(groups)).
+    """
+    values = np.zeros((len(rows), len(groups)), dtype=np.complex128)
+    for g, (zs, coeffs) in enumerate(groups):
+        for z, coeff in zip(zs.tolist(), coeffs.tolist()):
+            if z == 0:
+                values[:, g] += coeff
+            else:
+                values[:, g] += coeff * (1 - 2 * parity(rows & z))
+    return values
+
+
+def walsh_hadamard(values: np.ndarray) -> np.ndarray:
+    r"""
+    Applies the unnormalized fast Walsh–Hadamard transform in place.
+
+    For a vector of length :math:`2^n` it computes
+    :math:`w_b = \sum_z v_z (-1)^{|b \wedge z|}` in :math:`O(n 2^n)` operations.
+
+    Args:
+        values (np.ndarray): A contiguous vector whose length is a power of two.
+
+    Returns:
+        np.ndarray: The transformed input array.
+
+    Example:
+        >>> walsh_hadamard(np.array([1.0, 2.0, 0.0, 0.0])).tolist()
+        [3.0, -1.0, 3.0, -1.0]
+    """
+    size = len(values)
+    half = 1
+    while half < size:
+        pairs = values.reshape(-1, 2, half)
+        upper = pairs[:, 0, :].copy()
+        pairs[:, 0, :] += pairs[:, 1, :]
+        upper -= pairs[:, 1, :]
+        pairs[:, 1, :] = upper
+        half *= 2
+    return values
+
+
+def diagonal_values(
+    z: np.ndarray,
+    coeffs: np.ndarray,
+    num_qubits: int,
+    out: np.ndarray,
+    chunk_qubits: int,
+) -> np.ndarray:
+    r"""
+    Writes the diagonal :math:`d_b = \sum_t c_t (-1)^{|b \wedge z_t|}` of a sum of Z strings.
+
+    The output is filled in chunks of :math:`2^{k}` entries with :math:`k` = ``chunk_qubits``.
+    Within a chunk the high bits of :math:`b` are fixed, so their signs are folded into the
+    coefficients, which are binned by the low bits of :math:`z_t` and transformed with
+    :func:`walsh_hadamard`.
+
+    Args:
+        z (np.ndarray): Z masks as ``int64`` basis indices with shape (n,).
+        coeffs (np.ndarray): Coefficients with shape (n,).
+        num_qubits (int): The number of qubits.
+        out (np.ndarray): The output vector with shape (2**num_qubits,).
+        chunk_qubits (int): The base-2 logarithm of the chunk length.
+
+    Returns:
+        np.ndarray: ``out``.
+    """
+    low = min(num_qubits, chunk_qubits)
+    size = 1 << low
+    z_low = z & (size - 1)
+    z_high = z >> low
+    coeffs = np.asarray(coeffs)
+    for high in range(1 << (num_qubits - low)):
+        weights = coeffs * (1 - 2 * parity(z_high & high))
+        chunk = np.bincount(z_low, weights=weights.real, minlength=size)
+        if np.iscomplexobj(out):
+            chunk = chunk + 1j * np.bincount(z_low, weights=weights.imag, minlength=size)
+        out[high * size : (high + 1) * size] = walsh_hadamard(chunk)
+    return out
+
+
+class SymplecticTerms:
+    """
+    A growable table of Pauli strings stored as packed x/z bit masks.
+
+    Rows are appended in insertion order and identical Pauli strings are merged
+    through a hash index keyed by the raw bytes of the masks, so adding a term is
+    amortized O(1) regardless of the number of stored terms.
+
+    Attributes:
+        x (np.ndarray): X masks of the stored terms with shape (len, num_words).
+        z (np.ndarray): Z masks of the stored terms with shape (len, num_words).
+        coeffs (np.ndarray): Complex coefficients of the stored terms.
+
+    Example:
+        >>> table = SymplecticTerms()
+        >>> table.add(0b1, 0b0, 1.0)
+        >>> table.add(0b1, 0b0, 0.5)
+        >>> len(table), table.coeffs.tolist()
+        (1, [(1.5+0j)])
+    """
+
+    def __init__(self, num_qubits: int = 0, capacity: int = 16) -> None:
+        words = num_words(num_qubits)
+        capacity = max(capacity, 1)
+        self._x = np.zeros((capacity, words), dtype=_WORD_DTYPE)
+        self._z = np.zeros((capacity, words), dtype=_WORD_DTYPE)
+        self._coeffs = np.zeros(capacity, dtype=np.complex128)
+        self._size = 0
+        self._index: Optional[dict[bytes, int]] = {}
+
+    @classmethod
+    def from_arrays(
+        cls, x: np.ndarray, z: np.ndarray, coeffs: np.ndarray
+    ) -> SymplecticTerms:
+        """
+        Wraps existing mask and coefficient arrays without copying them.
+
+        The rows must be distinct Pauli strings, as in a table that was saved before.
+        The hash index is only built when a term is added, so wrapping memory-mapped
+        arrays is cheap. Growing the table copies the arrays into new buffers, and so does
+        the first in-place change of arrays that are not writeable (e.g. mapped read-only).
+
+        Args:
+            x (np.ndarray): X masks with shape (n, num_words).
+            z (np.ndarray): Z masks with shape (n, num_words).
+            coeffs (np.ndarray): Complex coefficients with shape (n,).
+
+        Returns:
+            SymplecticTerms: The table backed by the given arrays.
+        """
+        table = cls.__new__(cls)
+        if len(coeffs) == 0:
+            words = max(x.shape[1], 1)
+            table._x = np.zeros((1, words), dtype=_WORD_DTYPE)
+            table._z = np.zeros((1, words), dtype=_WORD_DTYPE)
+            table._coeffs = np.zeros(1, dtype=np.complex128)
+        else:
+            table._x, table._z, table._coeffs = x, z, coeffs
+        table._size = len(coeffs)
+        table._index = None
+        return table
+
+    def _lookup(self) -> dict[bytes, int]:
+        """Returns the hash index of the rows, building it on first use."""
+        if self._index is None:
+            keys = _row_keys(self.x, self.z)
+            self._index = {key.tobytes(): i for i, key in enumerate(keys)}
+        return self._index
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def num_words(self) -> int:
+        """The number of ``uint64`` words used per mask."""
+        return self._x.shape[1]
+
+    @property
+    def x(self) -> np.ndarray:
+        return self._x[: self._size]
+
+    @property
+    def z(self) -> np.ndarray:
+        return self._z[: self._size]
+
+    @property
+    def coeffs(self) -> np.ndarray:
+        return self._coeffs[: self._size]
+
+    def copy(self) -> SymplecticTerms:
+        """Returns an independent copy of the table."""
+        table = SymplecticTerms.__new__(SymplecticTerms)
+        table._x = self._x[: max(self._size, 1)].copy()
+        table._z = self._z[: max(self._size, 1)].copy()
+        table._coeffs = self._coeffs[: max(self._size, 1)].copy()
+        table._size = self._size
+        table._index = None if self._index is None else self._index.copy()
+        return table
+
+    def scale(self, factor: complex) -> None:
+        """Multiplies every coefficient by ``factor`` in place."""
+        self._ensure_writeable()
+        self._coeffs[: self._size] *= factor
+
+    def _ensure_writeable(self) -> None:
+        """Copies the arrays into memory before an in-place change if they are read-only."""
+        if not (
+            self._x.flags.writeable
+            and self._z.flags.writeable
+            and self._coeffs.flags.writeable
+        ):
+            self._x, self._z, self._coeffs = (
+                np.array(self._x),
+                np.array(self._z),
+                np.array(self._coeffs),
+            )
+
+    def _reserve(self, size: int) -> None:
+        capacity = self._x.shape[0]
+        if size <= capacity:
+            return
+        capacity = max(size, 2 * capacity)
+        words = self.num_words
+        for name, shape, dtype in (
+            ("_x", (capacity, words), _WORD_DTYPE),
+            ("_z", (capacity, words), _WORD_DTYPE),
+            ("_coeffs", (capacity,), np.complex128),
+        ):
+            new = np.zeros(shape, dtype=dtype)
+            new[: self._size] = getattr(self, name)[: self._size]
+            setattr(self, name, new)
+
+    def ensure_num_qubits(self, num_qubits: int) -> None:
+        """
+        Widens the masks so that qubit indices below ``num_qubits`` can be stored.
+
+        Widening changes the byte layout of every row, so the hash index is rebuilt.
+        This only happens when crossing a multiple of 64 qubits.
+        """
+        words = num_words(num_qubits)
+        if words <= self.num_words:
+            return
+        pad = words - self.num_words
+        self._x = np.pad(self._x, ((0, 0), (0, pad)))
+        self._z = np.pad(self._z, ((0, 0), (0, pad)))
+        self._index = None
+
+    def add(self, x: int, z: int, coeff: complex) -> None:
+        """
+        Adds a single Pauli string given as Python integer masks.
+
+        Args:
+            x (int): X mask, bit ``q`` set if the string has X or Y on qubit ``q``.
+            z (int): Z mask, bit ``q`` set if the string has Z or Y on qubit ``q``.
+            coeff (complex): The coefficient of the term.
+        """
+        self.ensure_num_qubits(max(x.bit_length(), z.bit_length()))
+        nbytes = self.num_words * _WORD_DTYPE.itemsize
+        key = x.to_bytes(nbytes, "little") + z.to_bytes(nbytes, "little")
+        index = self._lookup()
+        row = index.get(key)
+        self._ensure_writeable()
+        if row is not None:
+            self._coeffs[row] += coeff
+            return
+        self._reserve(self._size + 1)
+        row = self._size
+        masks = np.frombuffer(key, dtype=_WORD_DTYPE)
+        self._x[row] = masks[: self.num_words]
+        self._z[row] = masks[self.num_words :]
+        self._coeffs[row] = coeff
+        index[key] = row
+        self._size += 1
+
+    def add_masks(self, x: np.ndarray, z: np.ndarray, coeffs: np.ndarray) -> None:
+        """
+        Adds many Pauli strings at once.
+
+        Duplicates inside the batch are merged with a single sort, and only the
+        resulting unique rows are looked up in the hash index.
+
+        Args:
+            x (np.ndarray): X masks with shape (n, words).
+            z (np.ndarray): Z masks with shape (n, words).
+            coeffs (np.ndarray): Coefficients with shape (n,).
+        """
+        if len(coeffs) == 0:
+            return
+        x = np.asarray(x, dtype=_WORD_DTYPE).reshape(len(coeffs), -1)
+        z = np.asarray(z, dtype=_WORD_DTYPE).reshape(len(coeffs), -1)
+        self.ensure_num_qubits(x.shape[1] * WORD_BITS)
+        x, z = _pad_words(x, self.num_words), _pad_words(z, self.num_words)
+        x, z, coeffs = unique_masks(x, z, coeffs)
+
+        keys = _row_keys(x, z)
+        index = self._lookup()
+        rows = np.fromiter(
+            (index.get(key.tobytes(), -1) for key in keys),
+            dtype=np.int64,
+            count=len(keys),
+        )
+        hit = rows >= 0
+        self._ensure_writeable()
+        # Rows are unique after the merge above, so plain fancy indexing is safe.
+        self._coeffs[rows[hit]] += coeffs[hit]
+
+        new = ~hit
+        num_new = int(np.count_nonzero(new))
+        if num_new == 0:
+            return
+        start = self._size
+        self._reserve(start + num_new)
+        self._x[start : start + num_new] = x[new]
+        self._z[start : start + num_new] = z[new]
+        self._coeffs[start : start + num_new] = coeffs[new]
+        index.update(
+            (key.tobytes(), start + i) for i, key in enumerate(keys[new])
+        )
+        self._size += num_new
+
+    def unpack(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Unpacks the masks into boolean arrays with one column per qubit.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The x and z bits with shape (len, num_words * 64).
+        """
+        x = np.unpackbits(self.x.view(np.uint8), axis=1, bitorder="little")
+        z = np.unpackbits(self.z.view(np.uint8), axis=1, bitorder="little")
+        return x.astype(bool), z.astype(bool)
+
+    def num_qubits(self) -> int:
+        """Returns the highest qubit index acted on non-trivially plus one."""
+        if self._size == 0:
+            return 0
+        support = np.bitwise_or.reduce(self.x | self.z, axis=0)
+        nonzero = np.flatnonzero(support)
+        if len(nonzero) == 0:
+            return 0
+        word = int(nonzero[-1])
+        return word * WORD_BITS + int(support[word]).bit_length()
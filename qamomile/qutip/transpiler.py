@@ -21,7 +21,7 @@ import qamomile.core.operator as qm_o
 
 import collections
 from qamomile.core.transpiler import QuantumSDKTranspiler
-from qutip import Qobj, sigmaz, sigmax, sigmay, tensor, qzero, qeye
+from qutip import Qobj
 
 
 class QuTiPTranspiler(QuantumSDKTranspiler[tuple[collections.Counter[int], int]]):
@@ -36,35 +36,18 @@ class QuTiPTranspiler(QuantumSDKTranspiler[tuple[collections.Counter[int], int]]
         """
         Convert a Qamomile Hamiltonian to a QuTiP Hamiltonian.
 
+        The matrix is built as a sparse matrix directly from the Pauli strings
+        (see `qamomile.core.operator.Hamiltonian.to_sparse`), in QuTiP's qubit order
+        where qubit 0 is the first factor of the tensor product.
+
         Args:
             operator (qm_o.Hamiltonian): The Qamomile Hamiltonian to convert.
 
         Returns:
             Qobj: The converted Hamiltonian.
-
-        Raises:
-            NotImplementedError: If an unsupported Pauli operator is encountered.
         """
         n = operator.num_qubits
-        H = tensor([qzero(2)] * n)
-        for term, coeff in operator.terms.items():
-            op_list = [qeye(2)] * n
-            for pauli in term:
-                match pauli.pauli:
-                    case qm_o.Pauli.X:
-                        op_list[pauli.index] = sigmax()
-                    case qm_o.Pauli.Y:
-                        op_list[pauli.index] = sigmay()
-                    case qm_o.Pauli.Z:
-                        op_list[pauli.index] = sigmaz()
-                    case _:
-                        raise NotImplementedError(
-                            "Only Pauli X, Y, and Z are supported"
-                        )
-            H += coeff * tensor(op_list)
-        if operator.constant != 0:
-            H += operator.constant * qeye(2 ** n)
-        return Qobj(H)
+        return Qobj(operator.to_sparse(qubit_order="big"), dims=[[2] * n, [2] * n])
 
     def transpile_circuit(self) -> None:
         raise NotImplementedError(
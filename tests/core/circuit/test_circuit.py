@@ -10,6 +10,7 @@ from qamomile.core.circuit import (
     Value,
     SingleQubitGateType,
     ParametricSingleQubitGateType,
+    ParametricTwoQubitGateType,
     TwoQubitGateType,
     ThreeQubitGateType,
     MeasurementGate,
@@ -68,6 +69,31 @@ def test_three_qubit_gate():
     assert len(qc.gates) == 1
     assert qc.gates[0].gate == ThreeQubitGateType.CCX
 
+def test_multi_rz():
+    theta = Parameter("theta")
+    qc = QuantumCircuit(4)
+    qc.multi_rz(theta, [2])
+    qc.multi_rz(theta, [0, 3])
+    assert qc.gates[0].gate == ParametricSingleQubitGateType.RZ
+    assert qc.gates[1].gate == ParametricTwoQubitGateType.RZZ
+
+    qc = QuantumCircuit(4)
+    qc.multi_rz(theta, [0, 1, 3])
+    assert [gate.gate for gate in qc.gates] == [
+        TwoQubitGateType.CNOT,
+        TwoQubitGateType.CNOT,
+        ParametricSingleQubitGateType.RZ,
+        TwoQubitGateType.CNOT,
+        TwoQubitGateType.CNOT,
+    ]
+    assert qc.gates[2].qubit == 3
+
+    with pytest.raises(ValueError):
+        qc.multi_rz(theta, [])
+    with pytest.raises(ValueError):
+        qc.multi_rz(theta, [1, 1])
+
+
 def test_exp_evolution():
     hamiltonian = qm_o.Hamiltonian()
     hamiltonian += qm_o.X(0) * qm_o.Z(1)
@@ -145,3 +171,10 @@ def test_invalid_measurement():
     qc = QuantumCircuit(1, 0)
     with pytest.raises(ValueError):
         qc.measure(0, 0)
+
+
+def test_exp_evolution_indices():
+    qc = QuantumCircuit(5)
+    hamiltonian = qm_o.X(3) * qm_o.Z(1) + qm_o.Y(3)
+    qc.exp_evolution(Parameter("t"), hamiltonian)
+    assert qc.gates[0].indices == [1, 3]
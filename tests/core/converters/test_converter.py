@@ -0,0 +1,321 @@
+import concurrent.futures
+import importlib.metadata
+import itertools
+
+import pytest
+import numpy as np
+import jijmodeling as jm
+import jijmodeling_transpiler.core as jmt
+import qamomile.core.bitssample as qm_bs
+from qamomile.core.converters.cache import converter_cache_key
+from qamomile.core.converters.converter import decode_from_dict_binary_result
+from qamomile.core.converters.qaoa import QAOAConverter
+from qamomile.core.converters.qrao.qrao31 import QRAC31Converter
+from qamomile.core.ising_qubo import qubo_to_ising
+
+
+@pytest.fixture
+def constrained_problem():
+    return _compile_constrained_problem([1.0, 2.0, -1.0])
+
+
+def _compile_constrained_problem(d_values):
+    n = jm.Placeholder("n")
+    d = jm.Placeholder("d", ndim=1)
+    x = jm.BinaryVar("x", shape=(n,))
+    y = jm.BinaryVar("y", shape=(n,))
+    i = jm.Element("i", n)
+    problem = jm.Problem("constrained")
+    problem += jm.sum(i, d[i] * x[i]) + jm.sum(i, x[i] * y[i])
+    problem += jm.Constraint("one", jm.sum(i, x[i]) == 1)
+    problem += jm.Constraint("each", x[i] + y[i] == 1, forall=i)
+    return jmt.compile_model(problem, {"n": 3, "d": d_values})
+
+
+def assert_ising_close(actual, expected):
+    assert set(actual.quad) == set(expected.quad)
+    assert set(actual.linear) == set(expected.linear)
+    for key, value in expected.quad.items():
+        assert actual.quad[key] == pytest.approx(value)
+    for key, value in expected.linear.items():
+        assert actual.linear[key] == pytest.approx(value)
+    assert actual.constant == pytest.approx(expected.constant)
+
+
+@pytest.mark.parametrize("normalize_ising", [None, "abs_max"])
+@pytest.mark.parametrize(
+    "multipliers",
+    [{"one": 2.0, "each": 0.5}, {"one": 0.0, "each": 0.0}, {"one": 3.0}],
+)
+def test_ising_encode_multipliers(constrained_problem, normalize_ising, multipliers):
+    converter = QAOAConverter(constrained_problem, normalize_ising=normalize_ising)
+    qubo, constant = converter.pubo_builder.get_qubo_dict(multipliers=multipliers)
+    expected = qubo_to_ising(qubo, constant)
+    if normalize_ising == "abs_max":
+        expected.normalize_by_abs_max()
+
+    assert_ising_close(converter.ising_encode(multipliers=multipliers), expected)
+    assert converter.int2varlabel[0] == "x_{0}"
+
+
+def test_ising_encode_grid(constrained_problem):
+    converter = QAOAConverter(constrained_problem)
+    grid = [{"one": a, "each": b} for a in (0.0, 1.0, 2.5) for b in (0.5, 4.0)]
+    isings = converter.ising_encode_grid(grid)
+    assert len(isings) == len(grid)
+    for multipliers, ising in zip(grid, isings):
+        qubo, constant = converter.pubo_builder.get_qubo_dict(multipliers=multipliers)
+        assert_ising_close(ising, qubo_to_ising(qubo, constant))
+
+
+def test_ising_encode_does_not_depend_on_grid():
+    # Subtracting the objective from the parts rounds these coefficients differently.
+    instance = _compile_constrained_problem([0.1, 0.7, -0.3])
+    converter = QAOAConverter(instance)
+    converter.ising_encode_grid([{}])
+    expected = QAOAConverter(instance).ising_encode()
+    ising = converter.ising_encode()
+    assert dict(ising.quad) == dict(expected.quad)
+    assert dict(ising.linear) == dict(expected.linear)
+    assert ising.constant == expected.constant
+
+
+def test_converter_cache(constrained_problem, tmp_path, monkeypatch):
+    converter = QAOAConverter(constrained_problem, cache_dir=tmp_path)
+    assert len(list(tmp_path.iterdir())) == 0
+    expected = converter.get_ising()
+    assert len(list(tmp_path.iterdir())) == 1
+
+    def fail(*args, **kwargs):
+        raise AssertionError("transpile_to_pubo should not run on a cache hit")
+
+    monkeypatch.setattr(jmt.pubo, "transpile_to_pubo", fail)
+    sibling = QRAC31Converter(constrained_problem, cache_dir=tmp_path)
+    assert_ising_close(sibling.ising_encode(), expected)
+    assert sibling.int2varlabel == converter.int2varlabel
+    assert_ising_close(
+        sibling.ising_encode(multipliers={"one": 2.0}),
+        converter.ising_encode(multipliers={"one": 2.0}),
+    )
+
+    relax_method = jmt.pubo.RelaxationMethod.AugmentedLagrangian
+    assert converter_cache_key(
+        constrained_problem, relax_method, False
+    ) != converter_cache_key(constrained_problem, relax_method, True)
+
+    key = converter_cache_key(constrained_problem, relax_method, False)
+    monkeypatch.setattr(importlib.metadata, "version", lambda name: "999.0.0")
+    assert converter_cache_key(constrained_problem, relax_method, False) != key
+
+
+def test_pubo_builder_is_lazy(constrained_problem, monkeypatch):
+    calls = []
+    transpile_to_pubo = jmt.pubo.transpile_to_pubo
+
+    def counting(*args, **kwargs):
+        calls.append(args)
+        return transpile_to_pubo(*args, **kwargs)
+
+    monkeypatch.setattr(jmt.pubo, "transpile_to_pubo", counting)
+    converter = QAOAConverter(constrained_problem)
+    assert calls == []
+    converter.get_ising()
+    converter.ising_encode(multipliers={"one": 2.0})
+    assert len(calls) == 1
+
+
+def test_ising_encode_presolve(constrained_problem):
+    converter = QAOAConverter(constrained_problem)
+    presolved = QAOAConverter(constrained_problem, presolve=True)
+    full = converter.get_ising()
+    reduced = presolved.get_ising()
+    assert reduced.num_bits() < full.num_bits()
+
+    # Every reduced state decodes like its reconstruction does without presolve.
+    result = presolved.get_presolve_result()
+    assert converter.get_presolve_result() is None
+    for bits in itertools.product([0, 1], repeat=reduced.num_bits()):
+        full_bits = result.reconstruct_bits(np.array(bits, dtype=np.uint8)).tolist()
+        decoded = presolved.decode_bits_to_sampleset(
+            qm_bs.BitsSampleSet([qm_bs.BitsSample(1, list(bits))])
+        )
+        expected = converter.decode_bits_to_sampleset(
+            qm_bs.BitsSampleSet([qm_bs.BitsSample(1, full_bits)])
+        )
+        assert decoded.data[0].eval.objective == expected.data[0].eval.objective
+        assert reduced.calc_energy([1 - 2 * b for b in bits]) == pytest.approx(
+            full.calc_energy([1 - 2 * b for b in full_bits])
+        )
+
+
+def _decode_one_by_one(converter, bits, num_occurrences):
+    ising = converter.get_ising()
+    samples = [
+        {ising.ising2qubo_index(i): int(bit) for i, bit in enumerate(row)}
+        for row in bits
+    ]
+    sampleset = decode_from_dict_binary_result(
+        samples, converter.pubo_builder.binary_encoder, converter.compiled_instance
+    )
+    sampleset.record = jm.Record(
+        sampleset.record.solution, num_occurrences=num_occurrences
+    )
+    return jm.experimental.from_old_sampleset(sampleset)
+
+
+def _integer_problem():
+    x = jm.IntegerVar("x", lower_bound=2, upper_bound=6, shape=(2,))
+    y = jm.BinaryVar("y")
+    problem = jm.Problem("integer")
+    problem += x[0] * y + x[1] * x[1]
+    problem += jm.Constraint("c", x[0] + x[1] <= 7)
+    return jmt.compile_model(problem, {})
+
+
+def _penalty_problem():
+    x = jm.BinaryVar("x", shape=(3,))
+    i = jm.Element("i", 3)
+    problem = jm.Problem("penalty")
+    problem += x[0] * x[1] + x[2]
+    problem += jm.CustomPenaltyTerm("pen", (x[i] + x[0] - 1) ** 2, forall=i)
+    problem += jm.Constraint("c", x[0] + x[2] <= 1)
+    return jmt.compile_model(problem, {}, fixed_variables={"x": {(1,): 1}})
+
+
+def test_decode_after_reencoding_with_presolve():
+    converter = QAOAConverter(_integer_problem(), presolve=True)
+    reference = QAOAConverter(_integer_problem())
+    reduced = converter.get_ising()
+    result = converter.get_presolve_result()
+    assert result.ising == reduced
+
+    # Encoding other multipliers returns another reduction without touching get_ising's one.
+    reencoded = converter.ising_encode(multipliers={"c": 5.0})
+    assert reencoded.num_bits() != reduced.num_bits()
+    assert converter.ising_encode_grid([{"c": 5.0}])[0] == reencoded
+    assert converter.presolve_encode(multipliers={"c": 5.0}).ising == reencoded
+    assert converter.get_presolve_result() is result
+
+    bits = np.array(
+        list(itertools.product([0, 1], repeat=reduced.num_bits())), dtype=np.uint8
+    )
+    decoded = converter.decode_bits_array(bits)
+    expected = reference.decode_bits_array(result.reconstruct_bits(bits))
+    for a, e in zip(decoded.data, expected.data):
+        assert a.eval.objective == pytest.approx(e.eval.objective)
+        assert a.eval.constraints["c"].total_violation == pytest.approx(
+            e.eval.constraints["c"].total_violation
+        )
+
+
+@pytest.mark.parametrize("instance", ["constrained", "integer", "penalty"])
+def test_decode_bits_array(constrained_problem, instance):
+    compiled_instance = {
+        "constrained": constrained_problem,
+        "integer": _integer_problem(),
+        "penalty": _penalty_problem(),
+    }[instance]
+    converter = QAOAConverter(compiled_instance)
+    rng = np.random.default_rng(0)
+    bits = rng.integers(0, 2, (20, converter.get_ising().num_bits())).astype(np.uint8)
+    num_occurrences = rng.integers(1, 5, 20).tolist()
+
+    actual = converter.decode_bits_array(bits, num_occurrences)
+    expected = _decode_one_by_one(converter, bits, num_occurrences)
+    assert len(actual.data) == len(expected.data)
+    for a, e in zip(actual.data, expected.data):
+        assert a.num_occurrences == e.num_occurrences
+        for label, values in e.var_values.items():
+            assert dict(a.var_values[label].values) == dict(values.values)
+        assert a.eval.objective == pytest.approx(e.eval.objective)
+        for label, violation in e.eval.constraints.items():
+            assert a.eval.constraints[label].total_violation == pytest.approx(
+                violation.total_violation
+            )
+        for label, violation in e.eval.penalties.items():
+            assert a.eval.penalties[label].total_violation == pytest.approx(
+                violation.total_violation
+            )
+
+    with pytest.raises(ValueError):
+        converter.decode_bits_array(bits[0])
+
+
+def test_evaluation_cache(constrained_problem):
+    converter = QAOAConverter(constrained_problem, evaluation_cache_size=3)
+    bits = np.array(
+        [[1, 0, 0, 0, 1, 1], [0, 1, 0, 1, 0, 1], [1, 0, 0, 0, 1, 1]], dtype=np.uint8
+    )
+    # The repeated bitstring is evaluated once, but it was not found in the cache.
+    first = converter.decode_bits_array(bits)
+    assert converter.evaluation_cache_info() == (0, 3, 3, 2)
+
+    second = converter.decode_bits_array(bits[:2])
+    assert converter.evaluation_cache_info() == (2, 3, 3, 2)
+    for a, b in zip(first.data, second.data):
+        assert a.eval.objective == b.eval.objective
+        assert a.eval.constraints["one"].total_violation == (
+            b.eval.constraints["one"].total_violation
+        )
+
+    # The least recently used bitstrings are evicted beyond the maximum size.
+    converter.decode_bits_array(np.eye(6, dtype=np.uint8)[:3])
+    assert converter.evaluation_cache_info().currsize == 3
+    converter.clear_evaluation_cache()
+    assert converter.evaluation_cache_info() == (0, 0, 3, 0)
+
+    uncached = QAOAConverter(constrained_problem, evaluation_cache_size=0)
+    uncached.decode_bits_array(bits)
+    assert uncached.evaluation_cache_info() == (0, 0, 0, 0)
+
+
+def test_decode_bits_array_in_parallel(constrained_problem):
+    converter = QAOAConverter(constrained_problem, evaluation_cache_size=0)
+    rng = np.random.default_rng(1)
+    bits = rng.integers(0, 2, (30, converter.get_ising().num_bits())).astype(np.uint8)
+    expected = converter.decode_bits_array(bits)
+
+    with converter.evaluation_executor(2) as pool:
+        from_pool = converter.decode_bits_array(bits, executor=pool)
+    with concurrent.futures.ThreadPoolExecutor(2) as pool:
+        from_threads = converter.decode_bits_array(bits, executor=pool)
+    from_jobs = converter.decode_bits_array(bits, n_jobs=2)
+
+    for sampleset in (from_pool, from_threads, from_jobs):
+        for a, e in zip(sampleset.data, expected.data):
+            assert a.eval.objective == e.eval.objective
+            for label, violation in e.eval.constraints.items():
+                assert a.eval.constraints[label].total_violation == (
+                    violation.total_violation
+                )
+
+
+def test_decode_top_k_by_energy(constrained_problem):
+    converter = QAOAConverter(constrained_problem)
+    ising = converter.get_ising()
+    rng = np.random.default_rng(2)
+    bits = rng.integers(0, 2, (40, ising.num_bits())).astype(np.uint8)
+    num_occurrences = rng.integers(1, 5, 40).tolist()
+    energies = ising.calc_energy_batch(1 - 2 * bits.astype(int))
+
+    rows = converter.select_by_energy(bits, top_k=5)
+    assert energies[rows].tolist() == sorted(energies)[:5]
+    threshold = float(np.median(energies))
+    rows = converter.select_by_energy(bits, max_energy=threshold)
+    assert set(rows.tolist()) == set(np.flatnonzero(energies <= threshold).tolist())
+
+    top = converter.decode_bits_array(bits, num_occurrences, top_k=5)
+    best = converter.select_by_energy(bits, top_k=5)
+    expected = converter.decode_bits_array(
+        bits[best], [num_occurrences[row] for row in best]
+    )
+    assert [s.num_occurrences for s in top.data] == [
+        s.num_occurrences for s in expected.data
+    ]
+    assert [s.eval.objective for s in top.data] == [
+        s.eval.objective for s in expected.data
+    ]
+    assert len(converter.decode_bits_array(bits, max_energy=-np.inf).data) == 0
+
+    with pytest.raises(ValueError):
+        converter.select_by_energy(bits, top_k=-1)
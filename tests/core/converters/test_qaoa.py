@@ -94,3 +94,70 @@ def test_qaoa_converter_with_larger_problem():
     # Test Hamiltonian generation
     hamiltonian = qaoa_converter.get_cost_hamiltonian()
     assert len(hamiltonian.terms) > 0
+
+
+def test_qaoa_ansatz_per_component():
+    x = jm.BinaryVar("x", shape=(4,))
+    problem = jm.Problem("separable")
+    problem += x[0] * x[1] + x[2] * x[3] - x[0] - x[3]
+    qaoa_converter = QAOAConverter(jmt.compile_model(problem, {}))
+
+    subs = qaoa_converter.get_ising().decompose()
+    assert len(subs) == 2
+    circuits = [qaoa_converter.get_qaoa_ansatz(p=1, ising=sub) for sub in subs]
+    assert [circuit.num_qubits for circuit in circuits] == [2, 2]
+    assert circuits[1].qubits_label == ["x_{2}", "x_{3}"]
+
+
+def test_qaoa_higher_order_terms():
+    x = jm.BinaryVar("x", shape=(3,))
+    problem = jm.Problem("cubic")
+    problem += 2 * x[0] * x[1] * x[2] - x[0] - x[1]
+    qaoa_converter = QAOAConverter(jmt.compile_model(problem, {}))
+
+    hubo = qaoa_converter.get_hubo_ising()
+    assert hubo.degree() == 3
+    circuit = qaoa_converter.get_qaoa_ansatz(p=1, ising=hubo)
+    assert circuit.num_qubits == 3
+
+    hamiltonian = qaoa_converter.get_cost_hamiltonian(ising=hubo)
+    assert max(len(ops) for ops in hamiltonian.terms) == 3
+
+    sampleset = qaoa_converter.decode_bits_to_sampleset(
+        qm_bs.BitsSampleSet([qm_bs.BitsSample(1, [1, 1, 0])]), ising=hubo
+    )
+    assert sampleset.data[0].eval.objective == -2.0
+
+
+def test_decode_higher_order_bits_after_get_ising():
+    x = jm.BinaryVar("x", shape=(3,))
+    problem = jm.Problem("chain")
+    problem += x[0] * x[1] + x[1] * x[2] - 3 * x[0] - x[2]
+    qaoa_converter = QAOAConverter(jmt.compile_model(problem, {}), presolve=True)
+
+    hubo = qaoa_converter.get_hubo_ising()
+    # Presolve fixes every spin of get_ising(), while the HUBO model keeps all three.
+    assert qaoa_converter.get_ising().num_bits() == 0
+    bits = [[0, 1, 1], [1, 0, 1]]
+    assert qaoa_converter.select_by_energy(bits, top_k=1, ising=hubo).tolist() == [1]
+    sampleset = qaoa_converter.decode_bits_array(bits, ising=hubo)
+    assert [sample.eval.objective for sample in sampleset.data] == [0.0, -4.0]
+
+
+def test_qaoa_simulator_decodes(qaoa_converter):
+    simulator = qaoa_converter.get_qaoa_simulator()
+    assert simulator.num_qubits == qaoa_converter.get_ising().num_bits()
+    sampleset = qaoa_converter.decode_bits_to_sampleset(
+        simulator.sample([0.2], [0.4], shots=100, seed=0)
+    )
+    assert sum(sample.num_occurrences for sample in sampleset.data) == 100
+
+
+def test_p1_evaluator(qaoa_converter):
+    evaluator = qaoa_converter.get_p1_evaluator()
+    simulator = qaoa_converter.get_qaoa_simulator()
+    assert float(evaluator.expectation(0.4, 0.2)) == pytest.approx(
+        simulator.expectation([0.2], [0.4])
+    )
+    with pytest.raises(ValueError):
+        qaoa_converter.get_p1_evaluator(qaoa_converter.get_hubo_ising())
@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+import jijmodeling as jm
+import jijmodeling_transpiler.core as jmt
+import qamomile.core.bitssample as qm_bs
+from qamomile.core.converters.qaoa import QAOAConverter
+from qamomile.core.converters.streaming import DecodeSummary, iter_bits_chunks
+
+
+@pytest.fixture
+def converter():
+    n = jm.Placeholder("n")
+    d = jm.Placeholder("d", ndim=1)
+    x = jm.BinaryVar("x", shape=(n,))
+    i = jm.Element("i", n)
+    problem = jm.Problem("one_hot")
+    problem += jm.sum(i, d[i] * x[i])
+    problem += jm.Constraint("one", jm.sum(i, x[i]) == 1)
+    return QAOAConverter(jmt.compile_model(problem, {"n": 4, "d": [3.0, 1.0, 2.0, -1.0]}))
+
+
+def test_iter_bits_chunks():
+    bits = np.array([[0, 1], [1, 0], [1, 1]])
+    chunks = list(iter_bits_chunks([bits, (bits[:1], [5])], chunk_size=2))
+    assert [chunk.tolist() for chunk, _ in chunks] == [
+        [[0, 1], [1, 0]],
+        [[1, 1]],
+        [[0, 1]],
+    ]
+    assert [counts.tolist() for _, counts in chunks] == [[1, 1], [1], [5]]
+
+    with pytest.raises(ValueError):
+        list(iter_bits_chunks([bits], chunk_size=0))
+
+
+def test_decode_stream(converter):
+    converter.get_ising()
+    bits = np.array(
+        [[1, 0, 0, 0], [0, 1, 0, 0], [1, 1, 0, 0], [0, 0, 0, 1]], dtype=np.uint8
+    )
+    samplesets = list(converter.decode_stream([bits], chunk_size=3))
+    assert [len(sampleset.data) for sampleset in samplesets] == [3, 1]
+    objectives = [s.eval.objective for ss in samplesets for s in ss.data]
+    assert objectives == [
+        s.eval.objective for s in converter.decode_bits_array(bits).data
+    ]
+
+
+def test_summarize_stream(converter):
+    converter.get_ising()
+    batches = [
+        qm_bs.BitsSampleSet(
+            [
+                qm_bs.BitsSample(3, [1, 0, 0, 0]),
+                qm_bs.BitsSample(2, [1, 1, 0, 0]),
+                qm_bs.BitsSample(1, [0, 0, 1, 0]),
+            ]
+        ),
+        (np.array([[0, 0, 0, 1], [1, 0, 0, 0]]), [4, 1]),
+    ]
+    summary = converter.summarize_stream(
+        batches, k=2, bins=[-2.0, 0.0, 2.0, 4.0], chunk_size=2
+    )
+    assert summary.num_shots == 11
+    assert summary.num_feasible_shots == 9
+    assert summary.min_objective == -1.0
+    assert summary.max_objective == 4.0
+    assert summary.histogram.tolist() == [4, 0, 7]
+    assert summary.feasible_histogram.tolist() == [4, 0, 5]
+    assert summary.best_objective.tolist() == [-1.0, 2.0]
+    assert summary.best_counts.tolist() == [4, 1]
+    assert [s.num_occurrences for s in summary.best.data] == [4, 1]
+    assert [s.eval.objective for s in summary.best.data] == [-1.0, 2.0]
+
+
+def test_decode_summary_without_feasible_samples():
+    summary = DecodeSummary(k=3)
+    summary.update(
+        np.array([[1, 1]], dtype=np.uint8), np.array([2]), np.array([1.0]), np.array([1.0])
+    )
+    assert summary.num_shots == 2
+    assert summary.num_feasible_shots == 0
+    assert len(summary.best_bits) == 0
+
+
+@pytest.mark.parametrize("maximize", [False, True])
+def test_decode_summary_ties_at_k(maximize):
+    summary = DecodeSummary(k=1, maximize=maximize)
+    low, high = np.array([[0, 1]], dtype=np.uint8), np.array([[1, 0]], dtype=np.uint8)
+    for bits, count in [(high, 2), (low, 1), (high, 3), (low, 4)]:
+        summary.update(bits, np.array([count]), np.array([1.0]), np.array([0.0]))
+    # Ties are broken by the bits, so the kept bitstring was never evicted.
+    assert summary.best_bits.tolist() == low.tolist()
+    assert summary.best_counts.tolist() == [5]
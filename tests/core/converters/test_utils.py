@@ -1,4 +1,12 @@
-from qamomile.core.converters.utils import is_close_zero
+import qamomile.core.operator as qm_o
+from qamomile.core.converters.utils import (
+    encode_hubo_terms,
+    encode_ising_terms,
+    ising_coefficient_arrays,
+    is_close_zero,
+)
+from qamomile.core.ising_qubo import HUBOIsingModel, IsingModel
+
 
 def test_is_close_zero():
     val = 1e-16
@@ -9,4 +17,57 @@ def test_is_close_zero():
     assert is_close_zero(val)
 
     val = 1e-14
-    assert is_close_zero(val, abs_tol=1e-14)
\ No newline at end of file
+    assert is_close_zero(val, abs_tol=1e-14)
+
+
+def test_ising_coefficient_arrays():
+    ising = IsingModel({(0, 1): 2.0, (1, 1): 1.0, (2, 3): 1e-16}, {0: 0.0, 1: 3.0}, 0.5)
+    linear, h, pairs, J, constant = ising_coefficient_arrays(ising)
+    assert linear.tolist() == [1]
+    assert h.tolist() == [3.0]
+    assert pairs.tolist() == [[0, 1]]
+    assert J.tolist() == [2.0]
+    assert constant == 1.5
+
+    linear, h, pairs, J, constant = ising_coefficient_arrays(IsingModel({}, {}, 0.0))
+    assert len(linear) == len(h) == len(pairs) == len(J) == 0
+    assert pairs.shape == (0, 2)
+
+
+def test_encode_ising_terms():
+    ising = IsingModel({(0, 1): 2.0, (1, 2): -1.0}, {0: 1.0, 2: 0.5}, 0.5)
+    expected = qm_o.Hamiltonian()
+    for i, hi in ising.linear.items():
+        expected.add_term((qm_o.PauliOperator(qm_o.Pauli.Z, i),), hi)
+    for (i, j), Jij in ising.quad.items():
+        expected.add_term(
+            (qm_o.PauliOperator(qm_o.Pauli.Z, i), qm_o.PauliOperator(qm_o.Pauli.Z, j)),
+            Jij,
+        )
+    expected.constant = 0.5
+    assert encode_ising_terms(ising) == expected
+
+    encoded_ope = {
+        0: qm_o.PauliOperator(qm_o.Pauli.X, 0),
+        1: qm_o.PauliOperator(qm_o.Pauli.Y, 0),
+        2: qm_o.PauliOperator(qm_o.Pauli.Z, 1),
+    }
+    hamiltonian = encode_ising_terms(ising, encoded_ope, linear_scale=2.0, quad_scale=3.0)
+    X0 = qm_o.PauliOperator(qm_o.Pauli.X, 0)
+    Y0 = qm_o.PauliOperator(qm_o.Pauli.Y, 0)
+    Z0 = qm_o.PauliOperator(qm_o.Pauli.Z, 0)
+    Z1 = qm_o.PauliOperator(qm_o.Pauli.Z, 1)
+    # X0 * Y0 = i Z0
+    assert hamiltonian.terms == {(X0,): 2.0, (Z1,): 1.0, (Z0,): 6.0j, (Y0, Z1): -3.0}
+    assert hamiltonian.constant == 0.5
+
+
+def test_encode_hubo_terms():
+    hubo = HUBOIsingModel({(0, 1, 2): 2.0, (1,): -1.0, (0, 2): 1e-16}, 0.5)
+    expected = qm_o.Hamiltonian()
+    expected.add_term(
+        tuple(qm_o.PauliOperator(qm_o.Pauli.Z, i) for i in (0, 1, 2)), 2.0
+    )
+    expected.add_term((qm_o.PauliOperator(qm_o.Pauli.Z, 1),), -1.0)
+    expected.constant = 0.5
+    assert encode_hubo_terms(hubo) == expected
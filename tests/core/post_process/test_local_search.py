@@ -108,3 +108,21 @@ def test_decode(local_search_instance):
     assert isinstance(result, jm.experimental.SampleSet)
     assert state_dict == expected_state_dict
     assert obj == -8
+
+
+def test_run_decompose():
+    x = jm.BinaryVar("x", shape=(4,))
+    problem = jm.Problem("separable")
+    problem += 4 * x[0] * x[1] - 3 * x[0] - 2 * x[1] + 4 * x[2] * x[3] - x[2] - 5 * x[3]
+    converter = QAOAConverter(jmt.compile_model(problem, {}))
+    local_search = LocalSearch(converter)
+    assert len(local_search.ising.connected_components()) == 2
+
+    initial_state = np.array([1, 1, 1, 1])
+    expected = local_search.run(initial_state, local_search_method="first_improvement")
+    result = local_search.run(
+        initial_state, local_search_method="first_improvement", decompose=True
+    )
+    assert result.data[0].eval.objective == pytest.approx(
+        expected.data[0].eval.objective
+    )
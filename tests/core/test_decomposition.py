@@ -0,0 +1,56 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from qamomile.core.bitssample import BitsSample, BitsSampleSet
+from qamomile.core.decomposition import solve_components, stitch_bits_samplesets
+from qamomile.core.ising_qubo import IsingModel
+
+
+def brute_force(ising: IsingModel) -> BitsSampleSet:
+    n = ising.num_bits()
+    bits = min(
+        itertools.product([0, 1], repeat=n),
+        key=lambda b: ising.calc_energy([1 - 2 * x for x in b]),
+    )
+    return BitsSampleSet([BitsSample(1, list(bits))])
+
+
+def test_stitch_bits_samplesets():
+    components = [np.array([0, 2]), np.array([1, 3])]
+    samplesets = [
+        BitsSampleSet([BitsSample(3, [1, 0]), BitsSample(1, [0, 1])]),
+        BitsSampleSet([BitsSample(2, [1, 1])]),
+    ]
+    stitched = stitch_bits_samplesets(components, samplesets, num_bits=5, seed=1)
+    assert stitched.total_samples() == 4
+    counts = {tuple(s.bits): s.num_occurrences for s in stitched.bitarrays}
+    assert counts == {(1, 1, 0, 1, 0): 3, (0, 1, 1, 1, 0): 1}
+
+    with pytest.raises(ValueError):
+        stitch_bits_samplesets(components, samplesets[:1], num_bits=5)
+    with pytest.raises(ValueError):
+        stitch_bits_samplesets(components, [samplesets[0], BitsSampleSet([])], num_bits=5)
+
+
+def test_solve_components_matches_brute_force():
+    ising = IsingModel(
+        {(0, 1): 1.0, (1, 2): -0.5, (3, 4): -1.0, (5, 6): 2.0},
+        {0: 0.3, 3: -0.2, 6: 0.7, 7: -1.0},
+        1.0,
+    )
+    result = solve_components(ising, brute_force)
+    assert len(result.bitarrays) == 1
+    best = result.bitarrays[0].bits
+    spins = [1 - 2 * b for b in best]
+    assert ising.calc_energy(spins) == pytest.approx(
+        ising.calc_energy([1 - 2 * b for b in brute_force(ising).bitarrays[0].bits])
+    )
+
+
+def test_solve_components_process_pool():
+    ising = IsingModel({(0, 1): 1.0, (2, 3): -1.0}, {0: 0.5, 2: 0.5}, 0.0)
+    assert solve_components(ising, brute_force, max_workers=2) == solve_components(
+        ising, brute_force
+    )
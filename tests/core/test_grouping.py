@@ -0,0 +1,153 @@
+import numpy as np
+import pytest
+
+import qamomile.core.bitssample as qm_bs
+import qamomile.core.circuit as qm_c
+import qamomile.core.operator as qm_o
+from qamomile.core.grouping import (
+    conflict_graph,
+    dsatur_coloring,
+    greedy_coloring,
+    group_commuting_terms,
+)
+
+_PAULI_MATRICES = {
+    qm_o.Pauli.X: np.array([[0, 1], [1, 0]], dtype=complex),
+    qm_o.Pauli.Y: np.array([[0, -1j], [1j, 0]]),
+    qm_o.Pauli.Z: np.array([[1, 0], [0, -1]], dtype=complex),
+}
+_GATE_MATRICES = {
+    qm_c.SingleQubitGateType.H: np.array([[1, 1], [1, -1]]) / np.sqrt(2),
+    qm_c.SingleQubitGateType.S: np.diag([1, 1j]),
+    qm_c.SingleQubitGateType.Z: np.diag([1, -1]),
+}
+
+
+def _embed(single: dict[int, np.ndarray], num_qubits: int) -> np.ndarray:
+    # qubit 0 is the least significant bit
+    mat = np.eye(1)
+    for q in range(num_qubits):
+        mat = np.kron(single.get(q, np.eye(2)), mat)
+    return mat
+
+
+def _term_matrix(term, num_qubits):
+    return _embed({op.index: _PAULI_MATRICES[op.pauli] for op in term}, num_qubits)
+
+
+def _controlled(gate, num_qubits):
+    dim = 2**num_qubits
+    mat = np.zeros((dim, dim), dtype=complex)
+    for i in range(dim):
+        if (i >> gate.control) & 1:
+            if gate.gate == qm_c.TwoQubitGateType.CNOT:
+                mat[i ^ (1 << gate.target), i] = 1
+            else:
+                mat[i, i] = -1 if (i >> gate.target) & 1 else 1
+        else:
+            mat[i, i] = 1
+    return mat
+
+
+def _circuit_matrix(circuit):
+    n = circuit.num_qubits
+    unitary = np.eye(2**n, dtype=complex)
+    for gate in circuit.gates:
+        if isinstance(gate, qm_c.SingleQubitGate):
+            mat = _embed({gate.qubit: _GATE_MATRICES[gate.gate]}, n)
+        else:
+            mat = _controlled(gate, n)
+        unitary = mat @ unitary
+    return unitary
+
+
+def _random_hamiltonian(rng, num_qubits, num_terms):
+    h = qm_o.Hamiltonian()
+    for _ in range(num_terms):
+        size = int(rng.integers(1, num_qubits + 1))
+        indices = rng.choice(num_qubits, size=size, replace=False)
+        term = tuple(
+            qm_o.PauliOperator(qm_o.Pauli(int(rng.integers(3))), int(i))
+            for i in indices
+        )
+        h.add_term(term, float(rng.normal()))
+    return h
+
+
+def _check_groups(h, groups, kind):
+    n = h.num_qubits
+    grouped = {}
+    for group in groups:
+        terms = list(group.hamiltonian.terms)
+        unitary = _circuit_matrix(group.circuit)
+        for k, term in enumerate(terms):
+            for other in terms:
+                a, b = _term_matrix(term, n), _term_matrix(other, n)
+                assert np.allclose(a @ b, b @ a)
+                if kind == "qubit_wise":
+                    ops = {op.index: op.pauli for op in other}
+                    assert all(ops.get(op.index, op.pauli) == op.pauli for op in term)
+            diagonal = {
+                q: _PAULI_MATRICES[qm_o.Pauli.Z] for q in np.flatnonzero(group.z_masks[k])
+            }
+            expected = group.signs[k] * _embed(diagonal, n)
+            transformed = unitary @ _term_matrix(term, n) @ unitary.conj().T
+            assert np.allclose(transformed, expected)
+        grouped.update(group.hamiltonian.terms)
+    assert grouped == h.terms
+
+
+@pytest.mark.parametrize("kind", ["qubit_wise", "general"])
+@pytest.mark.parametrize("coloring", ["dsatur", "greedy"])
+def test_group_commuting_terms(kind, coloring):
+    rng = np.random.default_rng(3)
+    h = _random_hamiltonian(rng, 4, 40)
+    groups = group_commuting_terms(h, kind=kind, coloring=coloring)
+    _check_groups(h, groups, kind)
+    assert len(groups) < len(h.terms)
+
+
+def test_general_grouping_needs_fewer_groups():
+    h = qm_o.X(0) * qm_o.X(1) + qm_o.Y(0) * qm_o.Y(1) + qm_o.Z(0) * qm_o.Z(1)
+    assert len(group_commuting_terms(h, kind="qubit_wise")) == 3
+    groups = group_commuting_terms(h, kind="general")
+    assert len(groups) == 1
+    _check_groups(h, groups, "general")
+
+
+def test_symplectic_storage_grouping():
+    rng = np.random.default_rng(5)
+    h = _random_hamiltonian(rng, 3, 15)._copy("symplectic")
+    groups = group_commuting_terms(h, kind="general")
+    assert all(group.hamiltonian.storage == "symplectic" for group in groups)
+    _check_groups(h, groups, "general")
+
+
+def test_group_expectation():
+    # |00> measured in the Z basis and |++> measured after the basis change.
+    h = 2.0 * qm_o.Z(0) * qm_o.Z(1) - qm_o.Z(1) + 0.5 * qm_o.X(0) * qm_o.X(1)
+    groups = group_commuting_terms(h, kind="qubit_wise")
+    samples = qm_bs.BitsSampleSet([qm_bs.BitsSample(10, [0, 0])])
+    values = {}
+    for group in groups:
+        values[frozenset(group.hamiltonian.terms)] = group.expectation(samples)
+    assert sorted(values.values()) == [0.5, 1.0]
+
+
+def test_coloring_is_proper():
+    rng = np.random.default_rng(0)
+    x = rng.integers(0, 64, size=(60, 1)).astype(np.uint64)
+    z = rng.integers(0, 64, size=(60, 1)).astype(np.uint64)
+    indptr, indices = conflict_graph(x, z, kind="general", max_pairs=100)
+    full_indptr, full_indices = conflict_graph(x, z, kind="general")
+    np.testing.assert_array_equal(indptr, full_indptr)
+    np.testing.assert_array_equal(indices, full_indices)
+    for coloring in (greedy_coloring, dsatur_coloring):
+        colors = coloring(indptr, indices)
+        for v in range(60):
+            neighbors = indices[indptr[v] : indptr[v + 1]]
+            assert np.all(colors[neighbors] != colors[v])
+
+
+def test_empty_hamiltonian():
+    assert group_commuting_terms(qm_o.Hamiltonian()) == []
@@ -0,0 +1,38 @@
+import subprocess
+import sys
+
+# Generous enough for slow CI machines, while an eager import of the converters
+# (jijmodeling, jijmodeling_transpiler, dimod, networkx, ...) takes several times longer.
+IMPORT_TIME_BUDGET = 0.5
+
+
+def _run(code: str) -> str:
+    return subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    ).stdout
+
+
+def test_import_core_does_not_import_jijmodeling():
+    output = _run(
+        "import sys, qamomile.core; "
+        "print(sorted(m for m in ('jijmodeling', 'jijmodeling_transpiler') if m in sys.modules))"
+    )
+    assert output.strip() == "[]"
+
+
+def test_lazy_submodules():
+    output = _run(
+        "import qamomile.core as qm; "
+        "print(qm.qaoa.QAOAConverter.__name__, qm.circuit.QuantumCircuit.__name__)"
+    )
+    assert output.split() == ["QAOAConverter", "QuantumCircuit"]
+
+
+def test_import_time_budget():
+    elapsed = float(
+        _run(
+            "import time; start = time.perf_counter(); import qamomile.core; "
+            "print(time.perf_counter() - start)"
+        )
+    )
+    assert elapsed < IMPORT_TIME_BUDGET
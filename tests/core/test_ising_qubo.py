@@ -1,5 +1,16 @@
-from qamomile.core.ising_qubo import qubo_to_ising, IsingModel
+import copy
+import dataclasses
+
+from qamomile.core.ising_qubo import (
+    qubo_to_ising,
+    hubo_to_ising,
+    HUBOIsingModel,
+    IsingModel,
+    calc_qubo_energy,
+    calc_qubo_energy_batch,
+)
 import numpy as np
+import pytest
 
 
 def test_onehot_conversion():
@@ -132,3 +143,215 @@ def test_normalize_by_rms():
     np.testing.assert_allclose(ising.linear[0], 1.0 / expected_factor)
     np.testing.assert_allclose(ising.linear[1], -1.0 / expected_factor)
     np.testing.assert_allclose(ising.constant, 6.0 / expected_factor)
+
+
+def test_ising_model_arrays():
+    ising = IsingModel({(0, 1): 2.0, (1, 3): -1.0}, {2: 5.0}, 6.0)
+    assert ising.quad_indices.tolist() == [[0, 1], [1, 3]]
+    assert ising.quad_values.tolist() == [2.0, -1.0]
+    assert ising.linear_indices.tolist() == [2]
+    assert ising.linear_values.tolist() == [5.0]
+    assert ising.num_bits() == 4
+
+    same = IsingModel.from_arrays(
+        ising.quad_indices, ising.quad_values, [2], [5.0], 6.0
+    )
+    assert same == ising
+    assert same.quad == {(0, 1): 2.0, (1, 3): -1.0}
+    assert same.linear == {2: 5.0}
+
+    with pytest.raises(ValueError):
+        IsingModel.from_arrays([[0, 1]], [1.0, 2.0], [], [], 0.0)
+
+
+def test_ising_model_mutation():
+    ising = IsingModel({(0, 1): 2.0, (1, 3): -1.0}, {2: 5.0}, 6.0)
+    states = np.array([[1, -1, 1, -1, 1], [-1, -1, 1, 1, 1]])
+    ising.calc_energy_batch(states)
+
+    # Changes of the dictionaries are written back to the arrays, the size and the energies.
+    ising.quad[(0, 1)] = 1.0
+    ising.quad[(3, 4)] = 0.5
+    del ising.linear[2]
+    ising.linear[0] = -1.0
+    assert ising.quad_indices.tolist() == [[0, 1], [1, 3], [3, 4]]
+    assert ising.quad_values.tolist() == [1.0, -1.0, 0.5]
+    assert ising.linear == {0: -1.0}
+    assert ising.num_bits() == 5
+    expected = IsingModel(dict(ising.quad), dict(ising.linear), 6.0)
+    assert ising.calc_energy_batch(states).tolist() == [
+        expected.calc_energy(state) for state in states
+    ]
+
+    ising.quad = {(0, 2): 3.0}
+    ising.linear = {1: 1.0}
+    assert ising.quad_values.tolist() == [3.0]
+    assert ising.linear_indices.tolist() == [1]
+    assert ising.num_bits() == 3
+    held = ising.quad
+    ising.normalize_by_abs_max()
+    assert held == {(0, 2): 1.0}
+
+    replaced = dataclasses.replace(ising, constant=1.0)
+    assert replaced.quad == {(0, 2): 1.0} and replaced.constant == 1.0
+    duplicate = copy.copy(ising)
+    duplicate.quad[(0, 2)] = 0.0
+    assert ising.quad[(0, 2)] == 1.0
+
+
+def test_calc_energy_batch():
+    rng = np.random.default_rng(0)
+    quad = {(0, 1): 2.0, (1, 2): -1.5, (0, 3): 0.5, (2, 2): 1.0}
+    linear = {0: 1.0, 3: -2.0}
+    ising = IsingModel(quad, linear, 0.25)
+    states = rng.choice([-1, 1], size=(50, 5))
+
+    energies = ising.calc_energy_batch(states)
+    assert energies.shape == (50,)
+    for state, energy in zip(states, energies):
+        expected = 0.25
+        for (i, j), value in quad.items():
+            expected += value * state[i] * state[j]
+        for i, value in linear.items():
+            expected += value * state[i]
+        assert np.isclose(energy, expected)
+        assert np.isclose(ising.calc_energy(list(state)), expected)
+
+    with pytest.raises(ValueError):
+        ising.calc_energy_batch(states[:, :3])
+
+    constant_only = IsingModel({}, {}, 3.0)
+    assert constant_only.calc_energy_batch(np.zeros((2, 0))).tolist() == [3.0, 3.0]
+
+
+def test_normalize_keeps_arrays_in_sync():
+    ising = IsingModel({(0, 1): 2.0}, {0: 4.0}, 6.0)
+    assert ising.calc_energy_batch(np.array([[1, 1]])).tolist() == [12.0]
+    ising.normalize_by_abs_max()
+    assert ising.quad == {(0, 1): 0.5}
+    assert ising.linear == {0: 1.0}
+    assert ising.calc_energy_batch(np.array([[1, 1]])).tolist() == [3.0]
+
+
+def test_qubo_to_ising_sparse_input():
+    import scipy.sparse
+
+    qubo = {(0, 1): 2.0, (0, 0): -1.0, (1, 1): -1.0, (1, 3): 1.5, (3, 3): 0.5}
+    rows, cols = zip(*qubo.keys())
+    matrix = scipy.sparse.coo_matrix((list(qubo.values()), (rows, cols)), shape=(4, 4))
+    expected = qubo_to_ising(qubo)
+    ising = qubo_to_ising(matrix)
+    assert ising.quad == pytest.approx(expected.quad)
+    assert ising.linear == pytest.approx(expected.linear)
+    assert ising.constant == pytest.approx(expected.constant)
+
+    states = np.array([[0, 1, 0, 1], [1, 1, 0, 0]])
+    for state in states:
+        spins = 1 - 2 * state
+        assert ising.calc_energy(spins.tolist()) == pytest.approx(
+            calc_qubo_energy(qubo, state.tolist())
+        )
+
+
+def test_qubo_to_ising_constant():
+    ising = qubo_to_ising({(0, 0): 2.0}, constant=3.0)
+    assert ising.constant == 4.0
+    assert ising.linear == {0: -1.0}
+
+
+def test_qubo_to_ising_simplify_compacts_indices():
+    qubo = {(5, 5): 1.0, (5, 2): 2.0, (2, 2): -0.5, (7, 9): 0.0}
+    ising = qubo_to_ising(qubo, simplify=True)
+    assert ising.index_map == {5: 0, 2: 1}
+    assert ising.linear == {0: -1.0, 1: -0.25}
+    assert ising.quad == {(0, 1): 0.5}
+    assert ising.constant == 0.75
+
+
+def test_calc_qubo_energy_batch():
+    import scipy.sparse
+
+    rng = np.random.default_rng(0)
+    qubo = {(0, 0): 1.0, (0, 2): -2.0, (1, 2): 0.5, (2, 1): 1.5, (3, 3): -1.0}
+    states = rng.integers(0, 2, size=(16, 4))
+    energies = calc_qubo_energy_batch(qubo, states)
+    assert energies.shape == (16,)
+    for state, energy in zip(states, energies):
+        assert energy == pytest.approx(calc_qubo_energy(qubo, state.tolist()))
+
+    rows, cols = zip(*qubo.keys())
+    matrix = scipy.sparse.csr_matrix((list(qubo.values()), (rows, cols)), shape=(4, 4))
+    assert np.allclose(calc_qubo_energy_batch(matrix, states), energies)
+
+    with pytest.raises(ValueError):
+        calc_qubo_energy_batch(qubo, states[:, :3])
+    with pytest.raises(ValueError):
+        calc_qubo_energy_batch(qubo, states[0])
+
+
+def test_connected_components_and_decompose():
+    ising = IsingModel(
+        {(0, 3): 1.0, (3, 5): -2.0, (1, 4): 0.5},
+        {0: 1.0, 2: -1.5, 4: 0.25},
+        2.0,
+    )
+    components = ising.connected_components()
+    assert [c.tolist() for c in components] == [[0, 3, 5], [1, 4], [2]]
+
+    subs = ising.decompose()
+    assert [sub.index_map for sub in subs] == [{0: 0, 1: 3, 2: 5}, {0: 1, 1: 4}, {0: 2}]
+    assert dict(subs[0].quad) == {(0, 1): 1.0, (1, 2): -2.0}
+    assert dict(subs[1].linear) == {1: 0.25}
+    assert [sub.num_bits() for sub in subs] == [3, 2, 1]
+
+    rng = np.random.default_rng(0)
+    states = rng.choice([-1, 1], size=(8, 6))
+    total = sum(
+        sub.calc_energy_batch(states[:, spins]) for spins, sub in zip(components, subs)
+    )
+    assert np.allclose(total, ising.calc_energy_batch(states))
+
+    assert IsingModel({}, {}, 1.0).decompose() == []
+
+
+def test_hubo_to_ising_matches_brute_force():
+    import itertools
+
+    hubo = {(0, 1, 2): 3.0, (1, 2): -2.0, (0,): 1.0, (2, 3, 3): 0.5, (3, 1, 0, 2): -1.5}
+    ising = hubo_to_ising(hubo, constant=0.25)
+    assert ising.degree() == 4
+    assert ising.num_bits() == 4
+
+    bits = np.array(list(itertools.product([0, 1], repeat=4)))
+    expected = 0.25 + sum(
+        value * np.prod(bits[:, list(set(key))], axis=1) for key, value in hubo.items()
+    )
+    np.testing.assert_allclose(ising.calc_energy_batch(1 - 2 * bits), expected)
+    assert ising.calc_energy(list(1 - 2 * bits[5])) == pytest.approx(expected[5])
+
+
+def test_hubo_ising_model_round_trip():
+    ising = IsingModel({(0, 1): 2.0, (1, 2): -1.0}, {0: 0.5}, 1.0)
+    hubo = HUBOIsingModel.from_ising(ising)
+    assert hubo.degree() == 2
+    back = hubo.to_ising()
+    assert back.quad == ising.quad
+    assert back.linear == ising.linear
+    assert back.constant == ising.constant
+
+    with pytest.raises(ValueError):
+        HUBOIsingModel({(0, 1, 2): 1.0}, 0.0).to_ising()
+    with pytest.raises(ValueError):
+        HUBOIsingModel.from_arrays([0, 0], [], [1.0], 0.0)
+
+
+def test_hubo_ising_model_normalize():
+    hubo = HUBOIsingModel({(0, 1, 2): 4.0, (1,): -2.0}, 1.0)
+    hubo.normalize_by_abs_max()
+    assert hubo.terms == {(0, 1, 2): 1.0, (1,): -0.5}
+    assert hubo.constant == 0.25
+
+
+def test_qubo_to_ising_rejects_higher_order_keys():
+    with pytest.raises(ValueError, match="hubo_to_ising"):
+        qubo_to_ising({(0, 1, 2): 1.0})
@@ -1,3 +1,5 @@
+import pytest
+import numpy as np
 import qamomile.core.operator as qm_o
 
 
@@ -15,6 +17,21 @@ def test_pauli_operator_creation():
     assert Z2.index == 2
 
 
+
+def test_pauli_operator_interning():
+    X0 = qm_o.PauliOperator(qm_o.Pauli.X, 0)
+    assert qm_o.PauliOperator(qm_o.Pauli.X, 0) is X0
+    assert qm_o.PauliOperator(qm_o.Pauli.X, 1) is not X0
+    assert not hasattr(X0, "__dict__")
+    with pytest.raises(AttributeError):
+        X0.index = 1
+
+    import copy
+    import pickle
+
+    assert pickle.loads(pickle.dumps(X0)) is X0
+    assert copy.deepcopy((X0,))[0] is X0
+
 def test_add_term():
     X0 = qm_o.PauliOperator(qm_o.Pauli.X, 0)
     Y0 = qm_o.PauliOperator(qm_o.Pauli.Y, 0)
@@ -377,4 +394,426 @@ def test_coeff_complex():
     expected_h.add_term((qm_o.PauliOperator(qm_o.Pauli.Y, 0),), -1.0)
     assert h == expected_h
 
-    
\ No newline at end of file
+    
+
+def test_symplectic_storage_add_term():
+    X0 = qm_o.PauliOperator(qm_o.Pauli.X, 0)
+    Y0 = qm_o.PauliOperator(qm_o.Pauli.Y, 0)
+    Z0 = qm_o.PauliOperator(qm_o.Pauli.Z, 0)
+    Y1 = qm_o.PauliOperator(qm_o.Pauli.Y, 1)
+    Y2 = qm_o.PauliOperator(qm_o.Pauli.Y, 2)
+
+    h = qm_o.Hamiltonian(storage="symplectic")
+    assert h.storage == "symplectic"
+    h.add_term((X0,), 1.0)
+    assert h.terms == {(X0,): 1.0}
+
+    h.add_term((Y2, Y1), 3.0)
+    assert h.terms == {(X0,): 1.0, (Y1, Y2): 3.0}
+
+    h.add_term((X0,), 1.0)
+    assert h.terms == {(X0,): 2.0, (Y1, Y2): 3.0}
+
+    h.add_term((X0, X0), -1.0)
+    assert h.terms == {(X0,): 2.0, (Y1, Y2): 3.0}
+    assert h.constant == -1.0
+
+    h.add_term((X0, Y0), -4.0)
+    assert h.terms == {(X0,): 2.0, (Y1, Y2): 3.0, (Z0,): -4.0j}
+    assert h.constant == -1.0
+    assert h.num_qubits == 3
+
+
+def test_symplectic_storage_many_qubits():
+    h = qm_o.Hamiltonian(storage="symplectic")
+    h.add_term((qm_o.PauliOperator(qm_o.Pauli.Z, 3),), 1.0)
+    h.add_term((qm_o.PauliOperator(qm_o.Pauli.X, 130),), 2.0)
+    h.add_term((qm_o.PauliOperator(qm_o.Pauli.Z, 3),), 1.0)
+    assert h.num_qubits == 131
+    assert h.terms == {
+        (qm_o.PauliOperator(qm_o.Pauli.Z, 3),): 2.0,
+        (qm_o.PauliOperator(qm_o.Pauli.X, 130),): 2.0,
+    }
+
+
+def test_symplectic_storage_arithmetic():
+    def build(storage):
+        x0 = qm_o.Hamiltonian(storage=storage)
+        x0.add_term((qm_o.PauliOperator(qm_o.Pauli.X, 0),), 1.0)
+        y1 = qm_o.Hamiltonian(storage=storage)
+        y1.add_term((qm_o.PauliOperator(qm_o.Pauli.Y, 1),), 1.0)
+        z0 = qm_o.Hamiltonian(storage=storage)
+        z0.add_term((qm_o.PauliOperator(qm_o.Pauli.Z, 0),), 1.0)
+        h1 = 2.0 * x0 + y1 - 1.5
+        h2 = x0 * z0 + 3 * y1 + 0.5j
+        return h1 * h2 - h2 + 2.0 * h1
+
+    expected = build("dict")
+    actual = build("symplectic")
+    assert actual.storage == "symplectic"
+    assert actual == expected
+
+    mixed = qm_o.X(0) + qm_o.Hamiltonian(storage="symplectic")
+    assert mixed.storage == "symplectic"
+    assert mixed == qm_o.X(0)
+
+
+def test_invalid_storage():
+    with pytest.raises(ValueError):
+        qm_o.Hamiltonian(storage="list")
+
+
+def test_Hamiltonian_vectorized_multiplication():
+    rng = np.random.default_rng(0)
+
+    def random_hamiltonian(num_terms):
+        h = qm_o.Hamiltonian()
+        for _ in range(num_terms):
+            indices = rng.choice(4, size=2, replace=False)
+            term = tuple(
+                qm_o.PauliOperator(qm_o.Pauli(int(rng.integers(3))), int(i))
+                for i in indices
+            )
+            h.add_term(term, rng.normal() + 1j * rng.normal())
+        h.constant = rng.normal()
+        return h
+
+    h1 = random_hamiltonian(10)
+    h2 = random_hamiltonian(8)
+
+    expected = qm_o.Hamiltonian()
+    for term1, coeff1 in h1.terms.items():
+        for term2, coeff2 in h2.terms.items():
+            expected.add_term(term1 + term2, coeff1 * coeff2)
+    for term, coeff in h1.terms.items():
+        expected.add_term(term, coeff * h2.constant)
+    for term, coeff in h2.terms.items():
+        expected.add_term(term, coeff * h1.constant)
+    expected.constant += h1.constant * h2.constant
+
+    for h in (h1 * h2, h1._copy("symplectic") * h2):
+        assert h.terms.keys() == expected.terms.keys()
+        for term, coeff in expected.terms.items():
+            assert np.isclose(h.terms[term], coeff)
+        assert np.isclose(h.constant, expected.constant)
+
+
+@pytest.mark.parametrize("storage", ["dict", "symplectic"])
+def test_Hamiltonian_inplace_operations(storage):
+    x0 = qm_o.Hamiltonian(storage=storage)
+    x0.add_term((qm_o.PauliOperator(qm_o.Pauli.X, 0),), 1.0)
+    y1 = qm_o.Hamiltonian(storage=storage)
+    y1.add_term((qm_o.PauliOperator(qm_o.Pauli.Y, 1),), 1.0)
+
+    h = qm_o.Hamiltonian(storage=storage)
+    h_id = id(h)
+    h += 2.0 * x0
+    h += y1
+    h += 1.5
+    h -= y1 * 3.0
+    h -= 0.5
+    assert id(h) == h_id
+    assert h == 2.0 * x0 + y1 + 1.5 - 3.0 * y1 - 0.5
+
+    h *= 2.0
+    assert id(h) == h_id
+    assert h == 2.0 * (2.0 * x0 - 2.0 * y1 + 1.0)
+
+    expected = h * (x0 + 1.0)
+    h *= x0 + 1.0
+    assert id(h) == h_id
+    assert h == expected
+
+    h += h
+    assert h == 2.0 * expected
+
+    # The right-hand side is not modified.
+    assert x0.terms == {(qm_o.PauliOperator(qm_o.Pauli.X, 0),): 1.0}
+
+
+@pytest.mark.parametrize("storage", ["dict", "symplectic"])
+def test_Hamiltonian_accumulate(storage):
+    X0 = qm_o.PauliOperator(qm_o.Pauli.X, 0)
+    Y0 = qm_o.PauliOperator(qm_o.Pauli.Y, 0)
+    Z0 = qm_o.PauliOperator(qm_o.Pauli.Z, 0)
+    Y1 = qm_o.PauliOperator(qm_o.Pauli.Y, 1)
+
+    h = qm_o.Hamiltonian(storage=storage)
+    h.add_term((Z0,), 1.0)
+    h.accumulate(
+        [((X0,), 1.0), ((Y1, X0), 2.0), ((X0, X0), 3.0), ((X0, Y0), 1.0), ((Z0,), 1.0)]
+    )
+    assert h.terms == {(Z0,): 2.0 + 1.0j, (X0,): 1.0, (X0, Y1): 2.0}
+    assert h.constant == 3.0
+
+    h.accumulate([])
+    assert h.terms == {(Z0,): 2.0 + 1.0j, (X0,): 1.0, (X0, Y1): 2.0}
+
+
+@pytest.mark.parametrize("storage", ["dict", "symplectic"])
+def test_support_tracking(storage):
+    h = qm_o.Hamiltonian(storage=storage)
+    assert h.num_qubits == 0
+    assert h.support == frozenset()
+
+    h.add_term(
+        (qm_o.PauliOperator(qm_o.Pauli.X, 1), qm_o.PauliOperator(qm_o.Pauli.Z, 4)), 1.0
+    )
+    assert h.num_qubits == 5
+    assert h.support == frozenset({1, 4})
+
+    h += qm_o.Y(70)
+    assert h.num_qubits == 71
+    assert h.support == frozenset({1, 4, 70})
+
+    h.accumulate([((qm_o.PauliOperator(qm_o.Pauli.Z, 2),), 1.0)])
+    assert h.support == frozenset({1, 2, 4, 70})
+
+    product = h * (qm_o.X(9) + qm_o.Z(2))
+    assert product.support == frozenset({1, 2, 4, 9, 70})
+    assert product.num_qubits == 71
+
+    h *= qm_o.X(100)
+    assert h.num_qubits == 101
+    assert 100 in h.support
+
+
+def test_support_detects_direct_dict_insertion():
+    h = qm_o.Hamiltonian()
+    h.add_term((qm_o.PauliOperator(qm_o.Pauli.X, 0),), 1.0)
+    assert h.num_qubits == 1
+    h.terms[(qm_o.PauliOperator(qm_o.Pauli.Z, 5),)] = 1.0
+    assert h.num_qubits == 6
+    assert h.support == frozenset({0, 5})
+
+
+def _dense_matrix(h, num_qubits):
+    paulis = {
+        qm_o.Pauli.X: np.array([[0, 1], [1, 0]]),
+        qm_o.Pauli.Y: np.array([[0, -1j], [1j, 0]]),
+        qm_o.Pauli.Z: np.array([[1, 0], [0, -1]]),
+    }
+    mat = h.constant * np.eye(2**num_qubits, dtype=complex)
+    for term, coeff in h.terms.items():
+        ops = [np.eye(2)] * num_qubits
+        for op in term:
+            ops[op.index] = paulis[op.pauli]
+        kron = np.eye(1)
+        for op in ops:
+            kron = np.kron(op, kron)
+        mat += coeff * kron
+    return mat
+
+
+@pytest.mark.parametrize("storage", ["dict", "symplectic"])
+def test_to_sparse(storage):
+    h = qm_o.Hamiltonian(storage=storage)
+    h += qm_o.X(0) * qm_o.Y(2) + 0.5 * qm_o.Z(0) * qm_o.Z(1) - 1.5j * qm_o.Y(1)
+    h += qm_o.Y(0) * qm_o.Y(1) * qm_o.X(2) + 2.0
+    dense = _dense_matrix(h, 3)
+
+    matrix = h.to_sparse()
+    assert matrix.shape == (8, 8)
+    np.testing.assert_allclose(matrix.toarray(), dense)
+
+    np.testing.assert_allclose(
+        h.to_sparse(num_qubits=4).toarray(), np.kron(np.eye(2), dense)
+    )
+
+    # Qubit 0 is the most significant bit of the basis index.
+    reverse = [int(format(i, "03b")[::-1], 2) for i in range(8)]
+    np.testing.assert_allclose(
+        h.to_sparse(qubit_order="big").toarray(), dense[np.ix_(reverse, reverse)]
+    )
+
+
+def test_to_sparse_drops_cancelled_entries():
+    h = qm_o.X(0) * qm_o.Z(1) + qm_o.X(0)
+    # X0 Z1 + X0 vanishes when qubit 1 is in |1>.
+    assert h.to_sparse().nnz == 2
+    np.testing.assert_allclose(qm_o.Hamiltonian().to_sparse().toarray(), [[0.0]])
+
+
+def test_to_sparse_invalid_arguments():
+    h = qm_o.X(2)
+    with pytest.raises(ValueError):
+        h.to_sparse(num_qubits=2)
+    with pytest.raises(ValueError):
+        h.to_sparse(qubit_order="middle")
+
+
+@pytest.mark.parametrize("chunk_size", [3, 1 << 16])
+def test_as_linear_operator(chunk_size):
+    h = qm_o.X(0) * qm_o.Y(2) + 0.5 * qm_o.Z(0) * qm_o.Z(1) - 1.5 * qm_o.Y(1) + 2.0
+    dense = _dense_matrix(h, 3)
+    operator = h.as_linear_operator(chunk_size=chunk_size)
+    assert operator.shape == (8, 8)
+
+    rng = np.random.default_rng(0)
+    vector = rng.normal(size=8) + 1j * rng.normal(size=8)
+    np.testing.assert_allclose(operator @ vector, dense @ vector)
+    block = rng.normal(size=(8, 3))
+    np.testing.assert_allclose(operator @ block, dense @ block)
+
+    reverse = [int(format(i, "03b")[::-1], 2) for i in range(8)]
+    big = h.as_linear_operator(qubit_order="big", chunk_size=chunk_size)
+    np.testing.assert_allclose(
+        big @ vector, dense[np.ix_(reverse, reverse)] @ vector
+    )
+
+
+@pytest.mark.parametrize("storage", ["dict", "symplectic"])
+def test_diagonal(storage):
+    rng = np.random.default_rng(0)
+    h = qm_o.Hamiltonian(storage=storage)
+    for _ in range(20):
+        i, j = rng.choice(6, size=2, replace=False)
+        h += rng.normal() * qm_o.Z(i) * qm_o.Z(j)
+    for i in range(6):
+        h += rng.normal() * qm_o.Z(i)
+    h += 1.5
+    expected = np.diag(_dense_matrix(h, 6)).real
+
+    for chunk_size in (1, 8, 1 << 20):
+        diagonal = h.diagonal(chunk_size=chunk_size)
+        assert diagonal.dtype == np.float64
+        np.testing.assert_allclose(diagonal, expected)
+
+    np.testing.assert_allclose(
+        h.diagonal(num_qubits=7), np.concatenate([expected, expected])
+    )
+    np.testing.assert_allclose(
+        h.diagonal(qubit_order="big"),
+        h.to_sparse(qubit_order="big").diagonal().real,
+    )
+
+
+def test_diagonal_out(tmp_path):
+    h = qm_o.Z(0) + 2.0 * qm_o.Z(0) * qm_o.Z(2) - 0.5
+    expected = np.diag(_dense_matrix(h, 3)).real
+
+    out = np.zeros(8)
+    assert h.diagonal(out=out) is out
+    np.testing.assert_allclose(out, expected)
+
+    path = tmp_path / "diagonal.bin"
+    diagonal = h.diagonal(out=path, chunk_size=2)
+    assert isinstance(diagonal, np.memmap)
+    diagonal.flush()
+    np.testing.assert_allclose(np.memmap(path, dtype=np.float64, mode="r"), expected)
+
+    with pytest.raises(ValueError):
+        h.diagonal(out=np.zeros(4))
+
+
+def test_diagonal_complex_and_invalid():
+    h = qm_o.Hamiltonian()
+    h.add_term((qm_o.PauliOperator(qm_o.Pauli.Z, 1),), 1.0j)
+    np.testing.assert_allclose(h.diagonal(), [1.0j, 1.0j, -1.0j, -1.0j])
+
+    assert qm_o.Hamiltonian().diagonal().tolist() == [0.0]
+    with pytest.raises(ValueError):
+        (qm_o.Z(0) + qm_o.X(1)).diagonal()
+    with pytest.raises(ValueError):
+        qm_o.Z(0).diagonal(chunk_size=3)
+
+
+def test_numpy_integer_index():
+    h = 2.0 * qm_o.Z(np.int64(3)) * qm_o.Z(np.int64(1))
+    assert h.num_qubits == 4
+    assert h.support == frozenset({1, 3})
+
+
+
+def test_multiply_pauli_codes_matches_scalar_product():
+    paulis = list(qm_o.Pauli)
+    left = np.array([[a.value for b in paulis] for a in paulis])
+    right = left.T
+    codes, phases = qm_o.multiply_pauli_codes(left, right)
+    for a in paulis:
+        for b in paulis:
+            op, phase = qm_o.multiply_pauli_same_qubit(
+                qm_o.PauliOperator(a, 0), qm_o.PauliOperator(b, 0)
+            )
+            assert codes[a.value, b.value] == op.pauli.value
+            assert phases[a.value, b.value] == phase
+
+
+@pytest.mark.parametrize("storage", ["dict", "symplectic"])
+def test_from_arrays_matches_add_term(storage):
+    rng = np.random.default_rng(4)
+    for num_qubits in (4, 130):
+        lengths = rng.integers(0, 5, size=30)
+        term_ptr = np.concatenate([[0], np.cumsum(lengths)])
+        qubit_idx = rng.integers(0, num_qubits, size=term_ptr[-1])
+        pauli_code = rng.integers(0, 4, size=term_ptr[-1])
+        coeff = rng.normal(size=30) + 1j * rng.normal(size=30)
+
+        h = qm_o.Hamiltonian.from_arrays(
+            term_ptr, qubit_idx, pauli_code, coeff, constant=0.5, storage=storage
+        )
+        expected = qm_o.Hamiltonian(storage=storage)
+        expected.constant = 0.5
+        for t in range(30):
+            expected.add_term(
+                tuple(
+                    qm_o.PauliOperator(qm_o.Pauli(int(code)), int(index))
+                    for index, code in zip(
+                        qubit_idx[term_ptr[t] : term_ptr[t + 1]],
+                        pauli_code[term_ptr[t] : term_ptr[t + 1]],
+                    )
+                ),
+                coeff[t],
+            )
+        assert h.storage == storage
+        assert list(h.terms) == list(expected.terms)
+        for term, value in expected.terms.items():
+            assert np.isclose(h.terms[term], value)
+        assert np.isclose(h.constant, expected.constant)
+        assert h.support == expected.support
+
+
+def test_from_arrays_invalid():
+    with pytest.raises(ValueError):
+        qm_o.Hamiltonian.from_arrays([0, 1], [0, 1], [0, 0], [1.0])
+    with pytest.raises(ValueError):
+        qm_o.Hamiltonian.from_arrays([0, 1], [-1], [0], [1.0])
+    with pytest.raises(ValueError):
+        qm_o.Hamiltonian.from_arrays([0, 1], [0], [4], [1.0])
+
+    h = qm_o.Hamiltonian.from_arrays([0], [], [], [], constant=1.0, num_qubits=3)
+    assert h.terms == {}
+    assert h.constant == 1.0
+    assert h.num_qubits == 3
+
+
+def test_from_pauli_strings():
+    h = qm_o.Hamiltonian.from_pauli_strings(
+        ["XIZ", "IY", "III", "XIZ", ""], [1.0, 0.5, 2.0, 1.0, -1.0], constant=0.25
+    )
+    expected = 2.0 * qm_o.X(0) * qm_o.Z(2) + 0.5 * qm_o.Y(1) + 1.25
+    assert h == expected
+
+    with pytest.raises(ValueError):
+        qm_o.Hamiltonian.from_pauli_strings(["XA"], [1.0])
+
+
+@pytest.mark.parametrize("storage", ["dict", "symplectic"])
+def test_from_masks_round_trip(storage):
+    h = qm_o.X(0) * qm_o.Z(1) + 0.5j * qm_o.Y(130) + 1.5
+    x, z, coeffs = h.to_masks()
+    loaded = qm_o.Hamiltonian.from_masks(
+        x, z, coeffs, num_qubits=131, constant=h.constant, storage=storage
+    )
+    assert loaded.storage == storage
+    assert loaded == h
+    assert loaded.num_qubits == 131
+    assert loaded.support == h.support
+
+
+def test_from_arrays_normalizes_constant():
+    h = qm_o.Hamiltonian.from_arrays([0], [], [], [], constant=np.complex128(2.0))
+    assert type(h.constant) is float
+    assert h.constant == 2.0
+    h = qm_o.Hamiltonian.from_arrays([0], [], [], [], constant=1.0 + 0.5j)
+    assert h.constant == 1.0 + 0.5j
@@ -0,0 +1,65 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from qamomile.core.ising_qubo import IsingModel
+from qamomile.core.presolve import presolve_ising
+
+
+def all_spins(n: int) -> np.ndarray:
+    return np.array(list(itertools.product([-1, 1], repeat=n)), dtype=np.int8).reshape(
+        2**n, n
+    )
+
+
+def test_fix_dominant_field():
+    ising = IsingModel({(0, 1): 1.0, (1, 2): 2.0}, {0: -3.0}, 1.0)
+    result = presolve_ising(ising, eliminate_degree_one=False)
+    assert result.removed.tolist() == [0]
+    assert result.kept.tolist() == [1, 2]
+    # z_0 = +1 adds h_0 to the constant and J_01 to the field of spin 1.
+    assert result.ising.constant == -2.0
+    assert dict(result.ising.linear) == {0: 1.0, 1: 0.0}
+    assert result.ising.index_map == {0: 1, 1: 2}
+
+
+def test_eliminate_chain():
+    # A path 0 - 1 - 2 - 3 is removed completely, one end after the other.
+    ising = IsingModel({(0, 1): 1.0, (1, 2): -2.0, (2, 3): 0.5}, {}, 0.0)
+    result = presolve_ising(ising, fix_dominant=False)
+    assert len(result.kept) <= 1
+    states = result.reconstruct_spins(all_spins(len(result.kept)))
+    assert ising.calc_energy_batch(states).min() == pytest.approx(-3.5)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_presolve_keeps_energies_and_optimum(seed):
+    rng = np.random.default_rng(seed)
+    n = 7
+    quad = {
+        (int(i), int(j)): float(rng.choice([-2.0, -1.0, 0.5, 1.0]))
+        for i, j in rng.integers(0, n, size=(8, 2))
+        if i != j
+    }
+    linear = {int(i): float(rng.normal() * 2) for i in rng.integers(0, n, size=4)}
+    ising = IsingModel(quad, linear, float(rng.normal()))
+    result = presolve_ising(ising)
+
+    reduced_states = all_spins(len(result.kept))
+    full_states = result.reconstruct_spins(reduced_states)
+    assert np.allclose(
+        result.ising.calc_energy_batch(reduced_states),
+        ising.calc_energy_batch(full_states),
+    )
+    assert ising.calc_energy_batch(full_states).min() == pytest.approx(
+        ising.calc_energy_batch(all_spins(ising.num_bits())).min()
+    )
+
+
+def test_reconstruct_bits():
+    ising = IsingModel({(0, 1): 1.0}, {0: 2.0, 2: -1.0}, 0.0)
+    result = presolve_ising(ising)
+    assert len(result.kept) == 0
+    # h_0 dominates (z_0 = -1), then z_1 = +1 opposes it, and z_2 = +1.
+    assert result.reconstruct_bits(np.zeros(0, dtype=np.uint8)).tolist() == [1, 0, 0]
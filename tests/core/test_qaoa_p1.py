@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from qamomile.core.ising_qubo import IsingModel
+from qamomile.core.qaoa_p1 import QAOAP1Evaluator
+from qamomile.core.qaoa_simulator import QAOASimulator
+
+
+def _random_ising(num_spins, density, seed):
+    rng = np.random.default_rng(seed)
+    quad = {
+        (i, j): rng.normal()
+        for i in range(num_spins)
+        for j in range(i + 1, num_spins)
+        if rng.random() < density
+    }
+    quad[(0, num_spins - 1)] = 1.0
+    quad[(1, 1)] = 0.4
+    linear = {i: rng.normal() for i in range(num_spins) if rng.random() < 0.7}
+    return IsingModel(quad, linear, 0.3)
+
+
+@pytest.mark.parametrize("num_spins, density", [(2, 1.0), (5, 0.5), (7, 1.0)])
+def test_matches_statevector_simulation(num_spins, density):
+    ising = _random_ising(num_spins, density, num_spins)
+    evaluator = QAOAP1Evaluator(ising)
+    simulator = QAOASimulator(ising)
+    rng = np.random.default_rng(0)
+    gammas, betas = rng.uniform(-2, 2, (2, 6))
+
+    expected = [simulator.expectation([b], [g]) for g, b in zip(gammas, betas)]
+    assert np.allclose(evaluator.expectation(gammas, betas), expected)
+    grid = evaluator.grid(gammas[:3], betas)
+    assert grid.shape == (3, 6)
+    assert np.allclose(
+        grid, [[simulator.expectation([b], [g]) for b in betas] for g in gammas[:3]]
+    )
+
+
+def test_gradient_matches_finite_differences():
+    ising = _random_ising(6, 0.6, 1)
+    evaluator = QAOAP1Evaluator(ising)
+    gammas = np.array([0.0, 0.3, -1.1])
+    betas = np.array([0.2, 0.0, 0.9])
+    energy, d_gamma, d_beta = evaluator.expectation_and_gradient(gammas, betas)
+    assert energy.shape == d_gamma.shape == d_beta.shape == (3,)
+
+    eps = 1e-6
+    expectation = evaluator.expectation
+    assert np.allclose(
+        d_gamma,
+        (expectation(gammas + eps, betas) - expectation(gammas - eps, betas)) / (2 * eps),
+        atol=1e-6,
+    )
+    assert np.allclose(
+        d_beta,
+        (expectation(gammas, betas + eps) - expectation(gammas, betas - eps)) / (2 * eps),
+        atol=1e-6,
+    )
+
+
+def test_gradient_where_a_cosine_vanishes():
+    # cos(2 gamma J_01) is zero at gamma = pi / 4, with a triangle through the edge.
+    ising = IsingModel({(0, 1): 1.0, (1, 2): 0.7, (0, 2): -0.4, (2, 3): 1.3}, {0: 0.3}, 0.0)
+    evaluator = QAOAP1Evaluator(ising)
+    simulator = QAOASimulator(ising)
+    gamma, beta, eps = np.pi / 4, 0.37, 1e-6
+    _, d_gamma, _ = evaluator.expectation_and_gradient(gamma, beta)
+    expected = (
+        simulator.expectation([beta], [gamma + eps]) - simulator.expectation([beta], [gamma - eps])
+    ) / (2 * eps)
+    assert np.isfinite(d_gamma)
+    assert float(d_gamma) == pytest.approx(expected, abs=1e-6)
+
+
+def test_scalar_and_constant_only():
+    evaluator = QAOAP1Evaluator(IsingModel({(0, 0): 2.0}, {}, 1.0))
+    assert np.ndim(evaluator.expectation(0.4, 0.2)) == 0
+    assert float(evaluator.expectation(0.4, 0.2)) == pytest.approx(3.0)
@@ -0,0 +1,92 @@
+import functools
+
+import numpy as np
+import pytest
+import scipy.linalg
+
+from qamomile.core.ising_qubo import HUBOIsingModel, IsingModel
+from qamomile.core.qaoa_simulator import QAOASimulator, cost_diagonal
+
+
+def _operator(num_qubits, paulis):
+    # Qubit 0 is the least significant bit of the basis state index.
+    return functools.reduce(
+        np.kron, [paulis.get(q, np.eye(2)) for q in reversed(range(num_qubits))]
+    )
+
+
+def _dense_qaoa(num_qubits, terms, constant, betas, gammas):
+    z, x = np.diag([1.0, -1.0]), np.array([[0.0, 1.0], [1.0, 0.0]])
+    cost = constant * np.eye(2**num_qubits) + sum(
+        w * _operator(num_qubits, {q: z for q in key}) for key, w in terms.items()
+    )
+    mixer = sum(_operator(num_qubits, {q: x}) for q in range(num_qubits))
+    state = np.full(2**num_qubits, 2 ** (-num_qubits / 2), dtype=complex)
+    for beta, gamma in zip(betas, gammas):
+        state = scipy.linalg.expm(-1j * beta * mixer) @ (
+            scipy.linalg.expm(-1j * gamma * cost) @ state
+        )
+    return np.diag(cost), state
+
+
+@pytest.mark.parametrize("num_qubits", [2, 5, 6])
+def test_ising_matches_dense_simulation(num_qubits):
+    rng = np.random.default_rng(num_qubits)
+    quad = {
+        (i, j): rng.normal()
+        for i in range(num_qubits)
+        for j in range(i + 1, num_qubits)
+        if rng.random() < 0.7
+    }
+    linear = {i: rng.normal() for i in range(num_qubits)}
+    terms = {**quad, **{(i,): h for i, h in linear.items()}}
+    diagonal, state = _dense_qaoa(num_qubits, terms, 0.3, [0.4, 0.1], [0.7, -0.2])
+
+    simulator = QAOASimulator(IsingModel(quad, linear, 0.3))
+    np.testing.assert_allclose(simulator.diagonal, diagonal, atol=1e-12)
+    np.testing.assert_allclose(
+        simulator.statevector([0.4, 0.1], [0.7, -0.2]), state, atol=1e-10
+    )
+    assert simulator.expectation([0.4, 0.1], [0.7, -0.2]) == pytest.approx(
+        np.abs(state) ** 2 @ diagonal
+    )
+
+    single = QAOASimulator(IsingModel(quad, linear, 0.3), dtype=np.complex64)
+    assert single.expectation([0.4, 0.1], [0.7, -0.2]) == pytest.approx(
+        simulator.expectation([0.4, 0.1], [0.7, -0.2]), abs=1e-5
+    )
+
+
+def test_integer_costs_match_dense_simulation():
+    quad = {(i, j): float((i + 2 * j) % 3 - 1) for i in range(6) for j in range(i + 1, 6)}
+    diagonal, state = _dense_qaoa(6, quad, 0.0, [0.4], [0.7])
+    simulator = QAOASimulator(IsingModel(quad, {}, 0.0))
+    np.testing.assert_allclose(simulator.statevector([0.4], [0.7]), state, atol=1e-10)
+
+
+def test_hubo_matches_dense_simulation():
+    terms = {(0, 1, 2): 1.5, (1, 3): -0.5, (2,): 0.25, (0, 1, 2, 3): 0.75}
+    diagonal, state = _dense_qaoa(4, terms, -0.2, [0.3], [0.9])
+    simulator = QAOASimulator(HUBOIsingModel(terms, -0.2))
+    np.testing.assert_allclose(cost_diagonal(simulator.ising), diagonal, atol=1e-12)
+    np.testing.assert_allclose(simulator.statevector([0.3], [0.9]), state, atol=1e-10)
+
+
+def test_sample():
+    simulator = QAOASimulator(IsingModel({(0, 1): 1.0}, {0: 0.5}, 0.0))
+    probabilities = simulator.probabilities([0.3], [0.6])
+    samples = simulator.sample([0.3], [0.6], shots=20000, seed=1)
+    assert sum(sample.num_occurrences for sample in samples.bitarrays) == 20000
+    counts = {
+        sum(bit << i for i, bit in enumerate(sample.bits)): sample.num_occurrences
+        for sample in samples.bitarrays
+    }
+    for state, probability in enumerate(probabilities):
+        assert counts.get(state, 0) / 20000 == pytest.approx(probability, abs=0.02)
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        QAOASimulator(IsingModel({(0, 1): 1.0}, {}, 0.0), dtype=np.float64)
+    with pytest.raises(ValueError):
+        QAOASimulator(IsingModel({(0, 1): 1.0}, {}, 0.0)).statevector([0.1], [])
@@ -0,0 +1,112 @@
+import numpy as np
+import pytest
+
+import qamomile.core.operator as qm_o
+from qamomile.core.ising_qubo import IsingModel
+from qamomile.core.serialization import (
+    load_hamiltonian,
+    load_ising_model,
+    save_hamiltonian,
+    save_ising_model,
+)
+
+
+def _hamiltonian(storage):
+    h = qm_o.Hamiltonian(storage=storage)
+    h += qm_o.X(0) * qm_o.Y(2) + 0.5 * qm_o.Z(1) - 1.5j * qm_o.Y(70) * qm_o.Z(3)
+    h += 2.0 + 1.0j
+    return h
+
+
+@pytest.mark.parametrize("storage", ["dict", "symplectic"])
+@pytest.mark.parametrize("mmap_mode", ["c", "r", None])
+def test_hamiltonian_round_trip(tmp_path, storage, mmap_mode):
+    h = _hamiltonian(storage)
+    path = tmp_path / "h.qmb"
+    save_hamiltonian(h, path)
+
+    loaded = load_hamiltonian(path, mmap_mode=mmap_mode)
+    assert loaded.storage == storage
+    assert loaded == h
+    assert loaded.num_qubits == 71
+    assert loaded.support == h.support
+
+    converted = load_hamiltonian(path, mmap_mode=mmap_mode, storage="dict")
+    assert converted.storage == "dict"
+    assert converted == h
+
+
+def test_hamiltonian_round_trip_keeps_fixed_num_qubits(tmp_path):
+    h = qm_o.Hamiltonian(num_qubits=5)
+    h.add_term((qm_o.PauliOperator(qm_o.Pauli.Z, 0),), 1.0)
+    save_hamiltonian(h, tmp_path / "h.qmb")
+    assert load_hamiltonian(tmp_path / "h.qmb").num_qubits == 5
+
+    save_hamiltonian(qm_o.Hamiltonian(), tmp_path / "empty.qmb")
+    empty = load_hamiltonian(tmp_path / "empty.qmb")
+    assert empty.terms == {}
+    assert empty.constant == 0.0
+
+
+def test_loaded_hamiltonian_is_copy_on_write(tmp_path):
+    h = _hamiltonian("symplectic")
+    path = tmp_path / "h.qmb"
+    save_hamiltonian(h, path)
+
+    loaded = load_hamiltonian(path)
+    loaded += 3.0 * qm_o.X(0) * qm_o.Y(2) + qm_o.Z(5)
+    loaded *= 2.0
+    assert loaded == 2.0 * (h + 3.0 * qm_o.X(0) * qm_o.Y(2) + qm_o.Z(5))
+    assert load_hamiltonian(path) == h
+
+
+def test_read_only_load_copies_on_first_change(tmp_path):
+    h = _hamiltonian("symplectic")
+    path = tmp_path / "h.qmb"
+    save_hamiltonian(h, path)
+
+    loaded = load_hamiltonian(path, mmap_mode="r")
+    loaded *= 2.0
+    assert loaded == 2.0 * h
+    loaded = load_hamiltonian(path, mmap_mode="r")
+    loaded += qm_o.X(0) * qm_o.Y(2) + qm_o.Z(5)
+    assert loaded == h + qm_o.X(0) * qm_o.Y(2) + qm_o.Z(5)
+    assert load_hamiltonian(path, mmap_mode="r") == h
+
+    ising = IsingModel({(0, 1): 2.0, (1, 3): -0.5}, {0: 4.0}, 6.0)
+    save_ising_model(ising, tmp_path / "ising.qmb")
+    loaded = load_ising_model(tmp_path / "ising.qmb", mmap_mode="r")
+    loaded.normalize_by_abs_max()
+    loaded.quad[(0, 1)] = 1.0
+    assert loaded.quad_values.tolist() == [1.0, -0.125]
+    assert load_ising_model(tmp_path / "ising.qmb", mmap_mode="r") == ising
+
+
+def test_load_errors(tmp_path):
+    path = tmp_path / "h.qmb"
+    save_hamiltonian(qm_o.X(0), path)
+    with pytest.raises(ValueError):
+        load_ising_model(path)
+    with pytest.raises(ValueError):
+        load_hamiltonian(path, mmap_mode="w+")
+
+    other = tmp_path / "other.bin"
+    other.write_bytes(b"not a qamomile file")
+    with pytest.raises(ValueError):
+        load_hamiltonian(other)
+
+
+@pytest.mark.parametrize("mmap_mode", ["c", None])
+def test_ising_model_round_trip(tmp_path, mmap_mode):
+    ising = IsingModel({(0, 1): 2.0, (1, 3): -0.5}, {0: 4.0, 2: 1.5}, 6.0)
+    save_ising_model(ising, tmp_path / "ising.qmb")
+    assert load_ising_model(tmp_path / "ising.qmb", mmap_mode=mmap_mode) == ising
+
+    ising = IsingModel({(0, 1): 1.0}, {}, -1.0, {10: 0, 4: 1})
+    save_ising_model(ising, tmp_path / "mapped.qmb")
+    loaded = load_ising_model(tmp_path / "mapped.qmb", mmap_mode=mmap_mode)
+    assert loaded == ising
+
+    empty = IsingModel({}, {}, 0.0)
+    save_ising_model(empty, tmp_path / "empty.qmb")
+    assert load_ising_model(tmp_path / "empty.qmb", mmap_mode=mmap_mode) == empty
@@ -0,0 +1,197 @@
+import numpy as np
+import pytest
+
+from qamomile.core.symplectic import (
+    SymplecticTerms,
+    basis_masks,
+    flip_groups,
+    flip_values,
+    multiply_masks,
+    num_words,
+    pack_terms,
+    parity,
+    popcount,
+    unique_masks,
+    walsh_hadamard,
+)
+
+
+def test_num_words():
+    assert num_words(0) == 1
+    assert num_words(64) == 1
+    assert num_words(65) == 2
+    assert num_words(200) == 4
+
+
+def test_add_merges_duplicates():
+    table = SymplecticTerms()
+    table.add(0b011, 0b000, 1.0)
+    table.add(0b000, 0b100, 2.0)
+    table.add(0b011, 0b000, 0.5j)
+    assert len(table) == 2
+    assert table.coeffs.tolist() == [1.0 + 0.5j, 2.0]
+    assert table.num_qubits() == 3
+
+
+def test_add_widens_masks():
+    table = SymplecticTerms()
+    table.add(1, 0, 1.0)
+    table.add(1 << 100, 1 << 100, 1.0)
+    table.add(1, 0, 1.0)
+    assert table.num_words == 2
+    assert len(table) == 2
+    assert table.coeffs.tolist() == [2.0, 1.0]
+    assert table.num_qubits() == 101
+
+
+def test_add_masks_matches_add():
+    rng = np.random.default_rng(0)
+    x = rng.integers(0, 4, size=(200, 1)).astype(np.uint64)
+    z = rng.integers(0, 4, size=(200, 1)).astype(np.uint64)
+    coeffs = rng.normal(size=200) + 1j * rng.normal(size=200)
+
+    bulk = SymplecticTerms()
+    bulk.add(int(x[0, 0]), int(z[0, 0]), 1.0)
+    bulk.add_masks(x, z, coeffs)
+
+    single = SymplecticTerms()
+    single.add(int(x[0, 0]), int(z[0, 0]), 1.0)
+    for xi, zi, ci in zip(x[:, 0].tolist(), z[:, 0].tolist(), coeffs):
+        single.add(xi, zi, ci)
+
+    assert len(bulk) == len(single)
+    np.testing.assert_array_equal(bulk.x, single.x)
+    np.testing.assert_array_equal(bulk.z, single.z)
+    np.testing.assert_allclose(bulk.coeffs, single.coeffs)
+
+
+def test_unique_masks_keeps_first_occurrence_order():
+    x = np.array([[2], [1], [2], [1], [0]], dtype=np.uint64)
+    z = np.zeros((5, 1), dtype=np.uint64)
+    ux, uz, uc = unique_masks(x, z, np.array([1.0, 2.0, 3.0, 4.0, 5.0]))
+    assert ux.ravel().tolist() == [2, 1, 0]
+    assert uc.tolist() == [4.0, 6.0, 5.0]
+
+
+def test_copy_is_independent():
+    table = SymplecticTerms()
+    table.add(1, 0, 1.0)
+    copied = table.copy()
+    copied.add(1, 0, 1.0)
+    copied.add(2, 0, 1.0)
+    assert table.coeffs.tolist() == [1.0]
+    assert copied.coeffs.tolist() == [2.0, 1.0]
+
+
+def _dense(x: int, z: int, num_qubits: int) -> np.ndarray:
+    paulis = {
+        (0, 0): np.eye(2),
+        (1, 0): np.array([[0, 1], [1, 0]]),
+        (1, 1): np.array([[0, -1j], [1j, 0]]),
+        (0, 1): np.array([[1, 0], [0, -1]]),
+    }
+    mat = np.eye(1)
+    for q in range(num_qubits):
+        mat = np.kron(paulis[((x >> q) & 1, (z >> q) & 1)], mat)
+    return mat
+
+
+def test_multiply_masks_matches_dense_product():
+    num_qubits = 3
+    rng = np.random.default_rng(1)
+    x1, z1 = rng.integers(0, 8, size=(2, 12, 1)).astype(np.uint64)
+    x2, z2 = rng.integers(0, 8, size=(2, 9, 1)).astype(np.uint64)
+    c1 = rng.normal(size=12) + 1j * rng.normal(size=12)
+    c2 = rng.normal(size=9)
+
+    def dense_sum(x, z, c):
+        return sum(
+            ci * _dense(int(xi), int(zi), num_qubits)
+            for xi, zi, ci in zip(x[:, 0], z[:, 0], c)
+        )
+
+    for max_pairs in (1 << 22, 7):
+        x, z, c = multiply_masks(x1, z1, c1, x2, z2, c2, max_pairs=max_pairs)
+        assert len(set(zip(x[:, 0].tolist(), z[:, 0].tolist()))) == len(c)
+        np.testing.assert_allclose(
+            dense_sum(x, z, c), dense_sum(x1, z1, c1) @ dense_sum(x2, z2, c2)
+        )
+
+
+def test_multiply_masks_pads_words():
+    x1 = np.array([[1]], dtype=np.uint64)
+    z1 = np.array([[0]], dtype=np.uint64)
+    x2 = np.array([[0, 1]], dtype=np.uint64)
+    z2 = np.array([[0, 1]], dtype=np.uint64)
+    x, z, c = multiply_masks(x1, z1, np.array([2.0]), x2, z2, np.array([3.0]))
+    assert x.tolist() == [[1, 1]]
+    assert z.tolist() == [[0, 1]]
+    assert c.tolist() == [6.0]
+
+
+def test_popcount():
+    words = np.array([[0xFFFFFFFFFFFFFFFF, 1], [0b101, 0]], dtype=np.uint64)
+    assert popcount(words).tolist() == [65, 2]
+
+
+def test_parity():
+    values = np.array([0, 1, 3, 7, 1 << 62, (1 << 62) | 1])
+    assert parity(values).tolist() == [0, 1, 0, 1, 1, 0]
+
+
+def test_basis_masks():
+    masks = np.array([[5, 0], [2, 0]], dtype=np.uint64)
+    assert basis_masks(masks, 3).tolist() == [5, 2]
+    with pytest.raises(ValueError):
+        basis_masks(masks, 2)
+    with pytest.raises(ValueError):
+        basis_masks(np.array([[0, 1]], dtype=np.uint64), 63)
+    with pytest.raises(ValueError):
+        basis_masks(masks, 64)
+
+
+def test_flip_groups_match_dense_matrix():
+    num_qubits = 3
+    rng = np.random.default_rng(2)
+    x, z = rng.integers(0, 8, size=(2, 10))
+    coeffs = rng.normal(size=10) + 1j * rng.normal(size=10)
+
+    flips, groups = flip_groups(x, z, coeffs)
+    rows = np.arange(8)
+    values = flip_values(rows, groups)
+    matrix = np.zeros((8, 8), dtype=complex)
+    for g, flip in enumerate(flips.tolist()):
+        matrix[rows, rows ^ flip] += values[:, g]
+    expected = sum(
+        c * _dense(int(xi), int(zi), num_qubits) for xi, zi, c in zip(x, z, coeffs)
+    )
+    np.testing.assert_allclose(matrix, expected)
+
+
+def test_walsh_hadamard():
+    rng = np.random.default_rng(3)
+    values = rng.normal(size=16)
+    signs = np.array([[(-1) ** bin(b & z).count("1") for z in range(16)] for b in range(16)])
+    np.testing.assert_allclose(walsh_hadamard(values.copy()), signs @ values)
+
+
+def test_pack_terms_matches_dense_product():
+    rng = np.random.default_rng(5)
+    paulis = [(1, 0), (1, 1), (0, 1), (0, 0)]
+    lengths = rng.integers(0, 6, size=20)
+    term_ptr = np.concatenate([[0], np.cumsum(lengths)])
+    qubits = rng.integers(0, 3, size=term_ptr[-1])
+    codes = rng.integers(0, 4, size=term_ptr[-1])
+    x_bits = np.array([paulis[c][0] for c in codes], dtype=np.int64)
+    z_bits = np.array([paulis[c][1] for c in codes], dtype=np.int64)
+
+    x, z, phase = pack_terms(term_ptr, qubits, x_bits, z_bits)
+    for t in range(20):
+        product = np.eye(8)
+        for k in range(term_ptr[t], term_ptr[t + 1]):
+            product = product @ _dense(
+                int(x_bits[k]) << int(qubits[k]), int(z_bits[k]) << int(qubits[k]), 3
+            )
+        np.testing.assert_allclose(
+            product, phase[t] * _dense(int(x[t, 0]), int(z[t, 0]), 3)
+        )